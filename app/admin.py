@@ -4,7 +4,16 @@ from app.db.models import Source, User
 from app.db.session import engine
 
 class SourceAdmin(ModelView, model=Source):
-    column_list = [Source.id, Source.name, Source.url, Source.is_active]
+    column_list = [
+        Source.id,
+        Source.name,
+        Source.url,
+        Source.is_active,
+        Source.parser_kind,
+        Source.ingest_enabled,
+        Source.poll_interval_seconds,
+        Source.next_poll_at,
+    ]
     column_searchable_list = [Source.name]
 
 class UserAdmin(ModelView, model=User):
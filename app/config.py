@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import AnyUrl, Field, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,9 +28,14 @@ class Settings(BaseSettings):
 
     redis_host: str
     redis_port: int
+    redis_cache_db: int = 2
 
     openai_api_key: Optional[str] = None
     openai_model: Optional[str] = None
+    # Shared across workers through Redis; match the account's tier limits.
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200_000
+    openai_max_backoff_seconds: float = 60.0
 
     newsapi_key: Optional[str] = None
 
@@ -50,6 +55,73 @@ class Settings(BaseSettings):
     premium_term_days: int = 30
     premium_is_lifetime: bool = False
 
+    telegram_send_concurrency: int = 20
+    # Bot-wide: shared by every delivery process through Redis.
+    telegram_global_rate_per_second: float = 25.0
+    telegram_per_chat_rate_per_second: float = 1.0
+    telegram_send_max_attempts: int = 4
+    telegram_max_chat_buckets: int = 10_000
+
+    dispatch_shard_count: int = 4
+    dispatch_shard_lock_seconds: int = 900
+    dispatch_trigger_debounce_seconds: int = 20
+    # Sends of one item to one subscription before it is given up on.
+    dispatch_max_delivery_attempts: int = 3
+
+    http_connect_timeout_seconds: float = 5.0
+    http_read_timeout_seconds: float = 20.0
+    http_max_retries: int = 2
+    http_backoff_factor: float = 0.5
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = 10
+    # URL prefix -> pool size, e.g. {"http://libretranslate:5000": 16}
+    http_host_pool_sizes: Dict[str, int] = Field(default_factory=dict)
+
+    extraction_cache_ttl_seconds: int = 7 * 24 * 3600
+    extraction_cache_negative_ttl_seconds: int = 1800
+    # "fulltextrss" (container) or "trafilatura" (in-process)
+    extraction_backend: str = "fulltextrss"
+    # Trafilatura pool size; 0 means one worker per CPU core.
+    extraction_process_workers: int = 0
+
+    ingest_max_concurrency: int = 16
+    ingest_per_host_concurrency: int = 4
+    ingest_timeout_seconds: float = 15.0
+    ingest_fanout_limit: int = 200
+    ingest_source_lock_seconds: int = 600
+    ingest_min_poll_seconds: int = 60
+    ingest_max_poll_seconds: int = 3600
+    ingest_rate_window_hours: int = 24
+
+    enrichment_batch_size: int = 50
+    enrichment_concurrency: int = 8
+    enrichment_max_attempts: int = 3
+    # Summaries stop waiting for full text this long after insert.
+    enrichment_deadline_seconds: int = 600
+
+    summarize_concurrency: int = 8
+    summarize_commit_every: int = 10
+    summarize_lock_seconds: int = 900
+    # Article tokens sent to the LLM after trimming; 3-5 lines need little.
+    summarize_input_token_budget: int = 1200
+    # "openai" or "extractive" (local TextRank, no API calls).
+    summarize_backend: str = "openai"
+    # Backend for items of sources without a premium subscriber.
+    summarize_free_tier_backend: str = "openai"
+    # Fall back to the extractive backend for `summarize_breaker_open_seconds`
+    # once a minute with at least `min_calls` LLM calls hits either rate.
+    summarize_breaker_error_rate: float = 0.5
+    summarize_breaker_slow_seconds: float = 20.0
+    summarize_breaker_slow_rate: float = 0.5
+    summarize_breaker_min_calls: int = 10
+    summarize_breaker_open_seconds: int = 120
+    # Fallback summaries are redone this many times, then kept until the
+    # content changes.
+    summarize_max_fallback_attempts: int = 3
+
+    outbox_batch_size: int = 100
+    outbox_max_batches_per_run: int = 50
+
     @field_validator("database_url", mode="before")
     def _assemble_database_url(cls, v, info):
         if v is not None:
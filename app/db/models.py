@@ -142,11 +142,98 @@ class Source(Base, TimestampMixin):
         comment="Enable/disable source",
     )
 
+    parser_kind: Mapped[str] = mapped_column(
+        String(32),
+        default="rss",
+        server_default="rss",
+        nullable=False,
+        comment="Ingestion parser: rss, techcrunch or hackernews",
+    )
+
+    ingest_enabled: Mapped[bool] = mapped_column(
+        Boolean,
+        default=True,
+        server_default="true",
+        nullable=False,
+        comment="Poll this source for new items",
+    )
+
+    poll_interval_seconds: Mapped[int] = mapped_column(
+        Integer,
+        default=300,
+        server_default="300",
+        nullable=False,
+    )
+
+    last_polled_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    next_poll_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="When the source is next due; NULL means due now",
+    )
+
+    empty_poll_streak: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Consecutive polls that stored nothing new",
+    )
+
+    feed_etag: Mapped[str | None] = mapped_column(
+        String(256),
+        nullable=True,
+        comment="ETag of the last processed feed response",
+    )
+
+    feed_last_modified: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Last-Modified of the last processed feed response",
+    )
+
+    feed_body_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="SHA-256 of the last processed feed body",
+    )
+
+    feed_fetch_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+
+    feed_not_modified_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Fetches answered with 304 Not Modified",
+    )
+
+    feed_unchanged_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Fetches whose body hash matched the last processed one",
+    )
+
     subscriptions: Mapped[list["Subscription"]] = relationship(
         back_populates="source",
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        Index("ix_sources_ingest_due", "ingest_enabled", "next_poll_at"),
+    )
+
 class Language(Base, TimestampMixin):
     __tablename__ = "languages"
 
@@ -305,10 +392,51 @@ class Digest(Base, TimestampMixin):
         nullable=True,
     )
 
+    # Outbox payload. Digests delivered by one Telegram message share
+    # `message_group_id`; the lead row (id == message_group_id) carries the
+    # rendered message, followers only point at it.
+    message_group_id: Mapped[uuid.UUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        nullable=True,
+    )
+
+    chat_id: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Telegram chat to deliver to",
+    )
+
+    message_text: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Rendered message (lead row only)",
+    )
+
+    reply_markup: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Serialized reply markup JSON (lead row only)",
+    )
+
+    disable_notification: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default="false",
+        nullable=False,
+    )
+
     __table_args__ = (
         Index("ix_digests_status_scheduled_for", "status", "scheduled_for"),
+        Index("ix_digests_message_group_id", "message_group_id"),
+        Index("ix_digests_subscription_url", "subscription_id", "url"),
     )
 
+class EnrichmentStatus(str, Enum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class NewsItem(Base, TimestampMixin):
     __tablename__ = "news_items"
 
@@ -341,6 +469,28 @@ class NewsItem(Base, TimestampMixin):
         nullable=True,
         comment="LLM-generated summary",
     )
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        index=True,
+        comment="sha256 of normalized content",
+    )
+    summary_content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="content_hash the current summary was made from",
+    )
+    summarized_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="When the current summary was committed; delivery cursor key",
+    )
+    summary_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Fallback summaries made in a row for the current content",
+    )
     url: Mapped[str] = mapped_column(
         String(512),
         nullable=False,
@@ -356,9 +506,127 @@ class NewsItem(Base, TimestampMixin):
         default=True,
     )
 
+    enrichment_status: Mapped[EnrichmentStatus] = mapped_column(
+        SAEnum(EnrichmentStatus),
+        nullable=False,
+        default=EnrichmentStatus.DONE,
+        comment="Full-text extraction stage",
+    )
+    enrichment_attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    enriched_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
     __table_args__ = (
         UniqueConstraint("source_id", "external_id", name="uq_news_item_source_external"),
         Index("ix_news_items_source_fetched", "source_id", "fetched_at"),
+        Index("ix_news_items_enrichment", "enrichment_status", "created_at"),
+        Index("ix_news_items_source_summarized", "source_id", "summarized_at"),
+    )
+
+
+class SummaryCache(Base, TimestampMixin):
+    __tablename__ = "summary_cache"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    content_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    model: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    prompt_version: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+    )
+    summary: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("content_hash", "model", "prompt_version", name="uq_summary_cache_key"),
+    )
+
+
+class DeliveryCursor(Base, TimestampMixin):
+    __tablename__ = "delivery_cursors"
+
+    subscription_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("subscriptions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    last_summarized_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="summarized_at of the last delivered news item; NULL before the first delivery",
+    )
+
+    last_news_item_id: Mapped[uuid.UUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("news_items.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="Tie-breaker for items sharing the same summarized_at",
+    )
+
+    held_summarized_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="summarized_at of the earliest item waiting for a translation; the cursor stays before it",
+    )
+
+    held_news_item_id: Mapped[uuid.UUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("news_items.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+
+class EligibleSourceLanguage(Base):
+    """(source, language) pairs with at least one eligible subscriber.
+
+    Maintained by `app.repositories.eligible_sources`; eligible means an
+    active subscription of a Telegram user who has premium or a single
+    active subscription.
+    """
+
+    __tablename__ = "eligible_source_languages"
+
+    source_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("sources.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    language: Mapped[str] = mapped_column(
+        String(8),
+        ForeignKey("languages.code"),
+        primary_key=True,
+    )
+
+    subscriber_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
     )
 
 
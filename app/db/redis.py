@@ -0,0 +1,17 @@
+from functools import lru_cache
+
+import redis
+
+from app.config import get_settings
+
+
+@lru_cache()
+def get_redis() -> redis.Redis:
+    """Process-wide Redis client for locks, caches and counters."""
+    settings = get_settings()
+    return redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_cache_db,
+        decode_responses=True,
+    )
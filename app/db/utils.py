@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class QueryCounter:
+    """Mutable counter of statements executed on a connection."""
+
+    def __init__(
+        self,
+    ) -> None:
+        self.count: int = 0
+
+
+@contextmanager
+def count_queries(
+    db: Session,
+) -> Iterator[QueryCounter]:
+    """Count SQL statements executed through the session's connection.
+
+    Usage:
+        with count_queries(db) as counter:
+            ...  # run queries
+        counter.count
+    """
+    counter = QueryCounter()
+    conn = db.connection()
+
+    def _on_execute(
+        conn,
+        cursor,
+        statement,
+        parameters,
+        context,
+        executemany,
+    ) -> None:
+        counter.count += 1
+
+    event.listen(
+        conn,
+        "before_cursor_execute",
+        _on_execute,
+    )
+    try:
+        yield counter
+    finally:
+        event.remove(
+            conn,
+            "before_cursor_execute",
+            _on_execute,
+        )
@@ -0,0 +1,278 @@
+"""Per-subscription delivery cursors.
+
+A cursor is the (summarized_at, news_item_id) of the last item delivered to
+a subscription; the planner offers items summarized after it. Cursors move
+only once a message is sent, so failed sends and items summarized late are
+still picked up. A cursor can also hold the position of the earliest item
+waiting for a translation (set by the planner); it never moves onto or past
+that item until the hold is cleared.
+
+Unlike the other sync repositories these helpers take the caller's session
+and never commit, so the cursor moves in the same transaction that records
+the delivery.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import DeliveryCursor, Digest, DigestStatus, NewsItem, Subscription
+
+# (summarized_at, news_item_id) of a delivered item.
+Position = Tuple[datetime, Optional[UUID]]
+
+
+def get(
+    db: Session,
+    subscription_id: UUID,
+) -> Optional[DeliveryCursor]:
+    """Return the cursor for a subscription or None if nothing was delivered."""
+    return db.get(
+        DeliveryCursor,
+        subscription_id,
+    )
+
+
+def advance(
+    db: Session,
+    subscription_id: UUID,
+    summarized_at: datetime,
+    news_item_id: Optional[UUID],
+) -> None:
+    """Move the cursor forward to (summarized_at, news_item_id); never backwards."""
+    _upsert(
+        db=db,
+        positions={subscription_id: (summarized_at, news_item_id)},
+    )
+
+
+def set_holds(
+    db: Session,
+    holds: Dict[UUID, Optional[Position]],
+) -> None:
+    """Set (or clear, for None) the translation hold of each subscription.
+
+    Subscriptions without a cursor get one with no delivered position.
+    """
+    if not holds:
+        return
+    now = datetime.utcnow()
+    stmt = pg_insert(DeliveryCursor).values(
+        [
+            {
+                "subscription_id": subscription_id,
+                "last_summarized_at": None,
+                "last_news_item_id": None,
+                "held_summarized_at": hold[0] if hold else None,
+                "held_news_item_id": hold[1] if hold else None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for subscription_id, hold in holds.items()
+        ]
+    )
+    excluded = stmt.excluded
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DeliveryCursor.subscription_id],
+            set_={
+                "held_summarized_at": excluded.held_summarized_at,
+                "held_news_item_id": excluded.held_news_item_id,
+                "updated_at": excluded.updated_at,
+            },
+        )
+    )
+
+
+def advance_after_send(
+    db: Session,
+    sent_group_ids: Iterable[UUID],
+    failed_group_ids: Iterable[UUID] = (),
+) -> int:
+    """Move cursors past the items delivered by the sent message groups.
+
+    A cursor stops short of the earliest item of the same subscription whose
+    message failed in this batch, or of its translation hold, so the planner
+    offers that item again.
+    Returns the number of subscriptions whose cursor was written.
+    """
+    sent = set(sent_group_ids)
+    failed = set(failed_group_ids)
+    if not sent:
+        return 0
+    rows = db.execute(
+        select(
+            Digest.subscription_id,
+            Digest.message_group_id,
+            NewsItem.summarized_at,
+            NewsItem.id.label("news_item_id"),
+            DeliveryCursor.held_summarized_at,
+            DeliveryCursor.held_news_item_id,
+        )
+        .join(
+            Subscription,
+            Subscription.id == Digest.subscription_id,
+        )
+        .join(
+            NewsItem,
+            and_(
+                NewsItem.source_id == Subscription.source_id,
+                NewsItem.url == Digest.url,
+            ),
+        )
+        .outerjoin(
+            DeliveryCursor,
+            DeliveryCursor.subscription_id == Digest.subscription_id,
+        )
+        .where(
+            Digest.message_group_id.in_(list(sent | failed)),
+            NewsItem.summarized_at.is_not(None),
+        )
+    ).all()
+
+    held: Dict[UUID, Position] = {}
+    for row in rows:
+        if row.held_summarized_at is not None:
+            position = (row.held_summarized_at, row.held_news_item_id)
+            if row.subscription_id not in held or position < held[row.subscription_id]:
+                held[row.subscription_id] = position
+        if row.message_group_id in failed:
+            position = (row.summarized_at, row.news_item_id)
+            if row.subscription_id not in held or position < held[row.subscription_id]:
+                held[row.subscription_id] = position
+
+    positions: Dict[UUID, Position] = {}
+    for row in rows:
+        if row.message_group_id not in sent:
+            continue
+        position = (row.summarized_at, row.news_item_id)
+        stop = held.get(row.subscription_id)
+        if stop is not None and position >= stop:
+            continue
+        current = positions.get(row.subscription_id)
+        if current is None or position > current:
+            positions[row.subscription_id] = position
+    _upsert(
+        db=db,
+        positions=positions,
+    )
+    return len(positions)
+
+
+def backfill_from_digests(
+    db: Session,
+) -> int:
+    """Rebuild cursors from SENT digests, keeping whichever position is newer.
+
+    Safe to re-run (e.g. after a deploy where old workers kept sending without
+    advancing cursors). Returns the number of rows inserted or moved.
+    """
+    now = datetime.utcnow()
+    latest = (
+        select(
+            Digest.subscription_id,
+            NewsItem.summarized_at,
+            NewsItem.id,
+            func.now(),
+            func.now(),
+        )
+        .join(
+            Subscription,
+            Subscription.id == Digest.subscription_id,
+        )
+        .join(
+            NewsItem,
+            and_(
+                NewsItem.source_id == Subscription.source_id,
+                NewsItem.url == Digest.url,
+            ),
+        )
+        .where(
+            Digest.status == DigestStatus.SENT,
+            NewsItem.summarized_at.is_not(None),
+        )
+        .distinct(
+            Digest.subscription_id,
+        )
+        .order_by(
+            Digest.subscription_id,
+            NewsItem.summarized_at.desc(),
+            NewsItem.id.desc(),
+        )
+    )
+    stmt = pg_insert(DeliveryCursor).from_select(
+        [
+            "subscription_id",
+            "last_summarized_at",
+            "last_news_item_id",
+            "created_at",
+            "updated_at",
+        ],
+        latest,
+    )
+    excluded = stmt.excluded
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DeliveryCursor.subscription_id],
+            set_={
+                "last_summarized_at": excluded.last_summarized_at,
+                "last_news_item_id": excluded.last_news_item_id,
+                "updated_at": now,
+            },
+            where=or_(
+                DeliveryCursor.last_summarized_at.is_(None),
+                DeliveryCursor.last_summarized_at < excluded.last_summarized_at,
+            ),
+        )
+    )
+    return result.rowcount or 0
+
+
+def _upsert(
+    db: Session,
+    positions: Dict[UUID, Position],
+) -> None:
+    if not positions:
+        return
+    now = datetime.utcnow()
+    stmt = pg_insert(DeliveryCursor).values(
+        [
+            {
+                "subscription_id": subscription_id,
+                "last_summarized_at": summarized_at,
+                "last_news_item_id": news_item_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for subscription_id, (summarized_at, news_item_id) in positions.items()
+        ]
+    )
+    excluded = stmt.excluded
+    is_newer = or_(
+        DeliveryCursor.last_summarized_at.is_(None),
+        DeliveryCursor.last_summarized_at < excluded.last_summarized_at,
+        and_(
+            DeliveryCursor.last_summarized_at == excluded.last_summarized_at,
+            or_(
+                DeliveryCursor.last_news_item_id.is_(None),
+                DeliveryCursor.last_news_item_id < excluded.last_news_item_id,
+            ),
+        ),
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DeliveryCursor.subscription_id],
+            set_={
+                "last_summarized_at": excluded.last_summarized_at,
+                "last_news_item_id": excluded.last_news_item_id,
+                "updated_at": excluded.updated_at,
+            },
+            where=is_newer,
+        )
+    )
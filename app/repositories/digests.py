@@ -0,0 +1,98 @@
+"""Digest outbox: claim pending deliveries and record their outcome.
+
+Like `delivery_cursors`, these helpers take the caller's session and never
+commit; claimed rows stay locked until the caller's transaction ends.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import Digest, DigestStatus
+
+
+def claim_pending(
+    db: Session,
+    limit: int,
+    now: Optional[datetime] = None,
+) -> List[Digest]:
+    """Lock up to `limit` due lead rows, skipping rows other senders hold."""
+    now = now or datetime.utcnow()
+    return list(
+        db.execute(
+            select(Digest)
+            .where(
+                Digest.status == DigestStatus.PENDING,
+                Digest.message_group_id == Digest.id,
+                Digest.scheduled_for <= now,
+            )
+            .order_by(
+                Digest.scheduled_for.asc(),
+                Digest.id.asc(),
+            )
+            .limit(limit)
+            .with_for_update(
+                skip_locked=True,
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def mark_sent(
+    db: Session,
+    message_ids_by_group: Dict[UUID, Optional[int]],
+    sent_at: datetime,
+) -> None:
+    """Mark every digest of each group SENT with its Telegram message id."""
+    if not message_ids_by_group:
+        return
+    table = Digest.__table__
+    db.execute(
+        update(table)
+        .where(
+            table.c.message_group_id == bindparam("b_group_id"),
+            table.c.status == DigestStatus.PENDING,
+        )
+        .values(
+            status=DigestStatus.SENT,
+            sent_at=sent_at,
+            telegram_message_id=bindparam("b_message_id"),
+        ),
+        [
+            {
+                "b_group_id": group_id,
+                "b_message_id": message_id,
+            }
+            for group_id, message_id in message_ids_by_group.items()
+        ],
+    )
+
+
+def mark_failed(
+    db: Session,
+    group_ids: Iterable[UUID],
+) -> None:
+    """Mark every digest of the given groups FAILED."""
+    ids = list(group_ids)
+    if not ids:
+        return
+    db.execute(
+        update(Digest)
+        .where(
+            Digest.message_group_id.in_(ids),
+            Digest.status == DigestStatus.PENDING,
+        )
+        .values(
+            status=DigestStatus.FAILED,
+        )
+        .execution_options(
+            synchronize_session=False,
+        )
+    )
@@ -0,0 +1,253 @@
+"""Materialized eligible (source, language, subscriber_count) rows.
+
+Pipeline stages read `eligible_source_languages` with a single query instead
+of walking every user. Rows are refreshed incrementally for the sources a
+subscription or premium change can affect, and fully by a periodic task.
+Helpers take the caller's session and never commit.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import EligibleSourceLanguage, Subscription, User
+
+
+def list_eligible_source_ids(
+    db: Session,
+) -> Set[UUID]:
+    rows = db.execute(
+        select(EligibleSourceLanguage.source_id).distinct()
+    ).all()
+    return {row.source_id for row in rows}
+
+
+def languages_by_source(
+    db: Session,
+) -> Dict[UUID, Set[str]]:
+    rows = db.execute(
+        select(
+            EligibleSourceLanguage.source_id,
+            EligibleSourceLanguage.language,
+        )
+    ).all()
+    by_source: Dict[UUID, Set[str]] = {}
+    for row in rows:
+        by_source.setdefault(row.source_id, set()).add(row.language)
+    return by_source
+
+
+def subscriber_counts_by_source(
+    db: Session,
+) -> Dict[UUID, int]:
+    rows = db.execute(
+        select(
+            EligibleSourceLanguage.source_id,
+            func.sum(EligibleSourceLanguage.subscriber_count).label("subscribers"),
+        ).group_by(
+            EligibleSourceLanguage.source_id,
+        )
+    ).all()
+    return {row.source_id: int(row.subscribers or 0) for row in rows}
+
+
+def subscriber_count_for_source(
+    db: Session,
+    source_id: UUID,
+) -> int:
+    return int(
+        db.scalar(
+            select(
+                func.sum(EligibleSourceLanguage.subscriber_count),
+            ).where(
+                EligibleSourceLanguage.source_id == source_id,
+            )
+        )
+        or 0
+    )
+
+
+def premium_source_ids(
+    db: Session,
+    source_ids: Iterable[UUID],
+    now: Optional[datetime] = None,
+) -> Set[UUID]:
+    """Those of `source_ids` with an active subscriber who has premium."""
+    ids = list(set(source_ids))
+    if not ids:
+        return set()
+    moment = now or datetime.utcnow()
+    rows = db.execute(
+        select(Subscription.source_id)
+        .distinct()
+        .join(
+            User,
+            User.id == Subscription.user_id,
+        )
+        .where(
+            Subscription.source_id.in_(ids),
+            Subscription.is_active.is_(True),
+            User.telegram_id.is_not(None),
+            User.premium_until.is_not(None),
+            User.premium_until > moment,
+        )
+    ).all()
+    return {row.source_id for row in rows}
+
+
+def refresh_all(
+    db: Session,
+    now: Optional[datetime] = None,
+) -> int:
+    """Recompute every row. Returns the number of (source, language) pairs."""
+    return _refresh(
+        db=db,
+        source_ids=None,
+        now=now,
+    )
+
+
+def refresh_for_sources(
+    db: Session,
+    source_ids: Iterable[UUID],
+    now: Optional[datetime] = None,
+) -> int:
+    ids = list(set(source_ids))
+    if not ids:
+        return 0
+    return _refresh(
+        db=db,
+        source_ids=ids,
+        now=now,
+    )
+
+
+def refresh_for_user(
+    db: Session,
+    user_id: UUID,
+    extra_source_ids: Iterable[UUID] = (),
+    now: Optional[datetime] = None,
+) -> int:
+    """Refresh every source the user is (or just was) subscribed to.
+
+    Call after flushing the user's changes; `extra_source_ids` covers sources
+    the user no longer has a subscription row for.
+    """
+    db.flush()
+    source_ids = set(extra_source_ids)
+    source_ids.update(
+        db.scalars(
+            select(Subscription.source_id).where(
+                Subscription.user_id == user_id,
+            )
+        ).all()
+    )
+    return refresh_for_sources(
+        db=db,
+        source_ids=source_ids,
+        now=now,
+    )
+
+
+def _eligible_counts_select(
+    now: datetime,
+    source_ids: Optional[List[UUID]],
+):
+    active_count = func.count().over(
+        partition_by=Subscription.user_id,
+    )
+    subs = (
+        select(
+            Subscription.source_id.label("source_id"),
+            Subscription.language.label("language"),
+            active_count.label("active_count"),
+            User.premium_until.label("premium_until"),
+        )
+        .join(
+            User,
+            User.id == Subscription.user_id,
+        )
+        .where(
+            User.telegram_id.is_not(None),
+            Subscription.is_active.is_(True),
+        )
+        .subquery("subs")
+    )
+    stmt = (
+        select(
+            subs.c.source_id,
+            subs.c.language,
+            func.count().label("subscriber_count"),
+        )
+        .where(
+            or_(
+                subs.c.active_count <= 1,
+                and_(
+                    subs.c.premium_until.is_not(None),
+                    subs.c.premium_until > now,
+                ),
+            )
+        )
+        .group_by(
+            subs.c.source_id,
+            subs.c.language,
+        )
+    )
+    if source_ids is not None:
+        stmt = stmt.where(
+            subs.c.source_id.in_(source_ids),
+        )
+    return stmt
+
+
+def _refresh(
+    db: Session,
+    source_ids: Optional[List[UUID]],
+    now: Optional[datetime],
+) -> int:
+    moment = now or datetime.utcnow()
+    rows = db.execute(
+        _eligible_counts_select(
+            now=moment,
+            source_ids=source_ids,
+        )
+    ).all()
+
+    stale = delete(EligibleSourceLanguage)
+    if source_ids is not None:
+        stale = stale.where(
+            EligibleSourceLanguage.source_id.in_(source_ids),
+        )
+    db.execute(stale)
+
+    if rows:
+        stmt = pg_insert(EligibleSourceLanguage).values(
+            [
+                {
+                    "source_id": row.source_id,
+                    "language": row.language,
+                    "subscriber_count": int(row.subscriber_count),
+                    "refreshed_at": moment,
+                }
+                for row in rows
+            ]
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    EligibleSourceLanguage.source_id,
+                    EligibleSourceLanguage.language,
+                ],
+                set_={
+                    "subscriber_count": stmt.excluded.subscriber_count,
+                    "refreshed_at": stmt.excluded.refreshed_at,
+                },
+            )
+        )
+    return len(rows)
@@ -0,0 +1,54 @@
+"""Enrichment queue stored on `NewsItem` rows.
+
+Helpers take the caller's session and never commit; claimed rows stay
+locked until the caller's transaction ends.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import EnrichmentStatus, NewsItem
+
+
+def claim_pending(
+    db: Session,
+    limit: int,
+) -> List[NewsItem]:
+    """Lock up to `limit` PENDING items, freshest and least-retried first."""
+    return list(
+        db.execute(
+            select(NewsItem)
+            .where(
+                NewsItem.enrichment_status == EnrichmentStatus.PENDING,
+            )
+            .order_by(
+                NewsItem.enrichment_attempts.asc(),
+                NewsItem.created_at.desc(),
+            )
+            .limit(limit)
+            .with_for_update(
+                skip_locked=True,
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+
+def ready_for_summary(
+    now: datetime,
+    deadline_seconds: int,
+) -> ColumnElement[bool]:
+    """Items whose enrichment finished, or that waited past the deadline."""
+    return or_(
+        NewsItem.enrichment_status != EnrichmentStatus.PENDING,
+        NewsItem.created_at <= now - timedelta(
+            seconds=deadline_seconds,
+        ),
+    )
@@ -0,0 +1,112 @@
+"""Ingestion schedule stored on `Source` rows.
+
+Helpers take the caller's session and never commit.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import NewsItem, Source
+
+
+def claim_due_sources(
+    db: Session,
+    now: Optional[datetime] = None,
+    limit: int = 200,
+) -> List[UUID]:
+    """Return ids of due sources and push their `next_poll_at` one interval out.
+
+    Due rows are locked with SKIP LOCKED, so overlapping fan-out runs never
+    claim the same source twice.
+    """
+    now = now or datetime.utcnow()
+    due = (
+        select(Source.id)
+        .where(
+            Source.ingest_enabled.is_(True),
+            or_(
+                Source.next_poll_at.is_(None),
+                Source.next_poll_at <= now,
+            ),
+        )
+        .order_by(
+            Source.next_poll_at.asc().nulls_first(),
+        )
+        .limit(limit)
+        .with_for_update(
+            skip_locked=True,
+        )
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        update(Source)
+        .where(
+            Source.id.in_(due),
+        )
+        .values(
+            last_polled_at=now,
+            next_poll_at=now + func.make_interval(
+                0, 0, 0, 0, 0, 0, Source.poll_interval_seconds,
+            ),
+        )
+        .returning(Source.id)
+        .execution_options(
+            synchronize_session=False,
+        )
+    ).all()
+    return [row.id for row in rows]
+
+
+def poll_now(
+    db: Session,
+    source_ids: Iterable[UUID],
+    now: Optional[datetime] = None,
+) -> None:
+    """Make sources due at once, e.g. when they gain a subscriber.
+
+    A source nobody received sat at the maximum interval; the new subscriber
+    should not wait that out.
+    """
+    ids = list(set(source_ids))
+    if not ids:
+        return
+    now = now or datetime.utcnow()
+    db.execute(
+        update(Source)
+        .where(
+            Source.id.in_(ids),
+            or_(
+                Source.next_poll_at.is_(None),
+                Source.next_poll_at > now,
+            ),
+        )
+        .values(
+            next_poll_at=now,
+        )
+        .execution_options(
+            synchronize_session=False,
+        )
+    )
+
+
+def count_items_since(
+    db: Session,
+    source_id: UUID,
+    since: datetime,
+) -> int:
+    """Number of items of a source published (`fetched_at`) after `since`."""
+    return int(
+        db.scalar(
+            select(func.count(NewsItem.id)).where(
+                NewsItem.source_id == source_id,
+                NewsItem.fetched_at >= since,
+            )
+        )
+        or 0
+    )
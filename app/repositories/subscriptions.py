@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 
 from app.db.models import Source, Subscription, User
 from app.db.session import get_sync_db
+from app.repositories import eligible_sources as eligible_sources_repo
+from app.repositories import source_schedule as source_schedule_repo
 
 
 def list_by_user_id(
@@ -60,6 +62,10 @@ def deactivate_all_for_user(
             .all()
         ):
             sub.is_active = False
+        eligible_sources_repo.refresh_for_user(
+            db=db,
+            user_id=user_id,
+        )
         db.commit()
     finally:
         db.close()
@@ -84,11 +90,17 @@ def apply_sources_selection(
             .all()
         )
         existing_by_source = {sub.source_id: sub for sub in all_subs}
+        ids_to_add = selected_source_ids - set(existing_by_source.keys())
+        activated = set(ids_to_add)
+        activated.update(
+            sub.source_id
+            for sub in all_subs
+            if not sub.is_active and sub.source_id in selected_source_ids
+        )
 
         for sub in all_subs:
             sub.is_active = sub.source_id in selected_source_ids
 
-        ids_to_add = selected_source_ids - set(existing_by_source.keys())
         if ids_to_add:
             preferred_language = None
             for sub in all_subs:
@@ -104,6 +116,14 @@ def apply_sources_selection(
                         is_active=True,
                     )
                 )
+        eligible_sources_repo.refresh_for_user(
+            db=db,
+            user_id=user_id,
+        )
+        source_schedule_repo.poll_now(
+            db=db,
+            source_ids=activated,
+        )
         db.commit()
     finally:
         db.close()
@@ -129,12 +149,16 @@ def upsert_for_user_and_sources_with_language(
             .all()
         )
         existing_by_source = {sub.source_id: sub for sub in all_subs}
+        activated = set()
         for src_id in source_ids:
             sub = existing_by_source.get(src_id)
             if sub:
+                if not sub.is_active:
+                    activated.add(src_id)
                 sub.language = language_code
                 sub.is_active = True
             else:
+                activated.add(src_id)
                 db.add(
                     Subscription(
                         user_id=user_id,
@@ -143,6 +167,14 @@ def upsert_for_user_and_sources_with_language(
                         is_active=True,
                     )
                 )
+        eligible_sources_repo.refresh_for_user(
+            db=db,
+            user_id=user_id,
+        )
+        source_schedule_repo.poll_now(
+            db=db,
+            source_ids=activated,
+        )
         db.commit()
     finally:
         db.close()
@@ -164,6 +196,10 @@ def set_language_for_all_user_subscriptions(
         )
         for sub in subs:
             sub.language = language_code
+        eligible_sources_repo.refresh_for_user(
+            db=db,
+            user_id=user_id,
+        )
         db.commit()
     finally:
         db.close()
@@ -188,7 +224,17 @@ def set_first_active_subscription_source(
             .first()
         )
         if sub:
+            previous_source_id = sub.source_id
             sub.source_id = new_source_id
+            eligible_sources_repo.refresh_for_user(
+                db=db,
+                user_id=user_id,
+                extra_source_ids=[previous_source_id],
+            )
+            source_schedule_repo.poll_now(
+                db=db,
+                source_ids=[new_source_id],
+            )
             db.commit()
     finally:
         db.close()
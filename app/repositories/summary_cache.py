@@ -0,0 +1,106 @@
+"""Summaries keyed by (content hash, model, prompt version).
+
+Helpers take the caller's session and never commit.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.models import NewsItem, SummaryCache
+
+
+def needs_summary(
+    redo_provisional: bool = True,
+    max_fallback_attempts: Optional[int] = None,
+) -> ColumnElement[bool]:
+    """Items never summarized, or whose content differs from their summary's.
+
+    A NULL `summary_content_hash` marks a provisional summary: the
+    title/link placeholder of an item without text, or a fallback summary
+    made while the preferred backend was down. It is redone once the item
+    has content, unless `redo_provisional` is off. A fallback summary is
+    redone at most `max_fallback_attempts` times in a row (counted by
+    `summary_attempts`), then kept until the content changes. Rows
+    summarized before hashing have no `content_hash` either and keep their
+    summary until the content is rewritten.
+    """
+    stale = and_(
+        NewsItem.content_hash.is_not(None),
+        NewsItem.content_hash.is_distinct_from(NewsItem.summary_content_hash),
+    )
+    if not redo_provisional:
+        stale = and_(
+            stale,
+            NewsItem.summary_content_hash.is_not(None),
+        )
+    elif max_fallback_attempts is not None:
+        stale = and_(
+            stale,
+            or_(
+                NewsItem.summary_content_hash.is_not(None),
+                NewsItem.summary_attempts < max_fallback_attempts,
+            ),
+        )
+    return or_(
+        NewsItem.summary.is_(None),
+        stale,
+    )
+
+
+def get_many(
+    db: Session,
+    content_hashes: Iterable[str],
+    model: str,
+    prompt_version: str,
+) -> Dict[str, str]:
+    hashes = list({h for h in content_hashes if h})
+    if not hashes:
+        return {}
+    rows = db.execute(
+        select(
+            SummaryCache.content_hash,
+            SummaryCache.summary,
+        ).where(
+            SummaryCache.content_hash.in_(hashes),
+            SummaryCache.model == model,
+            SummaryCache.prompt_version == prompt_version,
+        )
+    ).all()
+    return {
+        row.content_hash: row.summary
+        for row in rows
+    }
+
+
+def put(
+    db: Session,
+    content_hash: str,
+    model: str,
+    prompt_version: str,
+    summary: str,
+) -> None:
+    now = datetime.utcnow()
+    stmt = pg_insert(SummaryCache).values(
+        content_hash=content_hash,
+        model=model,
+        prompt_version=prompt_version,
+        summary=summary,
+        created_at=now,
+        updated_at=now,
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_summary_cache_key",
+            set_={
+                "summary": stmt.excluded.summary,
+                "updated_at": now,
+            },
+        )
+    )
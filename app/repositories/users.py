@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 
 from app.db.models import User
 from app.db.session import get_sync_db
+from app.repositories import eligible_sources as eligible_sources_repo
+from app.services.premium.invalidation import publish_premium_change
 
 
 def get_by_telegram_id(
@@ -114,7 +116,14 @@ def grant_or_extend_premium(
             user.premium_until = max(current_until, now) + timedelta(days=365 * 100)
         else:
             user.premium_until = max(current_until, now) + timedelta(days=term_days)
+        eligible_sources_repo.refresh_for_user(
+            db=db,
+            user_id=user.id,
+        )
         db.commit()
+        publish_premium_change(
+            telegram_id=telegram_id,
+        )
         return user.premium_until
     finally:
         db.close()
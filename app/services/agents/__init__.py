@@ -1,10 +1,21 @@
 """AI agents used across the application (e.g., summarizer)."""
 
-from app.services.agents.summarizer.agent import SummarizerAgent, SummarizeInput
+from app.services.agents.summarizer import (
+    SUMMARIZER_BACKENDS,
+    ExtractiveSummarizer,
+    SummarizerAgent,
+    SummarizerBackend,
+    SummarizerRouter,
+    SummarizeInput,
+    SummaryResult,
+)
 
 __all__ = [
+    "SUMMARIZER_BACKENDS",
+    "ExtractiveSummarizer",
     "SummarizerAgent",
+    "SummarizerBackend",
+    "SummarizerRouter",
     "SummarizeInput",
+    "SummaryResult",
 ]
-
-
@@ -1,8 +1,18 @@
-from app.services.agents.summarizer.agent import SummarizerAgent, SummarizeInput
+from app.services.agents.summarizer.agent import SummarizerAgent
+from app.services.agents.summarizer.backend import SummarizeInput, SummarizerBackend
+from app.services.agents.summarizer.extractive import ExtractiveSummarizer
+from app.services.agents.summarizer.router import (
+    SUMMARIZER_BACKENDS,
+    SummarizerRouter,
+    SummaryResult,
+)
 
 __all__ = [
+    "SUMMARIZER_BACKENDS",
+    "ExtractiveSummarizer",
     "SummarizerAgent",
+    "SummarizerBackend",
+    "SummarizerRouter",
     "SummarizeInput",
+    "SummaryResult",
 ]
-
-
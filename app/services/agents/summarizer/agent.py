@@ -1,28 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 
 from app.config import get_settings
 from app.services.llm.open_ai.service import (
+    ChatMessage,
     OpenAIChatService,
+    RequestHook,
     build_messages,
 )
-from app.services.agents.summarizer.prompt import SYSTEM_PROMPT
-
-
-@dataclass
-class SummarizeInput:
-    """Input payload for summarization."""
-
-    title: str
-    content: str
-    url: Optional[str]
+from app.services.agents.summarizer.backend import SummarizeInput
+from app.services.agents.summarizer.preprocess import PreparedArticle, prepare_article
+from app.services.agents.summarizer.prompt import PROMPT_VERSION, SYSTEM_PROMPT
 
 
 class SummarizerAgent:
     """Abstractive TL;DR generator with deterministic style."""
 
+    name = "openai"
+
     def __init__(
         self,
         model: str | None = None,
@@ -30,8 +29,11 @@ class SummarizerAgent:
         max_retries: int = 2,
     ) -> None:
         settings = get_settings()
+        self.model = model or settings.openai_model or "gpt-4o-mini"
+        self.prompt_version = PROMPT_VERSION
+        self.input_token_budget = settings.summarize_input_token_budget
         self.client = OpenAIChatService(
-            model=(model or settings.openai_model or "gpt-4o-mini"),
+            model=self.model,
             request_timeout_seconds=request_timeout_seconds,
             max_retries=max_retries,
         )
@@ -43,24 +45,110 @@ class SummarizerAgent:
         temperature: float = 0.1,
         seed: int | None = 42,
     ) -> str:
+        prepared = self._prepare(
+            payload=payload,
+        )
+        started = time.perf_counter()
+        text = self.client.chat(
+            messages=self._messages(
+                payload=payload,
+                content=prepared.text,
+            ),
+            temperature=temperature,
+            max_tokens=max_output_tokens,
+            seed=seed,
+        )
+        return self._finish(
+            payload=payload,
+            prepared=prepared,
+            text=text,
+            started=started,
+        )
+
+    async def asummarize(
+        self,
+        payload: SummarizeInput,
+        max_output_tokens: int = 512,
+        temperature: float = 0.1,
+        seed: int | None = 42,
+        on_request: Optional[RequestHook] = None,
+    ) -> str:
+        """Async `summarize` within the shared OpenAI rate budget."""
+        prepared = self._prepare(
+            payload=payload,
+        )
+        started = time.perf_counter()
+        text = await self.client.achat(
+            messages=self._messages(
+                payload=payload,
+                content=prepared.text,
+            ),
+            temperature=temperature,
+            max_tokens=max_output_tokens,
+            seed=seed,
+            on_request=on_request,
+        )
+        return self._finish(
+            payload=payload,
+            prepared=prepared,
+            text=text,
+            started=started,
+        )
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Share one HTTP session across the `asummarize` calls made inside."""
+        async with self.client.session():
+            yield
+
+    def _prepare(
+        self,
+        payload: SummarizeInput,
+    ) -> PreparedArticle:
+        return prepare_article(
+            content=payload.content or "",
+            token_budget=self.input_token_budget,
+            model=self.model,
+        )
+
+    def _messages(
+        self,
+        payload: SummarizeInput,
+        content: str,
+    ) -> List[ChatMessage]:
         article = self._compose_article(
             title=payload.title,
-            content=payload.content,
+            content=content,
             url=payload.url,
         )
-        messages = build_messages(
+        return build_messages(
             system_prompt=SYSTEM_PROMPT,
             user_prompt=article,
         )
-        text = self.client.chat(
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_output_tokens,
-            seed=seed,
-        )
-        return self._postprocess(
+
+    def _finish(
+        self,
+        payload: SummarizeInput,
+        prepared: PreparedArticle,
+        text: str,
+        started: float,
+    ) -> str:
+        summary = self._postprocess(
             text=text,
         )
+        logging.getLogger(__name__).info(
+            "summary_generated",
+            extra={
+                "backend": self.name,
+                "url": payload.url,
+                "content_tokens": prepared.original_tokens,
+                "prompt_content_tokens": prepared.tokens,
+                "trimmed": prepared.trimmed,
+                "summary_chars": len(summary),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        return summary
 
     def _compose_article(
         self,
@@ -0,0 +1,49 @@
+"""Interface shared by the summarizer backends.
+
+`model` and `prompt_version` identify a backend's output in the summary
+cache, so two backends never serve each other's summaries.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import AsyncContextManager, Callable, Optional, Protocol
+
+
+@dataclass
+class SummarizeInput:
+    """Input payload for summarization."""
+
+    title: str
+    content: str
+    url: Optional[str]
+
+
+class SummarizerBackend(Protocol):
+    name: str
+    model: str
+    prompt_version: str
+
+    def summarize(
+        self,
+        payload: SummarizeInput,
+        max_output_tokens: int = 512,
+        temperature: float = 0.1,
+        seed: int | None = 42,
+    ) -> str:
+        ...
+
+    async def asummarize(
+        self,
+        payload: SummarizeInput,
+        max_output_tokens: int = 512,
+        temperature: float = 0.1,
+        seed: int | None = 42,
+        on_request: Optional[Callable[[bool, float], None]] = None,
+    ) -> str:
+        """`on_request(ok, elapsed_seconds)` after each provider request, if any."""
+        ...
+
+    def session(self) -> AsyncContextManager[None]:
+        """Context for a batch of `asummarize` calls (shared connections)."""
+        ...
@@ -0,0 +1,192 @@
+"""CPU-only extractive summarizer (TextRank).
+
+Sentences come from the same splitter as the LLM input trimming. Each
+sentence is a TF-IDF vector; cosine similarities form a weighted graph,
+and PageRank by power iteration ranks the sentences, with a teleport
+vector that favours early sentences. The lead sentence plus the
+top-ranked ones are returned in article order, one per line, in the
+shape the LLM summaries use.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services.agents.summarizer.backend import SummarizeInput
+from app.services.agents.summarizer.preprocess import sentence_terms, split_sentences
+
+# Bump whenever scoring or selection changes; cached summaries are keyed by it.
+EXTRACTIVE_VERSION = "textrank-2"
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+# Similarity is quadratic in sentences; the tail of a long article rarely wins.
+MAX_INPUT_SENTENCES = 200
+MAX_SENTENCES = 3
+MAX_CHARS = 600
+
+
+class ExtractiveSummarizer:
+    """Pick the most central sentences of the article; no network calls."""
+
+    name = "extractive"
+
+    def __init__(
+        self,
+        max_sentences: int = MAX_SENTENCES,
+        max_chars: int = MAX_CHARS,
+    ) -> None:
+        self.model = "textrank"
+        self.prompt_version = EXTRACTIVE_VERSION
+        self.max_sentences = max_sentences
+        self.max_chars = max_chars
+
+    def summarize(
+        self,
+        payload: SummarizeInput,
+        max_output_tokens: int = 512,
+        temperature: float = 0.1,
+        seed: int | None = 42,
+    ) -> str:
+        """Sampling arguments are accepted for interface parity and ignored."""
+        started = time.perf_counter()
+        sentences = split_sentences(
+            content=payload.content or "",
+        )[:MAX_INPUT_SENTENCES]
+        if sentences:
+            summary = self._select(
+                sentences=sentences,
+                scores=textrank_scores(
+                    sentences=sentences,
+                ),
+            )
+        else:
+            summary = _truncate(
+                text=" ".join((payload.content or payload.title or "").split()),
+                max_chars=self.max_chars,
+            )
+        logging.getLogger(__name__).info(
+            "summary_generated",
+            extra={
+                "backend": self.name,
+                "url": payload.url,
+                "sentences": len(sentences),
+                "summary_chars": len(summary),
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        )
+        return summary
+
+    async def asummarize(
+        self,
+        payload: SummarizeInput,
+        max_output_tokens: int = 512,
+        temperature: float = 0.1,
+        seed: int | None = 42,
+        on_request: Optional[Callable[[bool, float], None]] = None,
+    ) -> str:
+        # A few milliseconds of NumPy; not worth a thread hop. No provider,
+        # so `on_request` is never called.
+        return self.summarize(
+            payload=payload,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            seed=seed,
+        )
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        yield
+
+    def _select(
+        self,
+        sentences: List[str],
+        scores: np.ndarray,
+    ) -> str:
+        keep: List[int] = []
+        used = 0
+        # The lead is kept like in the LLM input trimming; rank fills the rest.
+        ranked = [0] + [int(i) for i in np.argsort(-scores, kind="stable") if i != 0]
+        for i in ranked:
+            length = len(sentences[i]) + (1 if keep else 0)
+            if used + length > self.max_chars:
+                continue
+            keep.append(i)
+            used += length
+            if len(keep) >= self.max_sentences:
+                break
+        if not keep:
+            # Every sentence is longer than the limit: cut the best one.
+            return _truncate(
+                text=sentences[int(np.argmax(scores))],
+                max_chars=self.max_chars,
+            )
+        return "\n".join(sentences[i] for i in sorted(keep))
+
+
+def textrank_scores(
+    sentences: List[str],
+) -> np.ndarray:
+    """PageRank over the TF-IDF cosine-similarity graph; scores sum to 1."""
+    n = len(sentences)
+    terms = [sentence_terms(s) for s in sentences]
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, sentence_words in enumerate(terms):
+        for word in sentence_words:
+            rows.append(i)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    position_prior = 1.0 / np.arange(1, n + 1)
+    position_prior /= position_prior.sum()
+    if not vocabulary or n == 1:
+        return position_prior
+
+    tf = np.zeros((n, len(vocabulary)))
+    np.add.at(tf, (rows, cols), 1.0)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = np.log1p(tf) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights = np.divide(
+        weights,
+        norms,
+        out=np.zeros_like(weights),
+        where=norms > 0,
+    )
+
+    similarity = weights @ weights.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no words with the rest jump uniformly.
+    transition = np.divide(
+        similarity,
+        out_weight,
+        out=np.full_like(similarity, 1.0 / n),
+        where=out_weight > 0,
+    )
+
+    scores = position_prior.copy()
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) * position_prior + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def _truncate(
+    text: str,
+    max_chars: int,
+) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[: max_chars - 1].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:") + "…"
@@ -0,0 +1,203 @@
+"""Trim article text to a token budget before it reaches the LLM.
+
+Steps:
+- split into sentences (extracted text usually has its line breaks
+  collapsed, so paragraphs are not reliable)
+- drop boilerplate (short newsletter/cookie/share prompts, nav and
+  copyright lines, trailing comment sections) and repeated sentences
+- keep the lead, then add the highest-scoring remaining sentences by
+  TF-IDF weight plus a position bonus, in original order, until the
+  budget is used
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from app.services.llm.tokens import count_tokens
+
+LEAD_SENTENCES = 3
+MIN_SENTENCE_CHARS = 20
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9А-ЯЁ])")
+_WORD_RE = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+# Boilerplate is only recognized as a whole short line or sentence that
+# starts like one of these templates; the same words inside prose (an
+# article about cookies or advertising) are left alone.
+MAX_BOILERPLATE_WORDS = 15
+_BOILERPLATE_RE = re.compile(
+    r"(?:(?:please\s+)?(?:subscribe|sign up)\b"
+    r"|(?:log ?in|sign in) to\b"
+    r"|(?:this (?:site|website) uses|we use|accept(?: all)?) cookies\b"
+    r"|by (?:using|continuing to use) (?:this|our) (?:site|website)\b"
+    r"|©|\(c\)\s*\d{4}|copyright\s+(?:©\s*)?\d{4}"
+    r"|all rights reserved\b"
+    r"|click here\b"
+    r"|read more\b"
+    r"|follow us\b"
+    r"|share (?:this|on)\b"
+    r"|related (?:articles|posts|stories)\b"
+    r"|leave a (?:comment|reply)\b"
+    r"|comments?\s*\(\d+\)"
+    r"|(?:privacy policy|terms of (?:use|service)|cookie (?:policy|settings))"
+    r"(?:\s*[|·•].*)?$"
+    r"|(?:advertisement|sponsored(?: content)?)$"
+    # Menus: three or more short items separated by bars or bullets.
+    r"|(?:[^|·•]{1,30}[|·•]\s*){2,}[^|·•]{1,30}$)",
+    re.IGNORECASE,
+)
+_BOILERPLATE_STRIP = " \t-–—•|>*:."
+# A line starting with one of these begins reader comments or site chrome;
+# everything after it is dropped.
+_TAIL_RE = re.compile(
+    r"^[ \t]*(?:\d+\s+comments|comments are closed|join the conversation|"
+    r"you may also like)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+@dataclass
+class PreparedArticle:
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def trimmed(self) -> bool:
+        return self.tokens < self.original_tokens
+
+
+def prepare_article(
+    content: str,
+    token_budget: int,
+    model: Optional[str] = None,
+) -> PreparedArticle:
+    """Return `content` cut down to about `token_budget` tokens."""
+    original_tokens = count_tokens(
+        text=content,
+        model=model,
+    )
+    if original_tokens <= token_budget:
+        return PreparedArticle(
+            text=content,
+            original_tokens=original_tokens,
+            tokens=original_tokens,
+        )
+
+    sentences = split_sentences(
+        content=content,
+    )
+    if not sentences:
+        sentences = [content]
+    lengths = [
+        count_tokens(
+            text=s,
+            model=model,
+        )
+        for s in sentences
+    ]
+    scores = _score(
+        sentences=sentences,
+    )
+
+    keep: List[int] = []
+    used = 0
+    ranked = list(range(min(LEAD_SENTENCES, len(sentences))))
+    ranked += sorted(
+        range(len(ranked), len(sentences)),
+        key=lambda i: scores[i],
+        reverse=True,
+    )
+    for i in ranked:
+        if used + lengths[i] > token_budget:
+            if keep:
+                continue
+            # A single oversized lead sentence: cut it by characters.
+            ratio = token_budget / max(lengths[i], 1)
+            sentences[i] = sentences[i][: int(len(sentences[i]) * ratio)]
+            lengths[i] = token_budget
+        keep.append(i)
+        used += lengths[i]
+
+    text = " ".join(sentences[i] for i in sorted(keep))
+    return PreparedArticle(
+        text=text,
+        original_tokens=original_tokens,
+        tokens=count_tokens(
+            text=text,
+            model=model,
+        ),
+    )
+
+
+def split_sentences(
+    content: str,
+) -> List[str]:
+    """Sentences of `content` without boilerplate, comments or repeats."""
+    tail = _TAIL_RE.search(content)
+    if tail and tail.start() > len(content) // 2:
+        content = content[: tail.start()]
+    seen = set()
+    sentences: List[str] = []
+    for line in content.splitlines():
+        if _is_boilerplate(line):
+            continue
+        for raw in _SENTENCE_RE.split(line):
+            sentence = " ".join(raw.split())
+            if len(sentence) < MIN_SENTENCE_CHARS or _is_boilerplate(sentence):
+                continue
+            key = sentence.casefold()
+            if key in seen:
+                continue
+            seen.add(key)
+            sentences.append(sentence)
+    return sentences
+
+
+def _is_boilerplate(
+    text: str,
+) -> bool:
+    """True for a short line or sentence that is site chrome, not article."""
+    words = text.split()
+    if not words or len(words) > MAX_BOILERPLATE_WORDS:
+        return False
+    return bool(
+        _BOILERPLATE_RE.match(
+            " ".join(words).strip(_BOILERPLATE_STRIP),
+        )
+    )
+
+
+def sentence_terms(
+    sentence: str,
+) -> List[str]:
+    return [w.casefold() for w in _WORD_RE.findall(sentence)]
+
+
+def _score(
+    sentences: List[str],
+) -> List[float]:
+    """TF-IDF weight per sentence, normalized by length, plus position bonus."""
+    words = [sentence_terms(s) for s in sentences]
+    document_frequency: Counter = Counter()
+    for sentence_words in words:
+        document_frequency.update(set(sentence_words))
+    total = len(sentences)
+    idf: Dict[str, float] = {
+        word: math.log((1 + total) / (1 + df)) + 1
+        for word, df in document_frequency.items()
+    }
+    corpus_tf = Counter(w for sentence_words in words for w in sentence_words)
+    scores = []
+    for position, sentence_words in enumerate(words):
+        if not sentence_words:
+            scores.append(0.0)
+            continue
+        weight = sum(corpus_tf[w] * idf[w] for w in set(sentence_words))
+        weight /= math.sqrt(len(sentence_words))
+        scores.append(weight * (1 + 1 / (1 + position)))
+    return scores
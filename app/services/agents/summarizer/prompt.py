@@ -9,4 +9,6 @@ SYSTEM_PROMPT: str = (
     "Do not use bullet or numbering characters (no •, -, *, 1., etc.). Output only lines of text."
 )
 
-
+# Bump whenever SYSTEM_PROMPT, input trimming or post-processing changes;
+# cached summaries are keyed by it.
+PROMPT_VERSION: str = "2026-10-18.2"
@@ -0,0 +1,212 @@
+"""Choose a summarizer backend per item, falling back to the local one.
+
+Backends are named in `SUMMARIZER_BACKENDS`; `summarize_backend` serves
+items that reach a premium subscriber and `summarize_free_tier_backend`
+the rest. The extractive backend stands in when a backend cannot be built
+(no API key), while its circuit breaker is open, and for individual calls
+that fail, so a batch always finishes. Results produced in the last two
+cases are flagged `fallback`, so callers can redo them once the backend
+recovers. The breaker sees provider request latency only, not time spent
+in the rate budget or backing off.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from app.config import get_settings
+from app.services.agents.summarizer.agent import SummarizerAgent
+from app.services.agents.summarizer.backend import SummarizeInput, SummarizerBackend
+from app.services.agents.summarizer.extractive import ExtractiveSummarizer
+from app.services.llm.circuit_breaker import CircuitBreaker
+
+K = TypeVar("K", bound=Hashable)
+
+SUMMARIZER_BACKENDS: Dict[str, Callable[[], SummarizerBackend]] = {
+    "openai": SummarizerAgent,
+    "extractive": ExtractiveSummarizer,
+}
+
+
+@dataclass
+class SummaryResult:
+    text: str
+    model: str
+    prompt_version: str
+    # Made by the extractive backend in place of a failing or open backend.
+    fallback: bool = False
+
+
+class SummarizerRouter:
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        free_tier_backend: Optional[str] = None,
+    ) -> None:
+        """ValueError for an unknown backend name."""
+        settings = get_settings()
+        self.fallback = ExtractiveSummarizer()
+        self._backends: Dict[str, SummarizerBackend] = {
+            self.fallback.name: self.fallback,
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.premium = self._load(
+            name=backend or settings.summarize_backend,
+        )
+        self.free_tier = self._load(
+            name=free_tier_backend or settings.summarize_free_tier_backend,
+        )
+
+    def backend_for(
+        self,
+        premium: bool,
+    ) -> SummarizerBackend:
+        """Configured backend for an item with or without a premium reader.
+
+        `summarize_many` swaps in the fallback per call while its breaker is
+        open.
+        """
+        return self.premium if premium else self.free_tier
+
+    def degraded(
+        self,
+    ) -> bool:
+        """True while any configured backend's breaker is open."""
+        return any(breaker.is_open() for breaker in self._breakers.values())
+
+    async def summarize_many(
+        self,
+        payloads: Dict[K, SummarizeInput],
+        backends: Mapping[K, SummarizerBackend],
+        concurrency: int,
+        max_output_tokens: int = 512,
+        temperature: float = 0.1,
+        seed: int | None = 42,
+    ) -> AsyncIterator[Tuple[K, Optional[SummaryResult]]]:
+        """Yield (key, result) as calls finish; result is None if all backends failed."""
+        semaphore = asyncio.Semaphore(
+            concurrency,
+        )
+
+        async def run(
+            key: K,
+            payload: SummarizeInput,
+        ) -> Tuple[K, Optional[SummaryResult]]:
+            async with semaphore:
+                return key, await self._summarize(
+                    key=key,
+                    backend=backends[key],
+                    payload=payload,
+                    max_output_tokens=max_output_tokens,
+                    temperature=temperature,
+                    seed=seed,
+                )
+
+        async with AsyncExitStack() as stack:
+            for backend in {id(b): b for b in backends.values()}.values():
+                await stack.enter_async_context(backend.session())
+            for next_done in asyncio.as_completed(
+                [run(key, payload) for key, payload in payloads.items()]
+            ):
+                yield await next_done
+
+    async def _summarize(
+        self,
+        key: K,
+        backend: SummarizerBackend,
+        payload: SummarizeInput,
+        max_output_tokens: int,
+        temperature: float,
+        seed: int | None,
+    ) -> Optional[SummaryResult]:
+        breaker = self._breakers.get(backend.name)
+        if breaker is not None:
+            # Checked per call so a breaker opened mid-batch takes effect at once.
+            if not breaker.is_open():
+                try:
+                    text = await backend.asummarize(
+                        payload=payload,
+                        max_output_tokens=max_output_tokens,
+                        temperature=temperature,
+                        seed=seed,
+                        on_request=lambda ok, elapsed: breaker.record(
+                            ok=ok,
+                            elapsed_seconds=elapsed,
+                        ),
+                    )
+                except Exception as e:  # noqa: BLE001
+                    logging.getLogger(__name__).warning(
+                        "summarize_failed",
+                        extra={"key": str(key), "backend": backend.name, "error": str(e)},
+                    )
+                else:
+                    return SummaryResult(
+                        text=text,
+                        model=backend.model,
+                        prompt_version=backend.prompt_version,
+                    )
+            backend = self.fallback
+
+        try:
+            text = await backend.asummarize(
+                payload=payload,
+                max_output_tokens=max_output_tokens,
+                temperature=temperature,
+                seed=seed,
+            )
+        except Exception as e:  # noqa: BLE001
+            logging.getLogger(__name__).warning(
+                "summarize_failed",
+                extra={"key": str(key), "backend": backend.name, "error": str(e)},
+            )
+            return None
+        return SummaryResult(
+            text=text,
+            model=backend.model,
+            prompt_version=backend.prompt_version,
+            fallback=breaker is not None,
+        )
+
+    def _load(
+        self,
+        name: str,
+    ) -> SummarizerBackend:
+        if name in self._backends:
+            return self._backends[name]
+        factory = SUMMARIZER_BACKENDS.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown summarizer backend: {name}")
+        try:
+            backend = factory()
+        except RuntimeError as e:
+            # e.g. no OPENAI_API_KEY: summarize locally instead of failing.
+            logging.getLogger(__name__).warning(
+                "summarizer_backend_unavailable",
+                extra={"backend": name, "error": str(e)},
+            )
+            backend = self.fallback
+        else:
+            settings = get_settings()
+            self._breakers[backend.name] = CircuitBreaker(
+                name=f"summarize:{backend.model}",
+                error_rate=settings.summarize_breaker_error_rate,
+                slow_seconds=settings.summarize_breaker_slow_seconds,
+                slow_rate=settings.summarize_breaker_slow_rate,
+                min_calls=settings.summarize_breaker_min_calls,
+                open_seconds=settings.summarize_breaker_open_seconds,
+            )
+        self._backends[name] = backend
+        return backend
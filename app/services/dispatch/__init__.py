@@ -0,0 +1,27 @@
+"""News dispatch planning and delivery helpers."""
+
+from app.services.dispatch.planner import (
+    DispatchPlan,
+    DispatchPlanner,
+    PlannedItem,
+    PlannedSubscription,
+    shard_clause,
+)
+from app.services.dispatch.rendering import (
+    RenderCache,
+    render_cache,
+    render_message,
+)
+from app.services.dispatch.trigger import request_source_dispatch
+
+__all__ = [
+    "DispatchPlan",
+    "DispatchPlanner",
+    "PlannedItem",
+    "PlannedSubscription",
+    "RenderCache",
+    "render_cache",
+    "render_message",
+    "request_source_dispatch",
+    "shard_clause",
+]
@@ -0,0 +1,520 @@
+"""Set-based delivery planner for news dispatch.
+
+Builds the whole send plan for a dispatch run in a few SQL statements:
+1. active subscriptions with per-user active count and premium flag (window)
+2. top-N items summarized after each eligible subscription's
+   `DeliveryCursor` (LATERAL), translations joined; items already in the
+   outbox or sent are skipped, failed ones are offered again up to
+   `max_delivery_attempts` times. Without `fallback_to_en` items still
+   waiting for a translation are left out of the LATERAL and the earliest
+   one becomes the cursor's hold, so sending a later item cannot move the
+   cursor past it
+3. premium-expired notices already sent inside the backlog window or
+   still waiting in the outbox
+"""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import String, and_, cast, func, null, or_, select, true
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    DeliveryCursor,
+    Digest,
+    DigestStatus,
+    NewsItem,
+    NewsItemTranslation,
+    Subscription,
+    User,
+)
+from app.db.utils import count_queries
+
+
+@dataclass
+class PlannedSubscription:
+    """Active subscription with the user-level facts needed for dispatch."""
+
+    subscription_id: uuid.UUID
+    user_id: uuid.UUID
+    telegram_id: str
+    source_id: uuid.UUID
+    language: str
+    active_count: int
+    has_premium: bool
+
+    @property
+    def is_eligible(
+        self,
+    ) -> bool:
+        return self.has_premium or self.active_count <= 1
+
+
+@dataclass
+class PlannedItem:
+    """News item selected for a subscription with summary already resolved."""
+
+    news_item_id: uuid.UUID
+    title: str
+    url: str
+    summary: str
+    fetched_at: datetime
+
+
+# (summarized_at, news_item_id) of a news item.
+ItemPosition = Tuple[datetime, uuid.UUID]
+
+
+@dataclass
+class DispatchPlan:
+    """Result of a planner run.
+
+    `subscriptions_by_chat` keeps the per-chat subscription order stable so
+    that message budgets are applied the same way on every run.
+    `cursor_holds` lists only the translation holds that changed: the
+    position of the earliest item still waiting for a translation, or None
+    to clear the hold.
+    """
+
+    subscriptions_by_chat: Dict[str, List[PlannedSubscription]] = field(
+        default_factory=dict,
+    )
+    items_by_subscription: Dict[uuid.UUID, List[PlannedItem]] = field(
+        default_factory=dict,
+    )
+    notified_user_ids: Set[uuid.UUID] = field(
+        default_factory=set,
+    )
+    cursor_holds: Dict[uuid.UUID, Optional[ItemPosition]] = field(
+        default_factory=dict,
+    )
+    query_count: int = 0
+
+
+def shard_clause(
+    user_id_column,
+    shard_index: int,
+    shard_count: int,
+):
+    """SQL predicate selecting users of one shard by a stable hash of the id."""
+    bucket = func.hashtext(
+        cast(user_id_column, String),
+    ).op("&")(0x7FFFFFFF) % shard_count
+    return bucket == shard_index
+
+
+class DispatchPlanner:
+    """Compute a dispatch plan with a constant number of queries.
+
+    With `shard_count` set only users whose id hashes to `shard_index` are
+    planned, so several workers can split one dispatch run. With `source_ids`
+    only subscriptions to those sources are planned (targeted dispatch);
+    eligibility still counts all of a user's active subscriptions.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        shard_index: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        source_ids: Optional[Iterable[uuid.UUID]] = None,
+    ) -> None:
+        self.db = db
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.source_ids = (
+            list(source_ids)
+            if source_ids is not None
+            else None
+        )
+
+    def build_plan(
+        self,
+        now: datetime,
+        cutoff: datetime,
+        max_items_per_subscription: int,
+        fallback_to_en: bool,
+        notice_url: str,
+        max_delivery_attempts: int = 3,
+    ) -> DispatchPlan:
+        plan = DispatchPlan()
+        with count_queries(self.db) as counter:
+            subs = self._load_subscriptions(
+                now=now,
+            )
+            for ps in subs:
+                plan.subscriptions_by_chat.setdefault(
+                    ps.telegram_id,
+                    [],
+                ).append(ps)
+
+            if any(ps.is_eligible for ps in subs):
+                (
+                    plan.items_by_subscription,
+                    plan.cursor_holds,
+                ) = self._load_items(
+                    now=now,
+                    cutoff=cutoff,
+                    max_items_per_subscription=max_items_per_subscription,
+                    fallback_to_en=fallback_to_en,
+                    max_delivery_attempts=max_delivery_attempts,
+                )
+
+            paywalled_user_ids = {
+                ps.user_id
+                for ps in subs
+                if not ps.is_eligible
+            }
+            if paywalled_user_ids:
+                plan.notified_user_ids = self._load_notified_user_ids(
+                    user_ids=paywalled_user_ids,
+                    cutoff=cutoff,
+                    notice_url=notice_url,
+                )
+        plan.query_count = counter.count
+        return plan
+
+    def _active_subscriptions_query(
+        self,
+        now: datetime,
+    ):
+        active_count = func.count().over(
+            partition_by=Subscription.user_id,
+        )
+        has_premium = and_(
+            User.premium_until.is_not(None),
+            User.premium_until > now,
+        )
+        stmt = (
+            select(
+                Subscription.id.label("subscription_id"),
+                Subscription.user_id.label("user_id"),
+                Subscription.source_id.label("source_id"),
+                Subscription.language.label("language"),
+                Subscription.created_at.label("created_at"),
+                User.telegram_id.label("telegram_id"),
+                active_count.label("active_count"),
+                has_premium.label("has_premium"),
+            )
+            .join(
+                User,
+                User.id == Subscription.user_id,
+            )
+            .where(
+                User.telegram_id.is_not(None),
+                Subscription.is_active.is_(True),
+            )
+        )
+        if self.shard_count:
+            stmt = stmt.where(
+                shard_clause(
+                    user_id_column=User.id,
+                    shard_index=self.shard_index or 0,
+                    shard_count=self.shard_count,
+                )
+            )
+        return stmt
+
+    def _load_subscriptions(
+        self,
+        now: datetime,
+    ) -> List[PlannedSubscription]:
+        subs = self._active_subscriptions_query(
+            now=now,
+        ).subquery("subs")
+        stmt = select(subs).order_by(
+            subs.c.user_id,
+            subs.c.created_at,
+        )
+        if self.source_ids is not None:
+            stmt = stmt.where(
+                subs.c.source_id.in_(self.source_ids),
+            )
+        rows = self.db.execute(
+            stmt,
+        ).all()
+        return [
+            PlannedSubscription(
+                subscription_id=row.subscription_id,
+                user_id=row.user_id,
+                telegram_id=str(row.telegram_id),
+                source_id=row.source_id,
+                language=row.language,
+                active_count=int(row.active_count),
+                has_premium=bool(row.has_premium),
+            )
+            for row in rows
+        ]
+
+    def _load_items(
+        self,
+        now: datetime,
+        cutoff: datetime,
+        max_items_per_subscription: int,
+        fallback_to_en: bool,
+        max_delivery_attempts: int,
+    ) -> Tuple[Dict[uuid.UUID, List[PlannedItem]], Dict[uuid.UUID, Optional[ItemPosition]]]:
+        subs = self._active_subscriptions_query(
+            now=now,
+        ).subquery("subs")
+        eligible = select(subs).where(
+            or_(
+                subs.c.active_count <= 1,
+                subs.c.has_premium.is_(True),
+            )
+        )
+        if self.source_ids is not None:
+            eligible = eligible.where(
+                subs.c.source_id.in_(self.source_ids),
+            )
+        eligible = eligible.subquery("eligible")
+
+        after_cursor = or_(
+            DeliveryCursor.last_summarized_at.is_(None),
+            NewsItem.summarized_at > DeliveryCursor.last_summarized_at,
+            and_(
+                NewsItem.summarized_at == DeliveryCursor.last_summarized_at,
+                NewsItem.id > DeliveryCursor.last_news_item_id,
+            ),
+        )
+        # The cursor only moves after a send, so it cannot tell what is
+        # already queued; digests of this subscription and URL can.
+        queued_or_sent = (
+            select(Digest.id)
+            .where(
+                Digest.subscription_id == eligible.c.subscription_id,
+                Digest.url == NewsItem.url,
+                Digest.status.in_([DigestStatus.PENDING, DigestStatus.SENT]),
+            )
+            .correlate_except(Digest)
+            .exists()
+        )
+        failed_attempts = (
+            select(func.count(Digest.id))
+            .where(
+                Digest.subscription_id == eligible.c.subscription_id,
+                Digest.url == NewsItem.url,
+                Digest.status == DigestStatus.FAILED,
+            )
+            .correlate_except(Digest)
+            .scalar_subquery()
+        )
+        candidate = [
+            NewsItem.source_id == eligible.c.source_id,
+            NewsItem.is_active.is_(True),
+            NewsItem.fetched_at >= cutoff,
+            NewsItem.summary.is_not(None),
+            NewsItem.summarized_at.is_not(None),
+            after_cursor,
+            ~queued_or_sent,
+            failed_attempts < max_delivery_attempts,
+        ]
+        has_translation = (
+            select(NewsItemTranslation.id)
+            .where(
+                NewsItemTranslation.news_item_id == NewsItem.id,
+                NewsItemTranslation.language == eligible.c.language,
+                NewsItemTranslation.summary_translated != "",
+            )
+            .correlate_except(NewsItemTranslation)
+            .exists()
+        )
+        items = select(
+            NewsItem.id.label("news_item_id"),
+            NewsItem.title.label("title"),
+            NewsItem.url.label("url"),
+            NewsItem.summary.label("summary"),
+            NewsItem.fetched_at.label("fetched_at"),
+            NewsItem.summarized_at.label("summarized_at"),
+        ).where(
+            *candidate,
+        )
+        if not fallback_to_en:
+            # Untranslated items would only be dropped below; keep them from
+            # taking the LIMIT slots of items that can be sent.
+            items = items.where(
+                or_(
+                    eligible.c.language == "en",
+                    has_translation,
+                )
+            )
+        items = (
+            items.order_by(
+                NewsItem.summarized_at.asc(),
+                NewsItem.id.asc(),
+            )
+            .limit(
+                max_items_per_subscription,
+            )
+            .lateral("items")
+        )
+        translated = (
+            select(NewsItemTranslation.summary_translated)
+            .where(
+                NewsItemTranslation.news_item_id == items.c.news_item_id,
+                NewsItemTranslation.language == eligible.c.language,
+            )
+            .order_by(
+                NewsItemTranslation.updated_at.desc(),
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        from_clause = eligible.outerjoin(
+            DeliveryCursor,
+            DeliveryCursor.subscription_id == eligible.c.subscription_id,
+        ).join(
+            items,
+            true(),
+        )
+        if fallback_to_en:
+            waiting_columns = [
+                null().label("waiting_summarized_at"),
+                null().label("waiting_news_item_id"),
+            ]
+        else:
+            waiting = (
+                select(
+                    NewsItem.id.label("news_item_id"),
+                    NewsItem.summarized_at.label("summarized_at"),
+                )
+                .where(
+                    *candidate,
+                    eligible.c.language != "en",
+                    ~has_translation,
+                )
+                .order_by(
+                    NewsItem.summarized_at.asc(),
+                    NewsItem.id.asc(),
+                )
+                .limit(1)
+                .lateral("waiting")
+            )
+            from_clause = from_clause.outerjoin(
+                waiting,
+                true(),
+            )
+            waiting_columns = [
+                waiting.c.summarized_at.label("waiting_summarized_at"),
+                waiting.c.news_item_id.label("waiting_news_item_id"),
+            ]
+        rows = self.db.execute(
+            select(
+                eligible.c.subscription_id,
+                eligible.c.language,
+                items.c.news_item_id,
+                items.c.title,
+                items.c.url,
+                items.c.summary,
+                items.c.fetched_at,
+                items.c.summarized_at,
+                translated.label("summary_translated"),
+                DeliveryCursor.held_summarized_at,
+                DeliveryCursor.held_news_item_id,
+                *waiting_columns,
+            )
+            .select_from(
+                from_clause,
+            )
+            .order_by(
+                eligible.c.subscription_id,
+                items.c.summarized_at.asc(),
+                items.c.news_item_id.asc(),
+            )
+        ).all()
+
+        by_sub: Dict[uuid.UUID, List[PlannedItem]] = {}
+        holds: Dict[uuid.UUID, Optional[ItemPosition]] = {}
+        stored_holds: Dict[uuid.UUID, Optional[ItemPosition]] = {}
+        for row in rows:
+            if row.subscription_id not in holds:
+                stored_holds[row.subscription_id] = _position(
+                    summarized_at=row.held_summarized_at,
+                    news_item_id=row.held_news_item_id,
+                )
+                holds[row.subscription_id] = _position(
+                    summarized_at=row.waiting_summarized_at,
+                    news_item_id=row.waiting_news_item_id,
+                )
+            summary = _resolve_summary(
+                language=row.language,
+                summary=row.summary,
+                summary_translated=row.summary_translated,
+                fallback_to_en=fallback_to_en,
+            )
+            if not summary:
+                position = (row.summarized_at, row.news_item_id)
+                hold = holds[row.subscription_id]
+                if hold is None or position < hold:
+                    holds[row.subscription_id] = position
+                continue
+            by_sub.setdefault(
+                row.subscription_id,
+                [],
+            ).append(
+                PlannedItem(
+                    news_item_id=row.news_item_id,
+                    title=row.title,
+                    url=row.url,
+                    summary=summary,
+                    fetched_at=row.fetched_at,
+                )
+            )
+        changed_holds = {
+            subscription_id: hold
+            for subscription_id, hold in holds.items()
+            if hold != stored_holds[subscription_id]
+        }
+        return by_sub, changed_holds
+
+    def _load_notified_user_ids(
+        self,
+        user_ids: Set[uuid.UUID],
+        cutoff: datetime,
+        notice_url: str,
+    ) -> Set[uuid.UUID]:
+        rows = self.db.execute(
+            select(Digest.user_id)
+            .where(
+                Digest.user_id.in_(list(user_ids)),
+                Digest.url == notice_url,
+                or_(
+                    and_(
+                        Digest.status == DigestStatus.SENT,
+                        Digest.sent_at >= cutoff,
+                    ),
+                    Digest.status == DigestStatus.PENDING,
+                ),
+            )
+            .distinct()
+        ).all()
+        return {row.user_id for row in rows}
+
+
+def _position(
+    summarized_at: Optional[datetime],
+    news_item_id: Optional[uuid.UUID],
+) -> Optional[ItemPosition]:
+    if summarized_at is None:
+        return None
+    return (summarized_at, news_item_id)
+
+
+def _resolve_summary(
+    language: str,
+    summary: Optional[str],
+    summary_translated: Optional[str],
+    fallback_to_en: bool,
+) -> Optional[str]:
+    """Mirror `_pick_summary_for_lang` for already-joined rows."""
+    if language == "en":
+        return (summary or "").strip() or None
+    if summary_translated:
+        return summary_translated.strip()
+    if fallback_to_en:
+        return (summary or "").strip() or None
+    return None
@@ -0,0 +1,299 @@
+"""HTML rendering of news items for Telegram with a render-once cache.
+
+One story usually goes to many chats in the same language, so rendered
+blocks are cached by (news_item_id, language, content hash) and reused for
+every recipient. The cache is a bounded LRU shared by the worker process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[\.!?])\s+")
+_SCHEME_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*://")
+_IPV6_RE = re.compile(r"[0-9a-fA-F:]+")
+_IPV4_RE = re.compile(r"\d{1,3}(?:\.\d{1,3}){3}")
+_TLD_RE = re.compile(r"[a-zA-Z]{2,}")
+_LABEL_RE = re.compile(r"^[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?$")
+
+
+class RenderCache:
+    """Bounded LRU of rendered item blocks with simple throughput counters."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+    ) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.render_seconds = 0.0
+
+    def render(
+        self,
+        news_item_id,
+        language: str,
+        title: str,
+        summary: str,
+        url: str,
+    ) -> str:
+        key = (
+            str(news_item_id),
+            language,
+            _content_hash(
+                title=title,
+                summary=summary,
+                url=url,
+            ),
+        )
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        started = time.perf_counter()
+        block = render_message(
+            title=title,
+            summary=summary,
+            url=url,
+        )
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.misses += 1
+            self.render_seconds += elapsed
+            self._entries[key] = block
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return block
+
+    def stats(
+        self,
+    ) -> dict:
+        with self._lock:
+            renders = self.misses
+            return {
+                "render_hits": self.hits,
+                "render_misses": renders,
+                "render_entries": len(self._entries),
+                "renders_per_second": (
+                    round(renders / self.render_seconds, 1)
+                    if self.render_seconds
+                    else None
+                ),
+            }
+
+    def reset_stats(
+        self,
+    ) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.render_seconds = 0.0
+
+
+def _content_hash(
+    title: str,
+    summary: str,
+    url: str,
+) -> str:
+    digest = hashlib.sha1()
+    for part in (title, summary, url):
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _escape_html(
+    text: str,
+) -> str:
+    return (
+        text
+        .replace(
+            "&",
+            "&amp;",
+        )
+        .replace(
+            "<",
+            "&lt;",
+        )
+        .replace(
+            ">",
+            "&gt;",
+        )
+    )
+
+
+def _escape_html_attr(
+    text: str,
+) -> str:
+    return (
+        text
+        .replace(
+            "&",
+            "&amp;",
+        )
+        .replace(
+            '"',
+            "&quot;",
+        )
+        .replace(
+            "<",
+            "&lt;",
+        )
+        .replace(
+            ">",
+            "&gt;",
+        )
+    )
+
+
+def render_message(
+    title: str,
+    summary: str,
+    url: str,
+) -> str:
+    safe_title = _escape_html(
+        text=title,
+    )
+    concise = _shorten_summary(
+        text=summary or "",
+        max_sentences=2,
+        max_chars=300,
+    )
+    safe_summary = _escape_html(
+        text=concise,
+    )
+    normalized_url = _normalize_url(
+        url=url,
+    )
+    safe_url_attr = _escape_html_attr(
+        text=normalized_url,
+    )
+    domain = _extract_domain(
+        url=normalized_url,
+    )
+    safe_domain = _escape_html(
+        text=domain,
+    )
+    return "\n".join(
+        [
+            f"📰 <b>{safe_title}</b>",
+            f"{safe_summary}",
+            f'↗️ <a href="{safe_url_attr}">{safe_domain}</a>',
+        ]
+    )
+
+
+def _shorten_summary(
+    text: str,
+    max_sentences: int = 2,
+    max_chars: int = 300,
+) -> str:
+    content = (text or "").strip()
+    if not content:
+        return ""
+    # Split by sentence boundaries.
+    sentences = _SENTENCE_SPLIT_RE.split(
+        content,
+    )
+    picked = " ".join(
+        sentences[: max(1, max_sentences)],
+    ).strip()
+    if len(picked) > max_chars:
+        return picked[: max_chars - 1].rstrip() + "…"
+    return picked
+
+
+def _extract_domain(
+    url: str,
+) -> str:
+    try:
+        if not url:
+            return "link"
+        
+        normalized = _normalize_url(
+            url=url,
+        )
+        parsed = urlparse(normalized)
+        host = parsed.netloc
+        
+        if not host:
+            return "link"
+            
+        if host.startswith("www."):
+            host = host[4:]
+        
+        if not _is_valid_host(host):
+            return "link"
+
+        return host
+    except Exception:
+        return "link"
+
+
+def _normalize_url(
+    url: str,
+) -> str:
+    val = (url or "").strip()
+    if not val:
+        return ""
+    if _SCHEME_RE.match(val):
+        return val
+    return f"https://{val}"
+
+
+def _is_valid_host(
+    host: str,
+) -> bool:
+    try:
+        h = (host or "").strip()
+        if not h:
+            return False
+
+        if h == "localhost":
+            return True
+
+        # IPv6 in brackets
+        if h.startswith("[") and h.endswith("]"):
+            inner = h[1:-1]
+            return True if _IPV6_RE.fullmatch(inner or "") else False
+
+        # IPv4 address
+        if _IPV4_RE.fullmatch(h or ""):
+            parts = [int(p) for p in h.split(".")]
+            return all(0 <= p <= 255 for p in parts)
+
+        # Domain name must contain a dot and valid labels
+        if "." not in h:
+            return False
+
+        labels = h.split(".")
+        # TLD should be last label and at least 2 letters
+        tld = labels[-1]
+        if not _TLD_RE.fullmatch(tld):
+            return False
+
+        for label in labels:
+            if not label or len(label) > 63:
+                return False
+            if not _LABEL_RE.fullmatch(label):
+                return False
+
+        return True
+    except Exception:
+        return False
+
+
+render_cache = RenderCache()
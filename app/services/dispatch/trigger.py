@@ -0,0 +1,67 @@
+"""Event-driven dispatch trigger.
+
+When an item becomes deliverable (summarized, or translated for a language)
+the producer calls `request_source_dispatch`. The first request for a source
+opens a debounce window in Redis and schedules one targeted dispatch at the
+end of it; further requests inside the window are absorbed, since that run
+picks up everything deliverable by then. The periodic dispatch remains the
+sweeper for anything a trigger misses.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, List
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+from app.db.redis import get_redis
+
+DISPATCH_SOURCES_TASK = "app.tasks.news_tasks.dispatch_source_updates"
+
+
+def request_source_dispatch(
+    source_ids: Iterable[UUID],
+) -> List[str]:
+    """Schedule a debounced targeted dispatch; return the sources it opened."""
+    settings = get_settings()
+    debounce = settings.dispatch_trigger_debounce_seconds
+    opened: List[str] = []
+    try:
+        client = get_redis()
+        for source_id in {str(s) for s in source_ids}:
+            if client.set(
+                f"dispatch:trigger:{source_id}",
+                "1",
+                nx=True,
+                ex=debounce,
+            ):
+                opened.append(source_id)
+    except RedisError as e:
+        # The sweeper still delivers; only latency suffers.
+        logging.getLogger(__name__).warning(
+            "dispatch_trigger_failed",
+            extra={"error": str(e)},
+        )
+        return []
+    if not opened:
+        return []
+
+    # Imported lazily: the Celery app imports the task modules, which import
+    # this package.
+    from app.worker.celery_app import celery_app
+
+    celery_app.send_task(
+        DISPATCH_SOURCES_TASK,
+        kwargs={
+            "source_ids": opened,
+        },
+        countdown=debounce,
+    )
+    logging.getLogger(__name__).info(
+        "dispatch_trigger_scheduled",
+        extra={"source_ids": opened, "countdown": debounce},
+    )
+    return opened
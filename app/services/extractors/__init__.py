@@ -0,0 +1,18 @@
+"""Article full-text extraction backends."""
+
+from app.services.extractors.base import ArticleExtractor
+from app.services.extractors.cache import ExtractionCache, canonical_url, extraction_cache
+from app.services.extractors.full_text_rss_client import FullTextRssClient
+from app.services.extractors.registry import EXTRACTOR_BACKENDS, build_extractor
+from app.services.extractors.trafilatura_client import TrafilaturaExtractor
+
+__all__ = [
+    "ArticleExtractor",
+    "EXTRACTOR_BACKENDS",
+    "ExtractionCache",
+    "FullTextRssClient",
+    "TrafilaturaExtractor",
+    "build_extractor",
+    "canonical_url",
+    "extraction_cache",
+]
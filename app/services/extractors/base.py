@@ -0,0 +1,74 @@
+"""Common behaviour of the article extraction backends.
+
+Every backend answers `extract(url)` / `extract_async(fetcher, url)` with
+plain text or None, and shares `extraction_cache`, so switching backends
+keeps the cache warm.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Protocol
+
+from app.services.extractors.cache import extraction_cache
+
+if TYPE_CHECKING:
+    from app.services.ingestion import AsyncFetcher
+
+
+class ArticleExtractor(Protocol):
+    def extract(
+        self,
+        url: str,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        ...
+
+    async def extract_async(
+        self,
+        fetcher: "AsyncFetcher",
+        url: str,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        ...
+
+
+class CachedExtractor:
+    """Cache lookup and result storage shared by the backends."""
+
+    def _cached(
+        self,
+        url: str,
+        use_cache: bool,
+    ) -> tuple[bool, Optional[str]]:
+        if not use_cache:
+            return False, None
+        return extraction_cache.get(
+            url=url,
+        )
+
+    def _store(
+        self,
+        url: str,
+        status: int,
+        text: Optional[str],
+        use_cache: bool,
+    ) -> Optional[str]:
+        """Clean the body and cache the outcome unless the failure was transient."""
+        cleaned = self._clean(
+            text=text,
+        )
+        if use_cache and (cleaned or (status < 500 and status != 429)):
+            extraction_cache.set(
+                url=url,
+                text=cleaned,
+            )
+        return cleaned
+
+    def _clean(
+        self,
+        text: Optional[str],
+    ) -> Optional[str]:
+        text = (text or "").strip()
+        if text:
+            return " ".join(text.split())
+        return None
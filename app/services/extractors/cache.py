@@ -0,0 +1,147 @@
+"""Redis cache for full-text extraction results, keyed by canonical URL.
+
+Successful extractions are kept for `extraction_cache_ttl_seconds`; URLs the
+extractor answered without usable text are remembered for the shorter
+`extraction_cache_negative_ttl_seconds`. Transport failures are not cached.
+Redis errors degrade to a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+from app.db.redis import get_redis
+
+# Empty value marks a negative entry (extractor returned no text).
+_NEGATIVE = ""
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "guccounter"}
+
+
+def canonical_url(
+    url: str,
+) -> str:
+    """Normalize a URL so the same article shares one cache entry."""
+    raw = (url or "").strip()
+    if "://" not in raw:
+        raw = f"https://{raw}"
+    parts = urlsplit(raw)
+    scheme = (parts.scheme or "https").lower()
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+        )
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class ExtractionCache:
+    def __init__(
+        self,
+        prefix: str = "ftr:extract",
+    ) -> None:
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        url: str,
+    ) -> Tuple[bool, Optional[str]]:
+        """Return (found, text); text is None for a cached negative result."""
+        try:
+            value = get_redis().get(
+                self._key(
+                    url=url,
+                ),
+            )
+        except RedisError:
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return False, None
+            if value == _NEGATIVE:
+                self.negative_hits += 1
+                return True, None
+            self.hits += 1
+            return True, value
+
+    def set(
+        self,
+        url: str,
+        text: Optional[str],
+    ) -> None:
+        settings = get_settings()
+        ttl = (
+            settings.extraction_cache_ttl_seconds
+            if text
+            else settings.extraction_cache_negative_ttl_seconds
+        )
+        try:
+            get_redis().set(
+                self._key(
+                    url=url,
+                ),
+                text or _NEGATIVE,
+                ex=ttl,
+            )
+        except RedisError as e:
+            logging.getLogger(__name__).warning(
+                "extraction_cache_set_failed",
+                extra={"error": str(e)},
+            )
+
+    def stats(
+        self,
+    ) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "extract_cache_hits": self.hits,
+                "extract_cache_negative_hits": self.negative_hits,
+                "extract_cache_misses": self.misses,
+                "extract_cache_hit_ratio": (
+                    round((self.hits + self.negative_hits) / lookups, 3)
+                    if lookups
+                    else None
+                ),
+            }
+
+    def reset_stats(
+        self,
+    ) -> None:
+        with self._lock:
+            self.hits = 0
+            self.negative_hits = 0
+            self.misses = 0
+
+    def _key(
+        self,
+        url: str,
+    ) -> str:
+        digest = hashlib.sha1(
+            canonical_url(url).encode("utf-8"),
+        ).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+
+extraction_cache = ExtractionCache()
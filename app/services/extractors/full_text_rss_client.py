@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import requests
+from app.services import http as http_client
+from app.services.extractors.base import CachedExtractor
 
+if TYPE_CHECKING:
+    from app.services.ingestion import AsyncFetcher
 
-class FullTextRssClient:
+
+class FullTextRssClient(CachedExtractor):
     def __init__(
         self,
         base_url: Optional[str] = None,
@@ -26,25 +30,69 @@ class FullTextRssClient:
     def extract(
         self,
         url: str,
+        use_cache: bool = True,
     ) -> Optional[str]:
+        found, cached = self._cached(
+            url=url,
+            use_cache=use_cache,
+        )
+        if found:
+            return cached
         try:
-            resp = requests.get(
+            resp = http_client.request(
+                "GET",
                 f"{self.base_url}/makefulltextfeed",
-                params={
-                    "url": url,
-                    "format": "txt",
-                    "max": 1,
-                },
+                params=self._params(
+                    url=url,
+                ),
                 headers=self.headers,
                 timeout=self.timeout_seconds,
             )
-            if not resp.ok:
-                return None
-            text = (resp.text or "").strip()
-            if text:
-                return " ".join(text.split())
-            return None
         except Exception:
             return None
+        return self._store(
+            url=url,
+            status=resp.status_code,
+            text=resp.text if resp.ok else None,
+            use_cache=use_cache,
+        )
 
+    async def extract_async(
+        self,
+        fetcher: "AsyncFetcher",
+        url: str,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        """Same as `extract`, through the run's shared `AsyncFetcher`."""
+        found, cached = self._cached(
+            url=url,
+            use_cache=use_cache,
+        )
+        if found:
+            return cached
+        resp = await fetcher.get(
+            url=f"{self.base_url}/makefulltextfeed",
+            params=self._params(
+                url=url,
+            ),
+            headers=self.headers,
+            timeout=self.timeout_seconds,
+        )
+        if resp is None:
+            return None
+        return self._store(
+            url=url,
+            status=resp.status_code,
+            text=resp.text if resp.is_success else None,
+            use_cache=use_cache,
+        )
 
+    def _params(
+        self,
+        url: str,
+    ) -> dict:
+        return {
+            "url": url,
+            "format": "txt",
+            "max": 1,
+        }
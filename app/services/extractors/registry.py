@@ -0,0 +1,26 @@
+"""Pick the article extraction backend from `extraction_backend`."""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional
+
+from app.config import get_settings
+from app.services.extractors.base import ArticleExtractor
+from app.services.extractors.full_text_rss_client import FullTextRssClient
+from app.services.extractors.trafilatura_client import TrafilaturaExtractor
+
+EXTRACTOR_BACKENDS: Dict[str, Callable[[], ArticleExtractor]] = {
+    "fulltextrss": FullTextRssClient,
+    "trafilatura": TrafilaturaExtractor,
+}
+
+
+def build_extractor(
+    backend: Optional[str] = None,
+) -> ArticleExtractor:
+    """Return the configured backend; ValueError for an unknown name."""
+    name = backend or get_settings().extraction_backend
+    factory = EXTRACTOR_BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown extraction backend: {name}")
+    return factory()
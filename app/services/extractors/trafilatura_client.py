@@ -0,0 +1,272 @@
+"""In-process article extraction with trafilatura.
+
+The article page is fetched once (pooled sync client or the caller's
+`AsyncFetcher`) and boilerplate removal runs in a `ProcessPoolExecutor`
+sized to the machine's cores, so CPU-heavy parsing does not hold the
+worker's GIL and no fulltextrss container is needed.
+
+Daemonic processes (Celery prefork children) cannot start a pool; there
+extraction runs inline. Run the `extraction` queue with `--pool threads`
+to get the process pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Optional
+
+from app.config import get_settings
+from app.services import http as http_client
+from app.services.extractors.base import CachedExtractor
+
+if TYPE_CHECKING:
+    from app.services.ingestion import AsyncFetcher
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def extract_html(
+    html: str,
+    url: Optional[str] = None,
+) -> Optional[str]:
+    """Main text of an article page; runs inside the pool workers."""
+    import trafilatura
+
+    return trafilatura.extract(
+        html,
+        url=url,
+        include_comments=False,
+        include_tables=False,
+    )
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Return this process's extraction pool, or None where none can run."""
+    global _pool, _pool_pid
+    if multiprocessing.current_process().daemon:
+        return None
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = ProcessPoolExecutor(
+                max_workers=get_settings().extraction_process_workers or os.cpu_count() or 1,
+            )
+            _pool_pid = pid
+    return _pool
+
+
+def _discard_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(
+                wait=False,
+                cancel_futures=True,
+            )
+            _pool = None
+
+
+class TrafilaturaExtractor(CachedExtractor):
+    def __init__(
+        self,
+        timeout_seconds: int = 20,
+    ) -> None:
+        self.timeout_seconds = timeout_seconds
+        self.headers = {
+            "User-Agent": (
+                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/127.0.0.0 Safari/537.36"
+            ),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+
+    def extract(
+        self,
+        url: str,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        found, cached = self._cached(
+            url=url,
+            use_cache=use_cache,
+        )
+        if found:
+            return cached
+        try:
+            resp = http_client.request(
+                "GET",
+                url,
+                headers=self.headers,
+                timeout=self.timeout_seconds,
+            )
+        except Exception:
+            return None
+        text = None
+        if resp.ok:
+            ok, text = self._run(
+                html=resp.text,
+                url=url,
+            )
+            if not ok:
+                return None
+        return self._store(
+            url=url,
+            status=resp.status_code,
+            text=text,
+            use_cache=use_cache,
+        )
+
+    async def extract_async(
+        self,
+        fetcher: "AsyncFetcher",
+        url: str,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        """Same as `extract`; the page is fetched through `fetcher`."""
+        found, cached = self._cached(
+            url=url,
+            use_cache=use_cache,
+        )
+        if found:
+            return cached
+        resp = await fetcher.get(
+            url=url,
+            headers=self.headers,
+            timeout=self.timeout_seconds,
+        )
+        if resp is None:
+            return None
+        text = None
+        if resp.is_success:
+            ok, text = await self._run_async(
+                html=resp.text,
+                url=url,
+            )
+            if not ok:
+                return None
+        return self._store(
+            url=url,
+            status=resp.status_code,
+            text=text,
+            use_cache=use_cache,
+        )
+
+    def _run(
+        self,
+        html: str,
+        url: str,
+    ) -> tuple[bool, Optional[str]]:
+        """Return (ok, text); ok is False when extraction itself failed.
+
+        A failure (timeout, crash) must not be cached like a page that has
+        no article text, so the callers skip `_store` for it.
+        """
+        pool = get_process_pool()
+        if pool is None:
+            return self._run_inline(
+                html=html,
+                url=url,
+            )
+        try:
+            future = pool.submit(extract_html, html, url)
+            return True, future.result(
+                timeout=self.timeout_seconds,
+            )
+        except BrokenProcessPool:
+            _discard_pool()
+            return self._run_inline(
+                html=html,
+                url=url,
+            )
+        except FutureTimeoutError:
+            # Stops waiting (and drops the call if still queued); a call already
+            # running in a pool process cannot be interrupted.
+            future.cancel()
+            self._log_failure(
+                url=url,
+                error=TimeoutError(f"extraction exceeded {self.timeout_seconds}s"),
+            )
+            return False, None
+        except Exception as e:  # noqa: BLE001
+            self._log_failure(
+                url=url,
+                error=e,
+            )
+            return False, None
+
+    async def _run_async(
+        self,
+        html: str,
+        url: str,
+    ) -> tuple[bool, Optional[str]]:
+        pool = get_process_pool()
+        if pool is None:
+            return await asyncio.to_thread(
+                self._run_inline,
+                html=html,
+                url=url,
+            )
+        try:
+            return True, await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    pool,
+                    extract_html,
+                    html,
+                    url,
+                ),
+                timeout=self.timeout_seconds,
+            )
+        except BrokenProcessPool:
+            _discard_pool()
+            return await asyncio.to_thread(
+                self._run_inline,
+                html=html,
+                url=url,
+            )
+        except asyncio.TimeoutError:
+            self._log_failure(
+                url=url,
+                error=TimeoutError(f"extraction exceeded {self.timeout_seconds}s"),
+            )
+            return False, None
+        except Exception as e:  # noqa: BLE001
+            self._log_failure(
+                url=url,
+                error=e,
+            )
+            return False, None
+
+    def _run_inline(
+        self,
+        html: str,
+        url: str,
+    ) -> tuple[bool, Optional[str]]:
+        try:
+            return True, extract_html(html, url)
+        except Exception as e:  # noqa: BLE001
+            self._log_failure(
+                url=url,
+                error=e,
+            )
+            return False, None
+
+    def _log_failure(
+        self,
+        url: str,
+        error: Exception,
+    ) -> None:
+        logging.getLogger(__name__).warning(
+            "trafilatura_extract_failed",
+            extra={"url": url, "error": str(error)},
+        )
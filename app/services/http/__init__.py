@@ -0,0 +1,19 @@
+"""Shared outbound HTTP client (pooling, retries, timeouts, metrics)."""
+
+from app.services.http.client import (
+    RequestMetric,
+    default_timeout,
+    emit_metric,
+    get_session,
+    register_metrics_hook,
+    request,
+)
+
+__all__ = [
+    "RequestMetric",
+    "default_timeout",
+    "emit_metric",
+    "get_session",
+    "register_metrics_hook",
+    "request",
+]
@@ -0,0 +1,170 @@
+"""Process-wide pooled HTTP client for outbound calls.
+
+Sync callers use `request()` (or `get_session()`), backed by one
+`requests.Session` per process: keep-alive connection pools sized per host
+(`http_pool_maxsize`, overridden by `http_host_pool_sizes` prefixes), one
+retry policy for connection errors and 429/5xx, and default
+(connect, read) timeouts. The session is rebuilt after a fork so Celery
+prefork children never share sockets with the parent.
+
+Every request, sync or through `AsyncFetcher`, is reported to the
+registered metrics hooks as a `RequestMetric`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import get_settings
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class RequestMetric:
+    method: str
+    host: str
+    status: Optional[int]
+    elapsed_seconds: float
+    error: Optional[str] = None
+
+
+MetricsHook = Callable[[RequestMetric], None]
+
+_hooks: List[MetricsHook] = []
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def register_metrics_hook(
+    hook: MetricsHook,
+) -> None:
+    """Call `hook` with a `RequestMetric` after every outbound request."""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def emit_metric(
+    metric: RequestMetric,
+) -> None:
+    for hook in list(_hooks):
+        try:
+            hook(metric)
+        except Exception:  # noqa: BLE001
+            logging.getLogger(__name__).exception(
+                "http_metrics_hook_failed",
+            )
+
+
+def default_timeout() -> Tuple[float, float]:
+    settings = get_settings()
+    return (
+        settings.http_connect_timeout_seconds,
+        settings.http_read_timeout_seconds,
+    )
+
+
+def get_session() -> requests.Session:
+    """Return this process's pooled session, creating it on first use."""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+    with _lock:
+        if _session is None or _session_pid != pid:
+            _session = _build_session()
+            _session_pid = pid
+    return _session
+
+
+def request(
+    method: str,
+    url: str,
+    timeout: Optional[float | Tuple[float, float]] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a request through the pooled session; errors propagate."""
+    started = time.perf_counter()
+    status: Optional[int] = None
+    error: Optional[str] = None
+    try:
+        resp = get_session().request(
+            method=method,
+            url=url,
+            timeout=timeout or default_timeout(),
+            **kwargs,
+        )
+        status = resp.status_code
+        return resp
+    except requests.RequestException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        emit_metric(
+            RequestMetric(
+                method=method.upper(),
+                host=urlparse(url).netloc,
+                status=status,
+                elapsed_seconds=time.perf_counter() - started,
+                error=error,
+            )
+        )
+
+
+def _build_session() -> requests.Session:
+    settings = get_settings()
+    session = requests.Session()
+    retry = Retry(
+        total=settings.http_max_retries,
+        backoff_factor=settings.http_backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    default_adapter = HTTPAdapter(
+        pool_connections=settings.http_pool_connections,
+        pool_maxsize=settings.http_pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+    for prefix, size in settings.http_host_pool_sizes.items():
+        session.mount(
+            prefix,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=size,
+                max_retries=retry,
+            ),
+        )
+    return session
+
+
+def _log_metric(
+    metric: RequestMetric,
+) -> None:
+    logging.getLogger(__name__).debug(
+        "http_request",
+        extra={
+            "method": metric.method,
+            "host": metric.host,
+            "status": metric.status,
+            "elapsed_ms": round(metric.elapsed_seconds * 1000, 1),
+            "error": metric.error,
+        },
+    )
+
+
+register_metrics_hook(_log_metric)
@@ -4,10 +4,11 @@ import hashlib
 from dataclasses import dataclass
 from typing import Optional
 
-import requests
 from sqlalchemy.orm import Session
 
 from app.db.models import NewsItem, NewsItemTranslation
+from app.services import http as http_client
+from app.services.dispatch.trigger import request_source_dispatch
 
 
 def _sha1(
@@ -82,6 +83,10 @@ class TranslatorService:
                 )
             )
         self.db.commit()
+        # A new translation may make the item deliverable for this language.
+        request_source_dispatch(
+            source_ids=[news_item.source_id],
+        )
         return text
 
     def _translate_via_http(
@@ -91,8 +96,9 @@ class TranslatorService:
         source: str,
     ) -> Optional[str]:
         try:
-            resp = requests.post(
-                url=f"{self.config.base_url}/translate",
+            resp = http_client.request(
+                "POST",
+                f"{self.config.base_url}/translate",
                 json={
                     "q": text,
                     "source": source,
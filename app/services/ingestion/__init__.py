@@ -0,0 +1,47 @@
+"""Shared building blocks for news ingestion."""
+
+from app.services.ingestion.engine import AsyncFetcher, run_sync
+from app.services.ingestion.feed_parser import (
+    FeedEntry,
+    html_to_text,
+    iter_feed_entries,
+    parse_feed,
+    parse_feed_date,
+)
+from app.services.ingestion.feeds import FeedBody, fetch_feed, store_validators
+from app.services.ingestion.hashing import compute_content_hash, normalize_content
+from app.services.ingestion.scheduler import (
+    PollStats,
+    compute_poll_interval,
+    schedule_next_poll,
+)
+from app.services.ingestion.writer import (
+    ParsedItem,
+    StoredContent,
+    existing_content,
+    existing_content_flags,
+    upsert_items,
+)
+
+__all__ = [
+    "AsyncFetcher",
+    "FeedBody",
+    "FeedEntry",
+    "ParsedItem",
+    "PollStats",
+    "StoredContent",
+    "compute_content_hash",
+    "compute_poll_interval",
+    "existing_content",
+    "existing_content_flags",
+    "fetch_feed",
+    "html_to_text",
+    "iter_feed_entries",
+    "normalize_content",
+    "parse_feed",
+    "parse_feed_date",
+    "run_sync",
+    "schedule_next_poll",
+    "store_validators",
+    "upsert_items",
+]
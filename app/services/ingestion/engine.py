@@ -0,0 +1,176 @@
+"""Asyncio HTTP engine shared by the ingestion parsers.
+
+One `AsyncFetcher` is opened per parser run. It wraps a single
+`httpx.AsyncClient` (connection pooling, keep-alive) and bounds concurrency
+twice: a global semaphore for the whole run and one semaphore per host, so a
+burst of article extractions cannot hammer a single origin. Requests are
+reported to the shared HTTP metrics hooks (`app.services.http`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict, Mapping, Optional, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+from app.config import get_settings
+from app.services.http import RequestMetric, emit_metric
+
+T = TypeVar("T")
+
+
+class AsyncFetcher:
+    """Bounded-concurrency HTTP GET helper; use as an async context manager."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        settings = get_settings()
+        self.max_concurrency = max_concurrency or settings.ingest_max_concurrency
+        self.per_host_concurrency = (
+            per_host_concurrency or settings.ingest_per_host_concurrency
+        )
+        self.timeout_seconds = timeout_seconds or settings.ingest_timeout_seconds
+        self.headers = dict(headers or {})
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(
+        self,
+    ) -> "AsyncFetcher":
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout_seconds,
+            follow_redirects=True,
+            # Same retry budget as the sync client; httpx retries connect errors.
+            transport=httpx.AsyncHTTPTransport(
+                retries=get_settings().http_max_retries,
+                limits=limits,
+            ),
+        )
+        self._global = asyncio.Semaphore(
+            self.max_concurrency,
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        *exc_info: Any,
+    ) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[httpx.Response]:
+        """GET `url`; return the response or None on a transport error."""
+        if self._client is None or self._global is None:
+            raise RuntimeError("AsyncFetcher must be used as an async context manager")
+        # Host slot first: waiting on a busy origin must not hold a global
+        # slot that requests to other hosts could use.
+        async with self._host_semaphore(
+            url=url,
+        ), self._global:
+            started = time.perf_counter()
+            try:
+                resp = await self._client.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout or self.timeout_seconds,
+                )
+            except httpx.HTTPError as e:
+                logging.getLogger(__name__).warning(
+                    "ingest_fetch_failed",
+                    extra={"url": url, "error": str(e)},
+                )
+                self._emit(
+                    url=url,
+                    status=None,
+                    started=started,
+                    error=type(e).__name__,
+                )
+                return None
+            self._emit(
+                url=url,
+                status=resp.status_code,
+                started=started,
+                error=None,
+            )
+            return resp
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """GET and decode JSON; None on transport, HTTP or decode errors."""
+        resp = await self.get(
+            url=url,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+        )
+        if resp is None or not resp.is_success:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    def _emit(
+        self,
+        url: str,
+        status: Optional[int],
+        started: float,
+        error: Optional[str],
+    ) -> None:
+        emit_metric(
+            RequestMetric(
+                method="GET",
+                host=urlparse(url).netloc,
+                status=status,
+                elapsed_seconds=time.perf_counter() - started,
+                error=error,
+            )
+        )
+
+    def _host_semaphore(
+        self,
+        url: str,
+    ) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(
+                self.per_host_concurrency,
+            )
+            self._hosts[host] = semaphore
+        return semaphore
+
+
+def run_sync(
+    coro: Awaitable[T],
+) -> T:
+    """Run an ingestion coroutine from sync code (Celery tasks, scripts)."""
+    return asyncio.run(coro)
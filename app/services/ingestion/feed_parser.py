@@ -0,0 +1,204 @@
+"""Single-pass streaming parser for RSS (2.0 and 1.0) and Atom feeds.
+
+`iter_feed_entries` walks the document once with `lxml.etree.iterparse`,
+reads every field of an `<item>` / `<entry>` from its direct children,
+stops after `limit` entries and frees each element once it is read.
+HTML bodies are kept as markup; `FeedEntry.content_text` and
+`description_text` convert them to text only when a caller asks.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional
+
+from lxml import etree
+from lxml import html as lh
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+RSS1_NS = "http://purl.org/rss/1.0/"
+
+_ENTRY_TAGS = frozenset(("item", f"{{{RSS1_NS}}}item", f"{{{ATOM_NS}}}entry"))
+
+# Child tag -> FeedEntry field; the first non-empty value wins.
+_FIELDS: Dict[str, str] = {
+    "title": "title",
+    "link": "link",
+    "guid": "guid",
+    "pubDate": "published",
+    f"{{{DC_NS}}}date": "published",
+    "description": "description",
+    f"{{{CONTENT_NS}}}encoded": "content_encoded",
+    f"{{{RSS1_NS}}}title": "title",
+    f"{{{RSS1_NS}}}link": "link",
+    f"{{{RSS1_NS}}}description": "description",
+    f"{{{ATOM_NS}}}title": "title",
+    f"{{{ATOM_NS}}}id": "guid",
+    f"{{{ATOM_NS}}}published": "published",
+    f"{{{ATOM_NS}}}updated": "updated",
+    f"{{{ATOM_NS}}}summary": "description",
+    f"{{{ATOM_NS}}}content": "content_encoded",
+}
+
+
+@dataclass
+class FeedEntry:
+    title: Optional[str] = None
+    link: Optional[str] = None
+    guid: Optional[str] = None
+    published: Optional[str] = None
+    updated: Optional[str] = None
+    description: Optional[str] = None
+    content_encoded: Optional[str] = None
+    _text: Dict[str, Optional[str]] = field(
+        default_factory=dict,
+        repr=False,
+    )
+
+    @property
+    def external_id(self) -> Optional[str]:
+        return self.guid or self.link
+
+    @property
+    def published_at(self) -> Optional[datetime]:
+        return parse_feed_date(
+            value=self.published or self.updated,
+        )
+
+    def content_text(self) -> Optional[str]:
+        return self._converted(
+            name="content_encoded",
+        )
+
+    def description_text(self) -> Optional[str]:
+        return self._converted(
+            name="description",
+        )
+
+    def _converted(
+        self,
+        name: str,
+    ) -> Optional[str]:
+        if name not in self._text:
+            self._text[name] = html_to_text(
+                html_fragment=getattr(self, name),
+            )
+        return self._text[name]
+
+
+def iter_feed_entries(
+    content: bytes,
+    limit: Optional[int] = None,
+) -> Iterator[FeedEntry]:
+    """Yield up to `limit` entries of an RSS or Atom document."""
+    if limit is not None and limit <= 0:
+        return
+    count = 0
+    # Filtering by tag in Python is cheaper than iterparse's `tag=` matcher.
+    events = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+    try:
+        for _, elem in events:
+            if elem.tag not in _ENTRY_TAGS:
+                continue
+            yield _read_entry(
+                elem=elem,
+            )
+            count += 1
+            # Free the entry and everything parsed before it.
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+            if limit is not None and count >= limit:
+                return
+    except etree.XMLSyntaxError:
+        return
+
+
+def parse_feed(
+    content: bytes,
+    limit: Optional[int] = None,
+) -> List[FeedEntry]:
+    return list(
+        iter_feed_entries(
+            content=content,
+            limit=limit,
+        )
+    )
+
+
+def html_to_text(
+    html_fragment: Optional[str],
+) -> Optional[str]:
+    """Plain text of a small HTML fragment, whitespace collapsed."""
+    if not html_fragment or not html_fragment.strip():
+        return None
+    try:
+        text = lh.fromstring(html_fragment).text_content().strip()
+    except Exception:
+        return None
+    return " ".join(text.split()) if text else None
+
+
+def parse_feed_date(
+    value: Optional[str],
+) -> Optional[datetime]:
+    """RFC 2822 (RSS) or ISO 8601 (Atom, dc:date) timestamp, else None."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _read_entry(
+    elem: etree._Element,
+) -> FeedEntry:
+    entry = FeedEntry()
+    for child in elem:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue
+        if tag == f"{{{ATOM_NS}}}link":
+            if entry.link is None and child.get("rel", "alternate") == "alternate":
+                entry.link = _clean(child.get("href"))
+            continue
+        name = _FIELDS.get(tag)
+        if name is None or getattr(entry, name) is not None:
+            continue
+        if child.get("type") == "xhtml":
+            value = "".join(
+                etree.tostring(node, encoding="unicode")
+                for node in child
+            )
+        else:
+            value = child.text
+        setattr(entry, name, _clean(value))
+    return entry
+
+
+def _clean(
+    value: Optional[str],
+) -> Optional[str]:
+    if value is None:
+        return None
+    text = value.strip()
+    return text or None
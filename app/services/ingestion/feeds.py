@@ -0,0 +1,112 @@
+"""Conditional feed fetching with validators stored on `Source`.
+
+`fetch_feed` sends `If-None-Match` / `If-Modified-Since` from the last
+processed response. A 304, or a 200 whose body hashes to the stored value,
+short-circuits: the per-source counter is bumped and None is returned so the
+parser skips parsing and DB work. Otherwise the caller processes the body and
+calls `store_validators` before its commit, so validators only move once the
+items from that body are persisted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Source
+from app.services.ingestion.engine import AsyncFetcher
+
+
+@dataclass
+class FeedBody:
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+
+
+async def fetch_feed(
+    fetcher: AsyncFetcher,
+    db: Session,
+    source: Source,
+    url: str,
+    timeout: float = 20,
+) -> Optional[FeedBody]:
+    """Fetch `url` for `source`; None when unchanged or on a transport error."""
+    headers: Dict[str, str] = {}
+    if source.feed_etag:
+        headers["If-None-Match"] = source.feed_etag
+    if source.feed_last_modified:
+        headers["If-Modified-Since"] = source.feed_last_modified
+
+    resp = await fetcher.get(
+        url=url,
+        headers=headers,
+        timeout=timeout,
+    )
+    if resp is None:
+        return None
+    source.feed_fetch_count = Source.feed_fetch_count + 1
+
+    if resp.status_code == 304:
+        source.feed_not_modified_count = Source.feed_not_modified_count + 1
+        db.commit()
+        _log_short_circuit(
+            source=source,
+            reason="not_modified",
+        )
+        return None
+
+    if not resp.is_success:
+        db.commit()
+    resp.raise_for_status()
+
+    body = FeedBody(
+        content=resp.content,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+        body_hash=hashlib.sha256(resp.content).hexdigest(),
+    )
+    if source.feed_body_hash == body.body_hash:
+        source.feed_unchanged_count = Source.feed_unchanged_count + 1
+        store_validators(
+            source=source,
+            body=body,
+        )
+        db.commit()
+        _log_short_circuit(
+            source=source,
+            reason="unchanged_body",
+        )
+        return None
+    return body
+
+
+def store_validators(
+    source: Source,
+    body: FeedBody,
+) -> None:
+    """Remember validators of a processed body; persisted by the caller's commit."""
+    source.feed_etag = body.etag[:256] if body.etag else None
+    source.feed_last_modified = body.last_modified[:64] if body.last_modified else None
+    source.feed_body_hash = body.body_hash
+
+
+def _log_short_circuit(
+    source: Source,
+    reason: str,
+) -> None:
+    logging.getLogger(__name__).info(
+        "feed_unchanged",
+        extra={
+            "source": source.name,
+            "reason": reason,
+            "fetches": source.feed_fetch_count,
+            "not_modified": source.feed_not_modified_count,
+            "unchanged": source.feed_unchanged_count,
+        },
+    )
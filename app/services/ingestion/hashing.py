@@ -0,0 +1,39 @@
+"""Fingerprint of article text for change detection and summary reuse.
+
+Normalization collapses whitespace and canonicalizes embedded URLs
+(tracking params, `www.`, scheme, trailing slash), so a re-ingested or
+syndicated copy that differs only in those hashes the same.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import Optional
+
+from app.services.extractors.cache import canonical_url
+
+_URL_RE = re.compile(r"https?://[^\s<>\"')\]]+")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_content(
+    content: Optional[str],
+) -> str:
+    text = _URL_RE.sub(
+        lambda m: canonical_url(m.group(0)),
+        content or "",
+    )
+    return _WS_RE.sub(" ", text).strip()
+
+
+def compute_content_hash(
+    content: Optional[str],
+) -> Optional[str]:
+    """sha256 hex of the normalized text; None when there is no text."""
+    normalized = normalize_content(
+        content=content,
+    )
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -0,0 +1,107 @@
+"""Adaptive per-source poll scheduling.
+
+After each ingest run the next poll time is derived from:
+- the publish rate over `ingest_rate_window_hours` (from `NewsItem.fetched_at`);
+  a source is polled about twice per expected gap between items
+- the streak of polls that stored nothing new, backing off exponentially
+- active subscribers: popular sources are polled sooner, sources nobody
+  receives go straight to the maximum interval
+The result is clamped to `ingest_min_poll_seconds`..`ingest_max_poll_seconds`.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.models import Source
+from app.repositories import eligible_sources as eligible_sources_repo
+from app.repositories import source_schedule as source_schedule_repo
+
+EMPTY_POLL_BACKOFF = 1.5
+MAX_BACKOFF_STEPS = 6
+
+
+@dataclass
+class PollStats:
+    items_in_window: int
+    window_hours: float
+    empty_poll_streak: int
+    subscribers: int
+
+
+def compute_poll_interval(
+    stats: PollStats,
+    min_seconds: int,
+    max_seconds: int,
+) -> int:
+    """Seconds until the next poll for the given stats, within the bounds."""
+    if stats.subscribers <= 0:
+        return max_seconds
+    # No items in the window is treated like one: the gap is at least a window.
+    expected_gap = stats.window_hours * 3600 / max(stats.items_in_window, 1)
+    interval = expected_gap / 2
+    interval *= EMPTY_POLL_BACKOFF ** min(
+        stats.empty_poll_streak,
+        MAX_BACKOFF_STEPS,
+    )
+    interval /= 1 + math.log10(1 + stats.subscribers)
+    return int(
+        min(
+            max(interval, min_seconds),
+            max_seconds,
+        )
+    )
+
+
+def schedule_next_poll(
+    db: Session,
+    source: Source,
+    new_items: int,
+    now: Optional[datetime] = None,
+) -> datetime:
+    """Record the poll outcome on `source` and set `next_poll_at`; no commit."""
+    settings = get_settings()
+    now = now or datetime.utcnow()
+    source.empty_poll_streak = 0 if new_items > 0 else source.empty_poll_streak + 1
+    stats = PollStats(
+        items_in_window=source_schedule_repo.count_items_since(
+            db=db,
+            source_id=source.id,
+            since=now - timedelta(
+                hours=settings.ingest_rate_window_hours,
+            ),
+        ),
+        window_hours=settings.ingest_rate_window_hours,
+        empty_poll_streak=source.empty_poll_streak,
+        subscribers=eligible_sources_repo.subscriber_count_for_source(
+            db=db,
+            source_id=source.id,
+        ),
+    )
+    interval = compute_poll_interval(
+        stats=stats,
+        min_seconds=settings.ingest_min_poll_seconds,
+        max_seconds=settings.ingest_max_poll_seconds,
+    )
+    source.next_poll_at = now + timedelta(
+        seconds=interval,
+    )
+    logging.getLogger(__name__).info(
+        "ingest_poll_scheduled",
+        extra={
+            "source": source.name,
+            "new_items": new_items,
+            "items_in_window": stats.items_in_window,
+            "empty_poll_streak": stats.empty_poll_streak,
+            "subscribers": stats.subscribers,
+            "interval_seconds": interval,
+        },
+    )
+    return source.next_poll_at
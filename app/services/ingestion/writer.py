@@ -0,0 +1,200 @@
+"""Shared write path for parsed news items.
+
+Parsers decide what to fetch with one `existing_content_flags` (or
+`existing_content`) lookup per batch and hand their results to
+`upsert_items`: a single `INSERT ... ON CONFLICT (source_id, external_id)
+DO UPDATE` that fills in missing content or title, or, with
+`replace_changed`, replaces content whose normalized hash changed (only
+parsers that store the feed body itself can use it; see `GenericRssParser`).
+Overlapping runs of a parser therefore never lose a batch to
+`uq_news_item_source_external`. Items flagged `needs_enrichment` are
+inserted PENDING for `app.services.parsers.enrichment`. No helper commits.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import EnrichmentStatus, NewsItem
+from app.services.ingestion.hashing import compute_content_hash
+
+
+@dataclass
+class ParsedItem:
+    external_id: str
+    title: str
+    url: str
+    content: Optional[str]
+    fetched_at: datetime
+    needs_enrichment: bool = False
+
+
+@dataclass
+class StoredContent:
+    has_content: bool
+    content_hash: Optional[str]
+
+
+def existing_content_flags(
+    db: Session,
+    source_id: UUID,
+    external_ids: Iterable[str],
+) -> Dict[str, bool]:
+    """Map already stored external ids to whether they have content."""
+    ids = list({e for e in external_ids if e})
+    if not ids:
+        return {}
+    has_content = func.coalesce(
+        func.length(func.trim(NewsItem.content)),
+        0,
+    ) > 0
+    rows = db.execute(
+        select(
+            NewsItem.external_id,
+            has_content.label("has_content"),
+        ).where(
+            NewsItem.source_id == source_id,
+            NewsItem.external_id.in_(ids),
+        )
+    ).all()
+    return {
+        row.external_id: bool(row.has_content)
+        for row in rows
+    }
+
+
+def existing_content(
+    db: Session,
+    source_id: UUID,
+    external_ids: Iterable[str],
+) -> Dict[str, StoredContent]:
+    """Like `existing_content_flags`, plus each item's `content_hash`, in one query."""
+    ids = list({e for e in external_ids if e})
+    if not ids:
+        return {}
+    has_content = func.coalesce(
+        func.length(func.trim(NewsItem.content)),
+        0,
+    ) > 0
+    rows = db.execute(
+        select(
+            NewsItem.external_id,
+            has_content.label("has_content"),
+            NewsItem.content_hash,
+        ).where(
+            NewsItem.source_id == source_id,
+            NewsItem.external_id.in_(ids),
+        )
+    ).all()
+    return {
+        row.external_id: StoredContent(
+            has_content=bool(row.has_content),
+            content_hash=row.content_hash,
+        )
+        for row in rows
+    }
+
+
+def upsert_items(
+    db: Session,
+    source_id: UUID,
+    items: List[ParsedItem],
+    replace_changed: bool = False,
+) -> int:
+    """Insert new items and backfill empty content/title; return affected rows.
+
+    With `replace_changed`, stored content is also replaced when the new
+    content's hash differs, which lets the summarizer pick the edit up.
+    """
+    unique: Dict[str, ParsedItem] = {}
+    for item in items:
+        # ON CONFLICT cannot touch the same row twice in one statement.
+        unique.setdefault(
+            item.external_id,
+            item,
+        )
+    if not unique:
+        return 0
+
+    now = datetime.utcnow()
+    stmt = pg_insert(NewsItem).values(
+        [
+            {
+                "source_id": source_id,
+                "external_id": item.external_id,
+                "title": item.title[:256],
+                "url": item.url[:512],
+                "content": item.content or None,
+                "content_hash": compute_content_hash(
+                    content=item.content,
+                ),
+                "fetched_at": item.fetched_at,
+                "is_active": True,
+                "enrichment_status": (
+                    EnrichmentStatus.PENDING
+                    if item.needs_enrichment
+                    else EnrichmentStatus.DONE
+                ),
+                "enrichment_attempts": 0,
+                "summary_attempts": 0,
+            }
+            for item in unique.values()
+        ]
+    )
+    excluded = stmt.excluded
+    content_missing = func.coalesce(
+        func.length(func.trim(NewsItem.content)),
+        0,
+    ) == 0
+    title_missing = func.coalesce(
+        func.length(func.trim(NewsItem.title)),
+        0,
+    ) == 0
+    if replace_changed:
+        set_ = {
+            "content": excluded.content,
+            "content_hash": excluded.content_hash,
+            # New content gets a fresh budget of fallback summaries.
+            "summary_attempts": 0,
+        }
+        where = and_(
+            excluded.content_hash.is_not(None),
+            NewsItem.content_hash.is_distinct_from(excluded.content_hash),
+        )
+    else:
+        set_ = {
+            "content": func.coalesce(
+                func.nullif(func.trim(NewsItem.content), ""),
+                excluded.content,
+            ),
+            "content_hash": case(
+                (content_missing, excluded.content_hash),
+                else_=NewsItem.content_hash,
+            ),
+        }
+        where = or_(
+            content_missing,
+            title_missing,
+        )
+    result = db.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_news_item_source_external",
+            set_={
+                **set_,
+                "title": func.coalesce(
+                    func.nullif(func.trim(NewsItem.title), ""),
+                    excluded.title,
+                ),
+                "updated_at": now,
+            },
+            where=where,
+        )
+    )
+    return result.rowcount or 0
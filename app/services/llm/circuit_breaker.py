@@ -0,0 +1,115 @@
+"""Error-rate and latency circuit breaker shared by all workers via Redis.
+
+Outcomes are counted per wall-clock minute (`llm:breaker:{name}:{minute}`
+with `calls`, `failures` and `slow`). Once a window has `min_calls`
+calls and either the failure or the slow-call share reaches its threshold,
+the breaker opens (`llm:breaker:{name}:open`) for `open_seconds` and
+callers use their fallback. When it expires, calls go through again and
+the next window decides. Redis errors keep the breaker closed.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from app.db.redis import get_redis
+
+_RECORD_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], 'calls', 1)
+if ARGV[1] == '1' then
+  redis.call('HINCRBY', KEYS[1], 'failures', 1)
+end
+if ARGV[2] == '1' then
+  redis.call('HINCRBY', KEYS[1], 'slow', 1)
+end
+redis.call('PEXPIRE', KEYS[1], 120000)
+local calls = tonumber(redis.call('HGET', KEYS[1], 'calls'))
+if calls < tonumber(ARGV[3]) then
+  return 0
+end
+local failures = tonumber(redis.call('HGET', KEYS[1], 'failures') or '0')
+local slow = tonumber(redis.call('HGET', KEYS[1], 'slow') or '0')
+if failures / calls >= tonumber(ARGV[4]) or slow / calls >= tonumber(ARGV[5]) then
+  redis.call('SET', KEYS[2], '1', 'PX', tonumber(ARGV[6]))
+  -- Start the next window clean so a recovered backend is judged afresh.
+  redis.call('DEL', KEYS[1])
+  return 1
+end
+return 0
+"""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        error_rate: float,
+        slow_seconds: float,
+        slow_rate: float,
+        min_calls: int,
+        open_seconds: int,
+        prefix: str = "llm:breaker",
+    ) -> None:
+        self.name = name
+        self.error_rate = error_rate
+        self.slow_seconds = slow_seconds
+        self.slow_rate = slow_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.prefix = prefix
+        self._script = None
+
+    def is_open(
+        self,
+    ) -> bool:
+        try:
+            return bool(
+                get_redis().exists(
+                    f"{self.prefix}:{self.name}:open",
+                )
+            )
+        except RedisError:
+            return False
+
+    def record(
+        self,
+        ok: bool,
+        elapsed_seconds: float,
+    ) -> bool:
+        """Count one call outcome; return True if it opened the breaker."""
+        minute = int(time.time() // 60)
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(_RECORD_SCRIPT)
+            opened = self._script(
+                keys=[
+                    f"{self.prefix}:{self.name}:{minute}",
+                    f"{self.prefix}:{self.name}:open",
+                ],
+                args=[
+                    "0" if ok else "1",
+                    "1" if elapsed_seconds >= self.slow_seconds else "0",
+                    self.min_calls,
+                    self.error_rate,
+                    self.slow_rate,
+                    max(int(self.open_seconds * 1000), 1),
+                ],
+            )
+        except RedisError as e:
+            logging.getLogger(__name__).warning(
+                "llm_breaker_unavailable",
+                extra={"error": str(e)},
+            )
+            return False
+        if opened:
+            logging.getLogger(__name__).warning(
+                "llm_breaker_opened",
+                extra={
+                    "breaker": self.name,
+                    "open_seconds": self.open_seconds,
+                },
+            )
+        return bool(opened)
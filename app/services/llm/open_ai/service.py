@@ -2,12 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import List
+from typing import Any, AsyncIterator, Callable, List, Optional
 
+import aiohttp
 import openai
+from openai import error as openai_error
 
 from app.config import get_settings
+from app.services.llm.rate_limit import RateBudget
+from app.services.llm.tokens import count_tokens
+
+# Errors worth another attempt after a backoff; anything else is final.
+RETRYABLE_ERRORS = (
+    openai_error.APIError,
+    openai_error.APIConnectionError,
+    openai_error.ServiceUnavailableError,
+    openai_error.Timeout,
+    openai_error.TryAgain,
+)
+
+# Called with (ok, elapsed seconds) after each request that reached the API.
+RequestHook = Callable[[bool, float], None]
 
 
 @dataclass
@@ -32,6 +52,12 @@ class OpenAIChatService:
         self.model = model
         self.request_timeout_seconds = request_timeout_seconds
         self.max_retries = max_retries
+        self.max_backoff_seconds = settings.openai_max_backoff_seconds
+        self.budget = RateBudget(
+            name=model,
+            requests_per_minute=settings.openai_requests_per_minute,
+            tokens_per_minute=settings.openai_tokens_per_minute,
+        )
 
     def chat(
         self,
@@ -57,6 +83,100 @@ class OpenAIChatService:
                 continue
         raise RuntimeError(f"OpenAI chat failed after retries: {last_error}")
 
+    async def achat(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.1,
+        max_tokens: int = 512,
+        seed: int | None = 42,
+        on_request: Optional[RequestHook] = None,
+    ) -> str:
+        """Async `chat` within the shared RPM/TPM budget.
+
+        Rate-limit responses pause the budget for every worker for their
+        Retry-After; transient errors back off exponentially with jitter.
+        `on_request` sees each API request's outcome and latency, without
+        the time spent waiting for the budget or backing off.
+        """
+        reserved = estimate_tokens(
+            messages=messages,
+            model=self.model,
+        ) + max_tokens
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries + 1):
+            await self.budget.acquire(
+                tokens=reserved,
+            )
+            try:
+                resp = await self._acreate(
+                    on_request=on_request,
+                    model=self.model,
+                    messages=[{"role": m.role, "content": m.content} for m in messages],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    request_timeout=self.request_timeout_seconds,
+                )
+            except openai_error.RateLimitError as exc:
+                if exc.code == "insufficient_quota":
+                    raise
+                last_error = exc
+                wait = _retry_after(exc) or self._backoff(attempt)
+                self.budget.pause(wait)
+                await asyncio.sleep(wait)
+                continue
+            except RETRYABLE_ERRORS as exc:
+                last_error = exc
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            used = (resp.get("usage") or {}).get("total_tokens")
+            if used:
+                self.budget.adjust(used - reserved)
+            text = ((resp.get("choices") or [{}])[0].get("message", {}).get("content", ""))
+            return text or ""
+        raise RuntimeError(f"OpenAI chat failed after retries: {last_error}")
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Share one aiohttp session across the `achat` calls made inside."""
+        async with aiohttp.ClientSession() as http_session:
+            token = openai.aiosession.set(http_session)
+            try:
+                yield
+            finally:
+                openai.aiosession.reset(token)
+
+    async def _acreate(
+        self,
+        on_request: Optional[RequestHook],
+        **request: Any,
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            resp = await openai.ChatCompletion.acreate(
+                **request,
+            )
+        except openai_error.RateLimitError as exc:
+            # Pacing is the budget's job; only an exhausted quota is a failure.
+            if on_request is not None and exc.code == "insufficient_quota":
+                on_request(False, time.perf_counter() - started)
+            raise
+        except Exception:
+            if on_request is not None:
+                on_request(False, time.perf_counter() - started)
+            raise
+        if on_request is not None:
+            on_request(True, time.perf_counter() - started)
+        return resp
+
+    def _backoff(
+        self,
+        attempt: int,
+    ) -> float:
+        return min(
+            self.max_backoff_seconds,
+            (2 ** attempt) + random.uniform(0, 1),
+        )
+
 
 def build_messages(
     system_prompt: str,
@@ -68,3 +188,31 @@ def build_messages(
     ]
 
 
+def estimate_tokens(
+    messages: List[ChatMessage],
+    model: Optional[str] = None,
+) -> int:
+    """Prompt size in tokens, including per-message framing."""
+    return sum(
+        count_tokens(
+            text=m.content,
+            model=model,
+        )
+        + 4
+        for m in messages
+    ) + 2
+
+
+def _retry_after(
+    exc: openai_error.OpenAIError,
+) -> Optional[float]:
+    headers = exc.headers or {}
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(value) * scale, 0.0)
+        except (TypeError, ValueError):
+            continue
+    return None
@@ -0,0 +1,135 @@
+"""Requests- and tokens-per-minute budget shared by all workers via Redis.
+
+Each model has one counter hash per wall-clock minute
+(`llm:budget:{model}:{minute}` with `req` and `tok`), updated atomically by
+a Lua script: a call is granted only if both counters stay within
+`rpm`/`tpm`, otherwise the caller is told how long to wait for the next
+window. A rate-limit response from the provider pauses the whole budget
+(`llm:budget:{model}:pause`) for its Retry-After. Redis errors fail open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from app.db.redis import get_redis
+
+_ACQUIRE_SCRIPT = """
+local pause = redis.call('PTTL', KEYS[2])
+if pause > 0 then
+  return pause
+end
+local req = tonumber(redis.call('HGET', KEYS[1], 'req') or '0')
+local tok = tonumber(redis.call('HGET', KEYS[1], 'tok') or '0')
+local tokens = tonumber(ARGV[3])
+-- An oversized call still runs alone in a fresh window.
+if req + 1 > tonumber(ARGV[1]) or (tok > 0 and tok + tokens > tonumber(ARGV[2])) then
+  return tonumber(ARGV[4])
+end
+redis.call('HINCRBY', KEYS[1], 'req', 1)
+redis.call('HINCRBY', KEYS[1], 'tok', tokens)
+redis.call('PEXPIRE', KEYS[1], 120000)
+return 0
+"""
+
+
+class RateBudget:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        prefix: str = "llm:budget",
+    ) -> None:
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.prefix = prefix
+        self._script = None
+
+    def try_acquire(
+        self,
+        tokens: int,
+    ) -> float:
+        """Reserve one request and `tokens`; return 0 or seconds to wait."""
+        now = time.time()
+        minute = int(now // 60)
+        ms_left = 60000 - int(now * 1000) % 60000
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(_ACQUIRE_SCRIPT)
+            wait_ms = self._script(
+                keys=[
+                    f"{self.prefix}:{self.name}:{minute}",
+                    f"{self.prefix}:{self.name}:pause",
+                ],
+                args=[
+                    self.requests_per_minute,
+                    self.tokens_per_minute,
+                    max(int(tokens), 0),
+                    ms_left,
+                ],
+            )
+        except RedisError as e:
+            logging.getLogger(__name__).warning(
+                "llm_budget_unavailable",
+                extra={"error": str(e)},
+            )
+            return 0.0
+        return int(wait_ms or 0) / 1000
+
+    async def acquire(
+        self,
+        tokens: int,
+        max_wait_seconds: Optional[float] = None,
+    ) -> None:
+        """Wait until the budget grants the call; TimeoutError past `max_wait_seconds`."""
+        started = time.monotonic()
+        while True:
+            wait = self.try_acquire(
+                tokens=tokens,
+            )
+            if wait <= 0:
+                return
+            if (
+                max_wait_seconds is not None
+                and time.monotonic() - started + wait > max_wait_seconds
+            ):
+                raise TimeoutError(f"LLM budget {self.name} exhausted")
+            await asyncio.sleep(wait)
+
+    def adjust(
+        self,
+        tokens: int,
+    ) -> None:
+        """Correct the current window by actual minus reserved tokens."""
+        if not tokens:
+            return
+        minute = int(time.time() // 60)
+        try:
+            get_redis().hincrby(
+                f"{self.prefix}:{self.name}:{minute}",
+                "tok",
+                int(tokens),
+            )
+        except RedisError:
+            pass
+
+    def pause(
+        self,
+        seconds: float,
+    ) -> None:
+        """Hold every worker's calls for `seconds` (provider said slow down)."""
+        try:
+            get_redis().set(
+                f"{self.prefix}:{self.name}:pause",
+                "1",
+                px=max(int(seconds * 1000), 1),
+            )
+        except RedisError:
+            pass
@@ -0,0 +1,52 @@
+"""Prompt token counting.
+
+Uses tiktoken when it is installed and the model's encoding can be
+loaded; otherwise falls back to a character heuristic (about 4 characters
+per token for English prose), which is close enough for budgeting.
+"""
+
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+CHARS_PER_TOKEN = 4
+FALLBACK_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=16)
+def _encoding(
+    model: Optional[str],
+) -> Optional[Any]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model or "")
+    except KeyError:
+        pass
+    try:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:  # noqa: BLE001 - encodings may need a download
+        logging.getLogger(__name__).warning(
+            "tiktoken_unavailable",
+            extra={"error": str(e)},
+        )
+        return None
+
+
+def count_tokens(
+    text: str,
+    model: Optional[str] = None,
+) -> int:
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
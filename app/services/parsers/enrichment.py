@@ -0,0 +1,187 @@
+"""Second ingestion stage: fill in full text for items stored PENDING.
+
+Parsers insert entries straight from the feed. `enrich_items` runs each
+source parser's `enrich` hook over a claimed batch under one `AsyncFetcher`
+sized by `enrichment_concurrency`, so slow article fetches never hold up
+feed polling. A parser may define `prefetch(fetcher, items)` to look up its
+whole share of the batch at once before `enrich` runs. An item still
+without text after `enrichment_max_attempts` is closed FAILED with a
+title/link body.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.models import EnrichmentStatus, NewsItem, Source
+from app.services.ingestion import AsyncFetcher, compute_content_hash, run_sync
+from app.services.parsers.registry import IngestParser, build_parser
+
+
+def enrich_items(
+    db: Session,
+    items: List[NewsItem],
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Enrich `items` in place and return outcome counts; no commit."""
+    return run_sync(
+        enrich_items_async(
+            db=db,
+            items=items,
+            now=now,
+        )
+    )
+
+
+async def enrich_items_async(
+    db: Session,
+    items: List[NewsItem],
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    settings = get_settings()
+    now = now or datetime.utcnow()
+    parsers = _parsers_by_source(
+        db=db,
+        source_ids={item.source_id for item in items},
+    )
+    async with AsyncFetcher(
+        max_concurrency=settings.enrichment_concurrency,
+    ) as fetcher:
+        await asyncio.gather(
+            *(
+                _prefetch(
+                    parser=parser,
+                    fetcher=fetcher,
+                    items=[item for item in items if item.source_id == source_id],
+                )
+                for source_id, parser in parsers.items()
+            )
+        )
+        results = await asyncio.gather(
+            *(
+                _enrich_one(
+                    parser=parsers.get(item.source_id),
+                    fetcher=fetcher,
+                    item=item,
+                )
+                for item in items
+            )
+        )
+
+    counts = {"enriched": 0, "retry": 0, "failed": 0}
+    for item, (title, content) in zip(items, results):
+        outcome = _apply(
+            item=item,
+            title=title,
+            content=content,
+            now=now,
+            # Items of unknown or deleted sources are not retried.
+            max_attempts=(
+                settings.enrichment_max_attempts
+                if item.source_id in parsers
+                else 1
+            ),
+        )
+        counts[outcome] += 1
+    return counts
+
+
+async def _prefetch(
+    parser: IngestParser,
+    fetcher: AsyncFetcher,
+    items: List[NewsItem],
+) -> None:
+    """Let parsers that support it resolve the whole batch up front."""
+    prefetch = getattr(parser, "prefetch", None)
+    if prefetch is None:
+        return
+    try:
+        await prefetch(
+            fetcher=fetcher,
+            items=items,
+        )
+    except Exception as e:  # noqa: BLE001
+        logging.getLogger(__name__).warning(
+            "enrich_prefetch_failed",
+            extra={"error": str(e)},
+        )
+
+
+async def _enrich_one(
+    parser: Optional[IngestParser],
+    fetcher: AsyncFetcher,
+    item: NewsItem,
+) -> Tuple[Optional[str], Optional[str]]:
+    if parser is None:
+        return None, None
+    try:
+        return await parser.enrich(
+            fetcher=fetcher,
+            item=item,
+        )
+    except Exception as e:  # noqa: BLE001
+        logging.getLogger(__name__).warning(
+            "enrich_item_failed",
+            extra={"news_item_id": str(item.id), "error": str(e)},
+        )
+        return None, None
+
+
+def _apply(
+    item: NewsItem,
+    title: Optional[str],
+    content: Optional[str],
+    now: datetime,
+    max_attempts: int,
+) -> str:
+    item.enrichment_attempts = (item.enrichment_attempts or 0) + 1
+    if content:
+        item.content = content
+        item.content_hash = compute_content_hash(
+            content=content,
+        )
+        item.summary_attempts = 0
+        if title and title.strip():
+            item.title = title.strip()[:256]
+        item.enrichment_status = EnrichmentStatus.DONE
+        item.enriched_at = now
+        return "enriched"
+    if item.enrichment_attempts < max_attempts:
+        return "retry"
+    if not (item.content or "").strip():
+        item.content = f"{item.title}\n{item.url}"
+        item.content_hash = compute_content_hash(
+            content=item.content,
+        )
+    item.enrichment_status = EnrichmentStatus.FAILED
+    item.enriched_at = now
+    return "failed"
+
+
+def _parsers_by_source(
+    db: Session,
+    source_ids: set[UUID],
+) -> Dict[UUID, IngestParser]:
+    parsers: Dict[UUID, IngestParser] = {}
+    for source_id in source_ids:
+        source = db.get(
+            Source,
+            source_id,
+        )
+        if source is None:
+            continue
+        try:
+            parsers[source_id] = build_parser(
+                db=db,
+                source=source,
+            )
+        except ValueError:
+            continue
+    return parsers
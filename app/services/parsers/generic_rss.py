@@ -1,25 +1,34 @@
 from __future__ import annotations
 
 from datetime import datetime
-from email.utils import parsedate_to_datetime
 from typing import Optional, Tuple
 
-import requests
-from lxml import html as lh
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.db.models import NewsItem, Source
-from app.services.extractors.full_text_rss_client import FullTextRssClient
+from app.services.extractors import build_extractor
+from app.services.ingestion import (
+    AsyncFetcher,
+    ParsedItem,
+    compute_content_hash,
+    existing_content,
+    fetch_feed,
+    parse_feed,
+    run_sync,
+    store_validators,
+    upsert_items,
+)
 
 
 class GenericRssParser:
     """Generic RSS parser that stores new items into the database.
 
-    The parser tries, in order:
-    1. content:encoded from RSS
-    2. description text content
-    3. FullTextRssClient extraction by article link
+    Entries are read with the streaming `parse_feed` (RSS or Atom) and
+    stored with the content:encoded text, falling back to the description.
+    Entries without a body are inserted for the enrichment stage, which
+    calls `enrich` (the configured extraction backend by link). Stored
+    entries whose feed body changed beyond whitespace and tracking params
+    are replaced so they get summarized again.
     """
 
     def __init__(
@@ -42,86 +51,117 @@ class GenericRssParser:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9",
         }
-        self.ftr = FullTextRssClient()
+        self.extractor = build_extractor()
 
     def save_new_sync(
         self,
         limit: int = 50,
-    ) -> None:
+    ) -> int:
         """Fetch RSS items and persist new or incomplete ones."""
+        return run_sync(
+            self.save_new_async(
+                limit=limit,
+            )
+        )
+
+    async def save_new_async(
+        self,
+        limit: int = 50,
+    ) -> int:
+        """Fetch the feed and store entries with their feed bodies, commit once."""
         source = self._ensure_source()
-        items = self._fetch_rss_items(
-            feed_url=self.feed_url,
+        async with AsyncFetcher(
+            headers=self.http_headers,
+        ) as fetcher:
+            feed = await fetch_feed(
+                fetcher=fetcher,
+                db=self.db,
+                source=source,
+                url=self.feed_url,
+            )
+        if feed is None:
+            return 0
+        entries = parse_feed(
+            content=feed.content,
             limit=limit,
         )
 
-        for item in items:
-            external_id = (
-                item.get("guid")
-                or item.get("link")
-            )
+        external_ids = [entry.external_id for entry in entries]
+        stored = existing_content(
+            db=self.db,
+            source_id=source.id,
+            external_ids=external_ids,
+        )
+
+        parsed: list[ParsedItem] = []
+        changed: list[ParsedItem] = []
+        for entry, external_id in zip(entries, external_ids):
             if not external_id:
                 continue
+            known = stored.get(external_id)
+            title = entry.title or ""
+            link = entry.link or external_id
+            content = entry.content_text() or entry.description_text()
+
+            target = parsed
+            if known is not None and known.has_content:
+                # Edited upstream: replace only if the normalized text differs.
+                if (
+                    not content
+                    or known.content_hash is None
+                    or compute_content_hash(content=content) == known.content_hash
+                ):
+                    continue
+                target = changed
+            elif known is not None:
+                # Stored without content: backfill only with a real body.
+                if not content:
+                    continue
+            elif not title:
+                continue
 
-            existing_item: Optional[NewsItem] = self.db.scalar(
-                select(NewsItem).where(
-                    NewsItem.external_id == external_id,
-                    NewsItem.source_id == source.id,
-                )
-            )
-
-            title = item.get("title") or ""
-            link = item.get("link") or external_id or ""
-            published_at = self._parse_pub_date(
-                pub_date=item.get("pubDate"),
-            )
-
-            content_encoded = item.get("content_encoded")
-            description_text = self._html_to_text(
-                html_fragment=item.get("description"),
-            )
-
-            content: Optional[str] = None
-            if content_encoded and len(content_encoded.strip()) > 0:
-                content = self._html_to_text(
-                    html_fragment=content_encoded,
-                )
-            if not content and description_text:
-                content = description_text
-            if not content and link:
-                extracted = self.ftr.extract(
+            published_at = entry.published_at
+            target.append(
+                ParsedItem(
+                    external_id=external_id,
+                    title=title,
                     url=link,
+                    content=content,
+                    fetched_at=published_at or datetime.utcnow(),
+                    needs_enrichment=not content,
                 )
-                if extracted and len(extracted.strip()) > 0:
-                    content = extracted
-
-            if existing_item:
-                if not existing_item.content and content:
-                    existing_item.content = content
-                    if title and (not existing_item.title or len(existing_item.title.strip()) == 0):
-                        existing_item.title = title
-                    self.db.commit()
-                continue
-
-            final_title = (title or "").strip()
-            if not final_title:
-                continue
-
-            if not content:
-                content = f"{title}\n{link}" if (title or link) else None
-
-            news_item = NewsItem(
-                source_id=source.id,
-                external_id=external_id,
-                title=final_title,
-                content=(content or None),
-                url=link,
-                fetched_at=published_at or datetime.utcnow(),
-                is_active=True,
             )
-            self.db.add(news_item)
 
+        written = upsert_items(
+            db=self.db,
+            source_id=source.id,
+            items=parsed,
+        ) + upsert_items(
+            db=self.db,
+            source_id=source.id,
+            items=changed,
+            replace_changed=True,
+        )
+        store_validators(
+            source=source,
+            body=feed,
+        )
         self.db.commit()
+        return written
+
+    async def enrich(
+        self,
+        fetcher: AsyncFetcher,
+        item: NewsItem,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Return (title, content) for an item stored without a feed body."""
+        extracted = await self.extractor.extract_async(
+            fetcher=fetcher,
+            url=item.url,
+        )
+        if extracted and len(extracted.strip()) > 0:
+            return None, extracted
+        return None, None
 
     def _ensure_source(
         self,
@@ -138,102 +178,3 @@ class GenericRssParser:
             self.db.add(source)
             self.db.commit()
         return source
-
-    def _fetch_rss_items(
-        self,
-        feed_url: str,
-        limit: int,
-    ) -> list[dict]:
-        """Download and parse RSS XML and return a list of items."""
-        resp = requests.get(
-            url=feed_url,
-            headers=self.http_headers,
-            timeout=20,
-        )
-        resp.raise_for_status()
-        root = lh.fromstring(resp.content)
-        items: list[dict] = []
-        for item_el in root.xpath("//item")[:limit]:
-            ns = {
-                "content": "http://purl.org/rss/1.0/modules/content/",
-            }
-            item = {
-                "title": self._text_or_none(
-                    value=item_el.xpath(
-                        "string(title)",
-                    ),
-                ),
-                "link": self._text_or_none(
-                    value=item_el.xpath(
-                        "string(link)",
-                    ),
-                ),
-                "guid": self._text_or_none(
-                    value=item_el.xpath(
-                        "string(guid)",
-                    ),
-                ),
-                "pubDate": self._text_or_none(
-                    value=item_el.xpath(
-                        "string(pubDate)",
-                    ),
-                ),
-                "content_encoded": (
-                    self._text_or_none(
-                        value=item_el.xpath(
-                            "string(.//content:encoded)",
-                            namespaces=ns,
-                        ),
-                    )
-                    or self._text_or_none(
-                        value=item_el.xpath(
-                            "string(.//*[local-name() = 'encoded' and namespace-uri() = 'http://purl.org/rss/1.0/modules/content/'])",
-                        ),
-                    )
-                ),
-                "description": self._text_or_none(
-                    value=item_el.xpath(
-                        "string(description)",
-                    ),
-                ),
-            }
-            items.append(item)
-        return items
-
-    def _text_or_none(
-        self,
-        value: object,
-    ) -> Optional[str]:
-        """Convert any value to a stripped string or None."""
-        if value is None:
-            return None
-        text = str(value).strip()
-        return text if text else None
-
-    def _parse_pub_date(
-        self,
-        pub_date: Optional[str],
-    ) -> Optional[datetime]:
-        """Parse RFC 2822 pubDate into datetime or return None."""
-        if not pub_date:
-            return None
-        try:
-            return parsedate_to_datetime(pub_date)
-        except Exception:
-            return None
-
-    def _html_to_text(
-        self,
-        html_fragment: Optional[str],
-    ) -> Optional[str]:
-        """Convert small HTML fragments to plain text."""
-        if not html_fragment:
-            return None
-        try:
-            doc = lh.fromstring(html_fragment)
-            text = doc.text_content().strip()
-            return " ".join(text.split()) if text else None
-        except Exception:
-            return None
-
-
@@ -1,11 +1,19 @@
-import requests
+import asyncio
 from datetime import datetime
-from sqlalchemy import select
+from typing import Optional, Tuple
+
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.db.models import Source, NewsItem
-from app.services.extractors.full_text_rss_client import FullTextRssClient
+from app.db.models import NewsItem, Source
+from app.services.extractors import build_extractor
+from app.services.ingestion import (
+    AsyncFetcher,
+    ParsedItem,
+    existing_content_flags,
+    run_sync,
+    upsert_items,
+)
 
 settings = get_settings()
 
@@ -15,65 +23,106 @@ class HackerNewsParser:
         self.db = db
         self.api = settings.hackernews_api_url
         self.web = settings.hackernews_web_url
-        self.ftr = FullTextRssClient()
+        self.extractor = build_extractor()
 
     def save_new_sync(
             self,
             limit: int = 50,
-    ):
+    ) -> int:
+        return run_sync(
+            self.save_new_async(
+                limit=limit,
+            )
+        )
+
+    async def save_new_async(
+            self,
+            limit: int = 50,
+    ) -> int:
+        """Fetch item metadata concurrently and insert it, commit once.
+
+        Items are stored without a body; the enrichment stage fills it.
+        Known ids are skipped: the API carries no article text, so there is
+        no content hash to compare for upstream edits.
+        """
         source = self.db.query(Source).filter_by(name="Hacker News").one_or_none()
         if source is None:
             source = Source(
                 name="Hacker News",
                 url=str(self.web),
+                parser_kind="hackernews",
                 default_language="en",
                 is_active=True,
             )
             self.db.add(source)
             self.db.commit()
 
-        # Use top stories instead of newstories to get only high-score items
-        ids = requests.get(
-            url=f"{self.api}/topstories.json",
-            timeout=15,
-        ).json()[:limit]
+        async with AsyncFetcher() as fetcher:
+            # Use top stories instead of newstories to get only high-score items
+            ids = (
+                await fetcher.get_json(
+                    url=f"{self.api}/topstories.json",
+                )
+                or []
+            )[:limit]
+            if not ids:
+                return 0
 
-        for sid in ids:
-            sid_str = str(sid)
-            exists = (
-                self.db.execute(
-                    select(NewsItem).where(
-                        NewsItem.external_id == sid_str,
-                        NewsItem.source_id == source.id,
+            known = existing_content_flags(
+                db=self.db,
+                source_id=source.id,
+                external_ids=[str(sid) for sid in ids],
+            )
+            new_items = await asyncio.gather(
+                *(
+                    self._fetch_item(
+                        fetcher=fetcher,
+                        sid=sid,
                     )
+                    for sid in ids
+                    if str(sid) not in known
                 )
-                .first()
             )
-            if exists:
-                continue
 
-            item = requests.get(
-                url=f"{self.api}/item/{sid}.json",
-                timeout=15,
-            ).json()
-            if item.get("type") != "story":
-                continue
-            url = item.get("url") or f"{self.web}/item?id={sid}"
-            title = item.get("title", "")
-            ts = datetime.fromtimestamp(item.get("time", 0))
+        stored = upsert_items(
+            db=self.db,
+            source_id=source.id,
+            items=[ni for ni in new_items if ni is not None],
+        )
+        self.db.commit()
+        return stored
 
-            content = self.ftr.extract(url) or f"{title}\n{url}"
-            extracted_title = title
+    async def _fetch_item(
+            self,
+            fetcher: AsyncFetcher,
+            sid: int,
+    ) -> Optional[ParsedItem]:
+        item = await fetcher.get_json(
+            url=f"{self.api}/item/{sid}.json",
+        )
+        if not item or item.get("type") != "story":
+            return None
+        url = item.get("url") or f"{self.web}/item?id={sid}"
+        title = item.get("title", "")
+        ts = datetime.fromtimestamp(item.get("time", 0))
 
-            ni = NewsItem(
-                source_id=source.id, # type: ignore
-                external_id=sid_str,
-                title=extracted_title,
-                content=content,
-                url=url,
-                fetched_at=ts,
-                is_active=True,
-            )
-            self.db.add(ni)
+        return ParsedItem(
+            external_id=str(sid),
+            title=title,
+            content=None,
+            url=url,
+            fetched_at=ts,
+            needs_enrichment=True,
+        )
 
-        self.db.commit()
\ No newline at end of file
+    async def enrich(
+            self,
+            fetcher: AsyncFetcher,
+            item: NewsItem,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Return (title, content) for a stored item; HN has no better title."""
+        content = await self.extractor.extract_async(
+            fetcher=fetcher,
+            url=item.url,
+        )
+        return None, content
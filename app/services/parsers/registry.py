@@ -0,0 +1,69 @@
+"""Map `Source.parser_kind` to a parser instance.
+
+Adding a feed is a `sources` row with one of these kinds; no new task or
+beat entry is needed.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Optional, Protocol, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.models import NewsItem, Source
+from app.services.ingestion import AsyncFetcher
+from app.services.parsers.generic_rss import GenericRssParser
+from app.services.parsers.hackernews import HackerNewsParser
+from app.services.parsers.techcrunch import TechCrunchParser
+
+
+class IngestParser(Protocol):
+    def save_new_sync(
+        self,
+        limit: int = 50,
+    ) -> int:
+        """Ingest up to `limit` entries; return the number of rows stored."""
+        ...
+
+    async def enrich(
+        self,
+        fetcher: AsyncFetcher,
+        item: NewsItem,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Return (title, content) extracted for a stored item, None if unknown."""
+        ...
+
+
+PARSER_FACTORIES: Dict[str, Callable[[Session, Source], IngestParser]] = {
+    "rss": lambda db, source: GenericRssParser(
+        db=db,
+        source_name=source.name,
+        feed_url=source.url,
+        default_language=source.default_language,
+    ),
+    "techcrunch": lambda db, source: TechCrunchParser(
+        db=db,
+        feed_url=source.url,
+        source_name=source.name,
+    ),
+    # Any WordPress site: RSS plus batched WP REST enrichment.
+    "wordpress": lambda db, source: TechCrunchParser(
+        db=db,
+        feed_url=source.url,
+        source_name=source.name,
+    ),
+    "hackernews": lambda db, source: HackerNewsParser(
+        db=db,
+    ),
+}
+
+
+def build_parser(
+    db: Session,
+    source: Source,
+) -> IngestParser:
+    """Return the parser for `source`; ValueError for an unknown kind."""
+    factory = PARSER_FACTORIES.get(source.parser_kind)
+    if factory is None:
+        raise ValueError(f"Unknown parser kind: {source.parser_kind}")
+    return factory(db, source)
@@ -1,25 +1,39 @@
-"""TechCrunch RSS parser that stores new items into the database.
+"""TechCrunch (or any WordPress) RSS parser that stores new items into the database.
 
 Strategy:
 - Read RSS (https://techcrunch.com/feed/)
 - Prefer GUID as stable external_id, fallback to link
-- Try to extract full text from content:encoded; otherwise fetch page and extract
+- Store new items with the description text right away
+- `enrich` (enrichment stage) replaces it with full text from the extraction
+  backend or the WP REST API; `prefetch` batches the WP lookups of a whole
+  enrichment batch (see `parsers.wordpress`)
+- Known items are not re-checked for upstream edits: their stored content
+  is the enriched full text, so the feed description's hash never matches
+  it and `replace_changed` would swap the article back for the excerpt
 """
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime
-from email.utils import parsedate_to_datetime
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-import requests
-from sqlalchemy import select
 from sqlalchemy.orm import Session
-from lxml import html as lh
-from urllib.parse import urlparse, parse_qs
 
 from app.db.models import NewsItem, Source
-from app.services.extractors.full_text_rss_client import FullTextRssClient
+from app.services.extractors import build_extractor
+from app.services.ingestion import (
+    AsyncFetcher,
+    ParsedItem,
+    existing_content_flags,
+    fetch_feed,
+    html_to_text,
+    parse_feed,
+    run_sync,
+    store_validators,
+    upsert_items,
+)
+from app.services.parsers.wordpress import WordPressBatchClient, WordPressPost
 
 
 class TechCrunchParser:
@@ -27,9 +41,11 @@ class TechCrunchParser:
         self,
         db: Session,
         feed_url: str = "https://techcrunch.com/feed/",
+        source_name: str = "TechCrunch",
     ) -> None:
         self.db = db
         self.feed_url = feed_url
+        self.source_name = source_name
         self.http_headers = {
             "User-Agent": (
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -39,239 +55,177 @@ class TechCrunchParser:
             "Accept": "application/json, text/javascript, */*; q=0.01",
             "Accept-Language": "en-US,en;q=0.9",
         }
-        self.ftr = FullTextRssClient()
+        self.extractor = build_extractor()
+        self.wp = WordPressBatchClient(
+            fallback_base=feed_url,
+            headers=self.http_headers,
+        )
 
     def save_new_sync(
         self,
         limit: int = 50,
-    ) -> None:
-        source = self._ensure_source()
-        items = self._fetch_rss_items(
-            feed_url=self.feed_url,
-            limit=limit,
+    ) -> int:
+        return run_sync(
+            self.save_new_async(
+                limit=limit,
+            )
         )
 
-        for item in items:
-            external_id = item.get("guid") or item.get("link")
-            if not external_id:
-                continue
-
-            existing_item = self.db.scalar(
-                select(NewsItem).where(
-                    NewsItem.external_id == external_id,
-                    NewsItem.source_id == source.id,  # type: ignore[arg-type]
-                )
+    async def save_new_async(
+        self,
+        limit: int = 50,
+    ) -> int:
+        """Fetch the feed and store entries with their descriptions, commit once."""
+        source = self._ensure_source()
+        async with AsyncFetcher(
+            headers=self.http_headers,
+        ) as fetcher:
+            feed = await fetch_feed(
+                fetcher=fetcher,
+                db=self.db,
+                source=source,
+                url=self.feed_url,
             )
+        if feed is None:
+            return 0
+        entries = parse_feed(
+            content=feed.content,
+            limit=limit,
+        )
 
-            title = item.get("title") or ""
-            link = item.get("link") or external_id or ""
-            published_at = self._parse_pub_date(
-                pub_date=item.get("pubDate"),
-            )
+        external_ids = [entry.external_id for entry in entries]
+        has_content = existing_content_flags(
+            db=self.db,
+            source_id=source.id,
+            external_ids=external_ids,
+        )
 
-            if existing_item and (not existing_item.content or len(str(existing_item.content).strip()) == 0):
-                content = self.ftr.extract(link) if link else None
-                if not content:
-                    extracted_title, content = self._extract_via_wp_api(
-                        link=link,
-                        guid=item.get("guid"),
-                    )
-                if not content:
-                    rt, rc = self._extract_via_wp_api_raw_html(link=link)
-                    if rc:
-                        content = rc
-                        if not extracted_title and rt:
-                            extracted_title = self._html_to_text(rt)
-                if not content:
-                    desc = item.get("description")
-                    if desc:
-                        try:
-                            doc = lh.fromstring(desc)
-                            text = doc.text_content().strip()
-                            content = " ".join(text.split()) if text else None
-                        except Exception:
-                            pass
-                if not content:
-                    content = f"{title}\n{link}" if title or link else None
-                if content:
-                    existing_item.content = content
-                    if extracted_title and not (existing_item.title and len(existing_item.title.strip()) > 0):
-                        existing_item.title = extracted_title
-                    self.db.commit()
+        parsed: list[ParsedItem] = []
+        for entry, external_id in zip(entries, external_ids):
+            if not external_id or has_content.get(external_id):
                 continue
+            is_known = external_id in has_content
+            title = entry.title or ""
+            link = entry.link or external_id
+            content = entry.description_text()
 
-            if existing_item:
+            if not title and not is_known:
                 continue
-
-            content = self.ftr.extract(link) if link else None
-            extracted_title, wp_content = self._extract_via_wp_api(
-                link=link,
-                guid=item.get("guid"),
-            )
-            if not content and wp_content:
-                content = wp_content
-
-            if not content and link:
-                ftr_text = self.ftr.extract(link)
-                if ftr_text and len(ftr_text) > 50:
-                    content = ftr_text
-
-            if not content:
-                raw_title_html, raw_content_html = self._extract_via_wp_api_raw_html(
-                    link=link,
-                )
-                if raw_content_html:
-                    content = raw_content_html
-                    if not extracted_title and raw_title_html:
-                        extracted_title = self._html_to_text(raw_title_html)
-            if not content:
-                desc = item.get("description")
-                if desc:
-                    try:
-                        doc = lh.fromstring(desc)
-                        text = doc.text_content().strip()
-                        content = " ".join(text.split()) if text else None
-                    except Exception:
-                        pass
-
-            final_title = (extracted_title or title or "").strip()
-            if not final_title:
+            if is_known and not content:
                 continue
 
-            if not content:
-                content = f"{title}\n{link}" if title or link else None
-
-            news_item = NewsItem(
-                source_id=source.id,  # type: ignore[arg-type]
-                external_id=external_id,
-                title=final_title,
-                content=(content or None),
-                url=link,
-                fetched_at=published_at or datetime.utcnow(),
-                is_active=True,
+            published_at = entry.published_at
+            parsed.append(
+                ParsedItem(
+                    external_id=external_id,
+                    title=title,
+                    url=link,
+                    content=content,
+                    fetched_at=published_at or datetime.utcnow(),
+                    needs_enrichment=True,
+                )
             )
-            self.db.add(news_item)
 
+        stored = upsert_items(
+            db=self.db,
+            source_id=source.id,  # type: ignore[arg-type]
+            items=parsed,
+        )
+        store_validators(
+            source=source,
+            body=feed,
+        )
         self.db.commit()
+        return stored
 
-    def _extract_via_wp_api(
+    async def prefetch(
         self,
-        link: str,
-        guid: Optional[str] = None,
-    ) -> Tuple[Optional[str], Optional[str]]:
-        """Use WordPress REST API to fetch full article content.
-
-        - If query has ?p={id} → GET /wp-json/wp/v2/posts/{id}
-        - Else try slug: /wp-json/wp/v2/posts?slug={slug}&per_page=1
-        Returns (title, plain_text_content) if found, otherwise (None, None).
-        """
-        try:
-            parsed = urlparse(link or "")
-            feed_parsed = urlparse(self.feed_url)
-            base = f"{parsed.scheme or feed_parsed.scheme}://{parsed.netloc or feed_parsed.netloc}"
-            qs = parse_qs((parsed.query or ""))
-            post_id_vals = qs.get("p")
-            if (not post_id_vals or not post_id_vals[0].isdigit()) and guid:
-                try:
-                    gparsed = urlparse(guid)
-                    gqs = parse_qs(gparsed.query or "")
-                    gpid = gqs.get("p", [None])[0]
-                    if gpid and str(gpid).isdigit():
-                        post_id_vals = [str(gpid)]
-                    elif guid.isdigit():
-                        post_id_vals = [guid]
-                except Exception:
-                    pass
-            if post_id_vals and post_id_vals[0].isdigit():
-                post_id = post_id_vals[0]
-                url = f"{base}/wp-json/wp/v2/posts/{post_id}?_fields=title,content"
-                resp = requests.get(url, headers=self.http_headers, timeout=15)
-                if resp.ok:
-                    data = resp.json()
-                    title_html = (data.get("title") or {}).get("rendered")
-                    content_html = (data.get("content") or {}).get("rendered")
-                    title = self._html_to_text(title_html) if title_html else None
-                    content = self._html_to_text(content_html) if content_html else None
-                    if content:
-                        return title, content
-
-            path_parts = [p for p in ((parsed.path or "").split("/")) if p]
-            if path_parts:
-                slug = path_parts[-1]
-                url = f"{base}/wp-json/wp/v2/posts?slug={slug}&_fields=title,content&per_page=1"
-                resp = requests.get(url, headers=self.http_headers, timeout=15)
-                if resp.ok:
-                    arr = resp.json() or []
-                    if arr:
-                        data = arr[0]
-                        title_html = (data.get("title") or {}).get("rendered")
-                        content_html = (data.get("content") or {}).get("rendered")
-                        title = self._html_to_text(title_html) if title_html else None
-                        content = self._html_to_text(content_html) if content_html else None
-                        if content:
-                            return title, content
-        except Exception:
-            pass
-        return None, None
+        fetcher: AsyncFetcher,
+        items: List[NewsItem],
+    ) -> None:
+        """Resolve the WP posts of a whole enrichment batch in a few requests."""
+        await self.wp.prefetch(
+            fetcher=fetcher,
+            refs=[
+                ref
+                for ref in (
+                    self.wp.post_ref(
+                        link=item.url,
+                        guid=item.external_id,
+                    )
+                    for item in items
+                )
+                if ref is not None
+            ],
+        )
 
-    def _extract_via_wp_api_raw_html(
+    async def enrich(
         self,
-        link: str,
+        fetcher: AsyncFetcher,
+        item: NewsItem,
     ) -> Tuple[Optional[str], Optional[str]]:
-        """Fetch raw rendered HTML via WP API (title/content.rendered).
+        """Return (extracted_title, content) trying extractor, WP API, raw WP HTML.
 
-        Returns (title_html, content_html) or (None, None).
+        The extractor and the WP API are queried together; extractor text is
+        preferred but the WP title wins. The raw rendered HTML is the last
+        resort; the stored description stays if all of them miss.
         """
-        try:
-            parsed = urlparse(link)
-            base = f"{parsed.scheme}://{parsed.netloc}"
-            qs = parse_qs(parsed.query or "")
-            post_id_vals = qs.get("p")
-            if post_id_vals and post_id_vals[0].isdigit():
-                post_id = post_id_vals[0]
-                url = f"{base}/wp-json/wp/v2/posts/{post_id}?_fields=title,content"
-                resp = requests.get(url, headers=self.http_headers, timeout=15)
-                if resp.ok:
-                    data = resp.json()
-                    title_html = (data.get("title") or {}).get("rendered")
-                    content_html = (data.get("content") or {}).get("rendered")
-                    if content_html:
-                        return title_html, content_html
-            path_parts = [p for p in (parsed.path or "").split("/") if p]
-            if path_parts:
-                slug = path_parts[-1]
-                url = f"{base}/wp-json/wp/v2/posts?slug={slug}&_fields=title,content&per_page=1"
-                resp = requests.get(url, headers=self.http_headers, timeout=15)
-                if resp.ok:
-                    arr = resp.json() or []
-                    if arr:
-                        data = arr[0]
-                        title_html = (data.get("title") or {}).get("rendered")
-                        content_html = (data.get("content") or {}).get("rendered")
-                        if content_html:
-                            return title_html, content_html
-        except Exception:
-            pass
-        return None, None
+        link = item.url or item.external_id
+        content, post = await asyncio.gather(
+            self._extract_full_text(
+                fetcher=fetcher,
+                link=link,
+            ),
+            self._wp_post(
+                fetcher=fetcher,
+                link=link,
+                guid=item.external_id,
+            ),
+        )
+        if post is None:
+            return None, content
+        extracted_title = html_to_text(post.title_html)
+        content = content or html_to_text(post.content_html) or post.content_html
+        return extracted_title, content
 
-    def _html_to_text(
+    async def _extract_full_text(
         self,
-        html_fragment: Optional[str],
+        fetcher: AsyncFetcher,
+        link: str,
     ) -> Optional[str]:
-        if not html_fragment:
+        if not link:
+            return None
+        return await self.extractor.extract_async(
+            fetcher=fetcher,
+            url=link,
+        )
+
+    async def _wp_post(
+        self,
+        fetcher: AsyncFetcher,
+        link: str,
+        guid: Optional[str] = None,
+    ) -> Optional[WordPressPost]:
+        ref = self.wp.post_ref(
+            link=link,
+            guid=guid,
+        )
+        if ref is None:
             return None
         try:
-            doc = lh.fromstring(html_fragment)
-            text = doc.text_content().strip()
-            return " ".join(text.split()) if text else None
+            return await self.wp.get_post(
+                fetcher=fetcher,
+                ref=ref,
+            )
         except Exception:
             return None
 
     def _ensure_source(self) -> Source:
-        source = self.db.query(Source).filter_by(name="TechCrunch").one_or_none()
+        source = self.db.query(Source).filter_by(name=self.source_name).one_or_none()
         if source is None:
             source = Source(
-                name="TechCrunch",
+                name=self.source_name,
+                parser_kind="techcrunch",
                 url=self.feed_url,
                 default_language="en",
                 is_active=True,
@@ -279,86 +233,3 @@ class TechCrunchParser:
             self.db.add(source)
             self.db.commit()
         return source
-
-    def _fetch_rss_items(
-        self,
-        feed_url: str,
-        limit: int,
-    ) -> list[dict]:
-        resp = requests.get(
-            url=feed_url,
-            headers=self.http_headers,
-            timeout=20,
-        )
-        resp.raise_for_status()
-        root = lh.fromstring(resp.content)
-        items = []
-        for item_el in root.xpath("//item")[:limit]:
-            ns = {
-                "content": "http://purl.org/rss/1.0/modules/content/",
-            }
-            item = {
-                "title": self._text_or_none(
-                    item_el.xpath(
-                        "string(title)",
-                    ),
-                ),
-                "link": self._text_or_none(
-                    item_el.xpath(
-                        "string(link)",
-                    ),
-                ),
-                "guid": self._text_or_none(
-                    item_el.xpath(
-                        "string(guid)",
-                    ),
-                ),
-                "pubDate": self._text_or_none(
-                    item_el.xpath(
-                        "string(pubDate)",
-                    ),
-                ),
-                # Try with namespace, then fallback to local-name
-                "content_encoded": (
-                    self._text_or_none(
-                        item_el.xpath(
-                            "string(.//content:encoded)",
-                            namespaces=ns,
-                        ),
-                    )
-                    or self._text_or_none(
-                        item_el.xpath(
-                            "string(.//*[local-name() = 'encoded' and namespace-uri() = 'http://purl.org/rss/1.0/modules/content/'])",
-                        ),
-                    )
-                ),
-                "description": self._text_or_none(
-                    item_el.xpath(
-                        "string(description)",
-                    ),
-                ),
-            }
-            items.append(item)
-        return items
-
-    def _text_or_none(
-        self,
-        value: object,
-    ) -> Optional[str]:
-        if value is None:
-            return None
-        text = str(value).strip()
-        return text if text else None
-
-
-    def _parse_pub_date(
-        self,
-        pub_date: Optional[str],
-    ) -> Optional[datetime]:
-        if not pub_date:
-            return None
-        try:
-            return parsedate_to_datetime(pub_date)
-        except Exception:
-            return None
-
@@ -0,0 +1,15 @@
+"""Premium status lookups and cache invalidation."""
+
+from app.services.premium.eligibility import (
+    PremiumStatusCache,
+    premium_cache,
+    premium_status_by_user_ids,
+)
+from app.services.premium.invalidation import publish_premium_change
+
+__all__ = [
+    "PremiumStatusCache",
+    "premium_cache",
+    "premium_status_by_user_ids",
+    "publish_premium_change",
+]
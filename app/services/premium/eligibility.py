@@ -0,0 +1,145 @@
+"""Premium eligibility lookups.
+
+- `premium_status_by_user_ids`: one query for a whole set of users (tasks).
+- `PremiumStatusCache`: TTL'd per-process cache for the bot, invalidated on
+  writes through `publish_premium_change`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import User
+from app.db.redis import get_redis
+from app.db.session import get_sync_db
+from app.services.premium.invalidation import (
+    PREMIUM_INVALIDATION_CHANNEL,
+    register_local_listener,
+)
+
+
+def premium_status_by_user_ids(
+    db: Session,
+    user_ids: Iterable[UUID],
+    now: Optional[datetime] = None,
+) -> Dict[UUID, bool]:
+    """Return {user_id: has_active_premium} for all given users in one query."""
+    ids = list(user_ids)
+    if not ids:
+        return {}
+    moment = now or datetime.utcnow()
+    rows = db.execute(
+        select(
+            User.id,
+            User.premium_until,
+        ).where(
+            User.id.in_(ids),
+        )
+    ).all()
+    status = {user_id: False for user_id in ids}
+    for row in rows:
+        status[row.id] = bool(row.premium_until and row.premium_until > moment)
+    return status
+
+
+class PremiumStatusCache:
+    """Per-process cache of `premium_until` keyed by Telegram id.
+
+    The expiry timestamp is cached rather than a boolean, so a subscription
+    lapsing inside the TTL is still reported correctly.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Optional[datetime]]] = {}
+        self._lock = threading.Lock()
+        self._listener_started = False
+        register_local_listener(
+            self.invalidate,
+        )
+
+    def has_active_premium(
+        self,
+        telegram_id: str,
+    ) -> bool:
+        until = self._premium_until(
+            telegram_id=str(telegram_id),
+        )
+        return until is not None and until > datetime.utcnow()
+
+    def invalidate(
+        self,
+        telegram_id: str,
+    ) -> None:
+        with self._lock:
+            self._entries.pop(str(telegram_id), None)
+
+    def _premium_until(
+        self,
+        telegram_id: str,
+    ) -> Optional[datetime]:
+        self._ensure_listener()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(telegram_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        db = get_sync_db()
+        try:
+            until = db.scalar(
+                select(User.premium_until).where(
+                    User.telegram_id == telegram_id,
+                )
+            )
+        finally:
+            db.close()
+        with self._lock:
+            self._entries[telegram_id] = (now + self.ttl_seconds, until)
+        return until
+
+    def _ensure_listener(
+        self,
+    ) -> None:
+        if self._listener_started:
+            return
+        self._listener_started = True
+        try:
+            pubsub = get_redis().pubsub(
+                ignore_subscribe_messages=True,
+            )
+            pubsub.subscribe(
+                **{PREMIUM_INVALIDATION_CHANNEL: self._on_message},
+            )
+            pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+            )
+        except Exception:
+            logging.getLogger(__name__).exception(
+                "premium_invalidation_subscribe_failed",
+            )
+
+    def _on_message(
+        self,
+        message: dict,
+    ) -> None:
+        data = message.get("data")
+        if data:
+            self.invalidate(
+                telegram_id=str(data),
+            )
+
+
+premium_cache = PremiumStatusCache()
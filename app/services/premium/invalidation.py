@@ -0,0 +1,42 @@
+"""Cross-process invalidation of cached premium status.
+
+Writers call `publish_premium_change` after committing a premium change. The
+change is applied to in-process caches immediately and broadcast on a Redis
+pub/sub channel so caches in other processes (bot, workers) drop the entry.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, List
+
+from app.db.redis import get_redis
+
+PREMIUM_INVALIDATION_CHANNEL: str = "premium:invalidate"
+
+_local_listeners: List[Callable[[str], None]] = []
+
+
+def register_local_listener(
+    callback: Callable[[str], None],
+) -> None:
+    """Register an in-process callback receiving invalidated telegram ids."""
+    _local_listeners.append(callback)
+
+
+def publish_premium_change(
+    telegram_id: str,
+) -> None:
+    for callback in _local_listeners:
+        callback(telegram_id)
+    try:
+        get_redis().publish(
+            PREMIUM_INVALIDATION_CHANNEL,
+            telegram_id,
+        )
+    except Exception:
+        # Other processes fall back to their cache TTL.
+        logging.getLogger(__name__).exception(
+            "premium_invalidation_publish_failed",
+            extra={"telegram_id": telegram_id},
+        )
@@ -0,0 +1,17 @@
+"""Telegram delivery helpers shared by Celery tasks."""
+
+from app.services.telegram.sender import (
+    OutgoingMessage,
+    SendResult,
+    TelegramSender,
+    TokenBucket,
+)
+from app.services.telegram.rate_limit import SharedRateLimiter
+
+__all__ = [
+    "OutgoingMessage",
+    "SendResult",
+    "SharedRateLimiter",
+    "TelegramSender",
+    "TokenBucket",
+]
@@ -0,0 +1,115 @@
+"""Bot-wide send rate shared by all delivery processes via Redis.
+
+Telegram's flood limit counts every message of a bot, whichever worker
+process sends it, so the global rate cannot live in process memory. One
+key per bot (`telegram:rate:{name}`) holds the theoretical arrival time of
+the next message (GCRA), advanced atomically by a Lua script on the Redis
+clock, which spaces sends `1 / rate_per_second` apart across processes. A
+RetryAfter from Telegram sets `telegram:rate:{name}:pause`, holding every
+process. Redis errors fall back to a per-process token bucket.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+
+from app.db.redis import get_redis
+from app.services.telegram.sender import TokenBucket
+
+_ACQUIRE_SCRIPT = """
+local pause = redis.call('PTTL', KEYS[2])
+if pause > 0 then
+  return pause
+end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then
+  tat = now
+end
+local allowed_at = tat - tonumber(ARGV[2])
+if now < allowed_at then
+  return allowed_at - now
+end
+redis.call('SET', KEYS[1], tat + interval, 'PX', tat + interval - now + 1000)
+return 0
+"""
+
+
+class SharedRateLimiter:
+    """Drop-in for the sender's global `TokenBucket`, shared across processes."""
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float,
+        burst: int = 1,
+        prefix: str = "telegram:rate",
+    ) -> None:
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1)
+        self.prefix = prefix
+        self._script = None
+        self._local = TokenBucket(
+            rate=rate_per_second,
+            capacity=float(self.burst),
+        )
+
+    def try_acquire(
+        self,
+    ) -> float:
+        """Take one send slot; return 0, or seconds to wait before retrying.
+
+        Raises RedisError; `acquire` handles the fallback.
+        """
+        interval_ms = max(int(1000 / self.rate_per_second), 1)
+        if self._script is None:
+            self._script = get_redis().register_script(_ACQUIRE_SCRIPT)
+        wait_ms = self._script(
+            keys=[
+                f"{self.prefix}:{self.name}",
+                f"{self.prefix}:{self.name}:pause",
+            ],
+            args=[
+                interval_ms,
+                interval_ms * (self.burst - 1),
+            ],
+        )
+        return int(wait_ms or 0) / 1000
+
+    async def acquire(
+        self,
+    ) -> None:
+        while True:
+            try:
+                wait = self.try_acquire()
+            except RedisError as e:
+                logging.getLogger(__name__).warning(
+                    "telegram_rate_unavailable",
+                    extra={"error": str(e)},
+                )
+                await self._local.acquire()
+                return
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(
+        self,
+        seconds: float,
+    ) -> None:
+        """Hold every process's sends for `seconds` (Telegram's retry_after)."""
+        self._local.pause(seconds)
+        try:
+            get_redis().set(
+                f"{self.prefix}:{self.name}:pause",
+                "1",
+                px=max(int(seconds * 1000), 1),
+            )
+        except RedisError:
+            pass
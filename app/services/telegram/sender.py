@@ -0,0 +1,289 @@
+"""Concurrent, rate-limit-aware Telegram message sender.
+
+Messages for the same chat are sent in order; different chats are served
+concurrently up to `max_concurrency`. Two limits gate every attempt: a
+global one and one per chat. A 429 from Telegram pauses the global limit
+for its `retry_after`, so every chat backs off, not just the one that hit
+the limit. The default global limit is a `TokenBucket` in this process;
+workers pass a `SharedRateLimiter` so the rate and the pause hold for the
+whole bot across processes. Per-chat buckets are kept
+in an LRU capped at `max_chat_buckets`; idle ones are dropped once full
+again, since a full bucket is the same as a new one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError,
+)
+
+
+@dataclass
+class OutgoingMessage:
+    """A message to deliver; `ref` is opaque caller data echoed in the result."""
+
+    chat_id: str
+    text: str
+    disable_notification: bool = False
+    reply_markup: Any = None
+    ref: Any = None
+
+
+@dataclass
+class SendResult:
+    message: OutgoingMessage
+    ok: bool
+    message_id: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(
+        self,
+    ) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(
+                        self._paused_until - now,
+                    )
+                    continue
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep(
+                    (1 - self._tokens) / self.rate,
+                )
+
+    def pause(
+        self,
+        seconds: float,
+    ) -> None:
+        """Hand out no tokens for `seconds`, then refill from empty."""
+        now = time.monotonic()
+        self._paused_until = max(
+            self._paused_until,
+            now + seconds,
+        )
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+    def is_idle(
+        self,
+        now: float,
+    ) -> bool:
+        """True once the bucket has refilled completely and is not paused."""
+        return (
+            now >= self._paused_until
+            and not self._lock.locked()
+            and self._tokens + (now - self._updated) * self.rate >= self.capacity
+        )
+
+
+class TelegramSender:
+    """Send many messages through one `Bot` with bounded concurrency."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        max_concurrency: int = 20,
+        global_rate_per_second: float = 25.0,
+        per_chat_rate_per_second: float = 1.0,
+        max_attempts: int = 4,
+        base_backoff_seconds: float = 0.5,
+        max_chat_buckets: int = 10_000,
+        global_limiter: Any = None,
+    ) -> None:
+        """`global_limiter`: anything with async `acquire()` and `pause(seconds)`."""
+        self.bot = bot
+        self.max_concurrency = max_concurrency
+        self.per_chat_rate_per_second = per_chat_rate_per_second
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self._global_bucket = global_limiter or TokenBucket(
+            rate=global_rate_per_second,
+        )
+        self.max_chat_buckets = max_chat_buckets
+        self._chat_buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    async def send_many(
+        self,
+        messages: List[OutgoingMessage],
+    ) -> List[SendResult]:
+        """Send all messages and return one result per message, in input order."""
+        results: List[Optional[SendResult]] = [None] * len(messages)
+        by_chat: Dict[str, List[int]] = {}
+        for idx, message in enumerate(messages):
+            by_chat.setdefault(
+                str(message.chat_id),
+                [],
+            ).append(idx)
+
+        semaphore = asyncio.Semaphore(
+            self.max_concurrency,
+        )
+
+        async def _run_chat(
+            indexes: List[int],
+        ) -> None:
+            async with semaphore:
+                for idx in indexes:
+                    results[idx] = await self._send_one(
+                        message=messages[idx],
+                    )
+
+        await asyncio.gather(
+            *(
+                _run_chat(
+                    indexes=indexes,
+                )
+                for indexes in by_chat.values()
+            )
+        )
+        return [r for r in results if r is not None]
+
+    async def _send_one(
+        self,
+        message: OutgoingMessage,
+    ) -> SendResult:
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._chat_bucket(
+                chat_id=str(message.chat_id),
+            ).acquire()
+            await self._global_bucket.acquire()
+            try:
+                sent = await self.bot.send_message(
+                    chat_id=_chat_id_value(
+                        chat_id=message.chat_id,
+                    ),
+                    text=message.text,
+                    disable_notification=message.disable_notification,
+                    disable_web_page_preview=True,
+                    reply_markup=message.reply_markup,
+                )
+                return SendResult(
+                    message=message,
+                    ok=True,
+                    message_id=sent.message_id,
+                    attempts=attempt,
+                )
+            except TelegramRetryAfter as e:
+                # The flood limit is bot-wide: hold every chat, not just this one.
+                self._global_bucket.pause(
+                    e.retry_after,
+                )
+                if attempt >= self.max_attempts:
+                    return self._failed(
+                        message=message,
+                        error=e,
+                        attempts=attempt,
+                    )
+            except (TelegramNetworkError, TelegramServerError) as e:
+                if attempt >= self.max_attempts:
+                    return self._failed(
+                        message=message,
+                        error=e,
+                        attempts=attempt,
+                    )
+                backoff = self.base_backoff_seconds * (2 ** (attempt - 1))
+                await asyncio.sleep(
+                    backoff + random.uniform(0, backoff / 2),
+                )
+            except Exception as e:
+                return self._failed(
+                    message=message,
+                    error=e,
+                    attempts=attempt,
+                )
+
+    def _chat_bucket(
+        self,
+        chat_id: str,
+    ) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(
+                rate=self.per_chat_rate_per_second,
+                capacity=1.0,
+            )
+            self._chat_buckets[chat_id] = bucket
+            self._evict_chat_buckets()
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    def _evict_chat_buckets(
+        self,
+    ) -> None:
+        """Drop idle buckets from the LRU end, and the oldest past the cap."""
+        now = time.monotonic()
+        while len(self._chat_buckets) > 1:
+            chat_id, oldest = next(iter(self._chat_buckets.items()))
+            if len(self._chat_buckets) <= self.max_chat_buckets and not oldest.is_idle(
+                now=now,
+            ):
+                break
+            del self._chat_buckets[chat_id]
+
+    def _failed(
+        self,
+        message: OutgoingMessage,
+        error: Exception,
+        attempts: int,
+    ) -> SendResult:
+        logging.getLogger(__name__).warning(
+            "send_message_failed",
+            extra={
+                "chat_id": message.chat_id,
+                "attempts": attempts,
+                "error": str(error),
+            },
+        )
+        return SendResult(
+            message=message,
+            ok=False,
+            error=str(error),
+            attempts=attempts,
+        )
+
+
+def _chat_id_value(
+    chat_id: str,
+) -> int | str:
+    if isinstance(chat_id, str) and chat_id.lstrip("-").isdigit():
+        return int(chat_id)
+    return chat_id
@@ -1,22 +1,20 @@
 from __future__ import annotations
 
-import asyncio
-import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
 import logging
+import uuid
 
-from aiogram import Bot
-from aiogram.client.bot import DefaultBotProperties
+from aiogram.types import InlineKeyboardMarkup
+from redis.exceptions import LockError
+from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import joinedload
 
+from app.db.redis import get_redis
 from app.db.session import SessionLocalSync
-from app.services.parsers.hackernews import HackerNewsParser
-from app.services.parsers.techcrunch import TechCrunchParser
-from app.services.parsers.generic_rss import GenericRssParser
+from app.services.parsers.enrichment import enrich_items
+from app.services.parsers.registry import build_parser
 from app.worker.celery_app import celery_app
-from app.db.session import SessionLocalSync
 from app.db.models import (
     NewsItem,
     Subscription,
@@ -28,161 +26,400 @@ from app.db.models import (
 )
 from app.repositories import users as users_repo
 from app.repositories import subscriptions as subscriptions_repo
+from app.repositories import delivery_cursors as delivery_cursors_repo
+from app.repositories import digests as digests_repo
+from app.repositories import eligible_sources as eligible_sources_repo
+from app.repositories import source_schedule as source_schedule_repo
+from app.repositories import news_enrichment as news_enrichment_repo
+from app.repositories import summary_cache as summary_cache_repo
 from bot.texts import PREMIUM_EXPIRED_MULTIPLE_SOURCES_TEXT
 from bot.keyboards.builders import build_paywall_keyboard_with_keep_options
+from app.services.extractors.cache import extraction_cache
 from app.services.i18n.translator import TranslatorService
+from app.services.ingestion import compute_content_hash, run_sync, schedule_next_poll
 from app.config import get_settings
-from app.services.agents import SummarizerAgent, SummarizeInput
+from app.services.agents import SummarizeInput, SummarizerBackend, SummarizerRouter
+from app.services.dispatch import (
+    DispatchPlanner,
+    render_cache,
+    request_source_dispatch,
+    shard_clause,
+)
+from app.services.premium import premium_status_by_user_ids
+from app.services.telegram import OutgoingMessage, SendResult
+from app.worker import telegram as telegram_runtime
 
 PREMIUM_EXPIRED_NOTICE_URL = "premium://expired-notice"
 
 
 @celery_app.task(ignore_result=True)
-def parse_hackernews(
-    limit: int = 50,
-):
+def ingest_due_sources(
+    limit: Optional[int] = None,
+) -> int:
+    """Fan out one `ingest_source` task per enabled source that is due.
+
+    Reads the registry from `sources` on every tick, so added, disabled or
+    re-timed sources take effect without a worker restart.
+    """
+    settings = get_settings()
     db = SessionLocalSync()
     try:
-        parser = HackerNewsParser(
+        source_ids = source_schedule_repo.claim_due_sources(
             db=db,
+            limit=limit or settings.ingest_fanout_limit,
         )
-        parser.save_new_sync(
-            limit=limit,
-        )
+        db.commit()
     finally:
         db.close()
-
-
-@celery_app.task(ignore_result=True)
-def parse_techcrunch(
-    limit: int = 50,
-):
-    db = SessionLocalSync()
-    try:
-        parser = TechCrunchParser(
-            db=db,
+    for source_id in source_ids:
+        ingest_source.delay(
+            source_id=str(source_id),
         )
-        parser.save_new_sync(
-            limit=limit,
+    if source_ids:
+        logging.getLogger(__name__).info(
+            "ingest_sources_fanned_out",
+            extra={"sources": len(source_ids)},
         )
-    finally:
-        db.close()
+    return len(source_ids)
 
 
 @celery_app.task(ignore_result=True)
-def parse_theverge(
+def ingest_source(
+    source_id: str,
     limit: int = 50,
-):
+) -> None:
+    """Run the registered parser for one source; skipped if already running.
+
+    On success the next poll is rescheduled adaptively; on failure the
+    source keeps the fixed-interval slot set when it was claimed.
+    """
+    settings = get_settings()
+    lock = get_redis().lock(
+        f"ingest:source:{source_id}",
+        timeout=settings.ingest_source_lock_seconds,
+    )
+    if not lock.acquire(blocking=False):
+        logging.getLogger(__name__).info(
+            "ingest_source_locked",
+            extra={"source_id": source_id},
+        )
+        return
     db = SessionLocalSync()
     try:
-        parser = GenericRssParser(
+        source = db.get(
+            Source,
+            uuid.UUID(source_id),
+        )
+        if source is None or not source.ingest_enabled:
+            return
+        parser = build_parser(
             db=db,
-            source_name="The Verge",
-            feed_url="https://www.theverge.com/rss/index.xml",
-            default_language="en",
+            source=source,
         )
-        parser.save_new_sync(
+        stored = parser.save_new_sync(
             limit=limit,
         )
-    finally:
-        db.close()
-
-
-@celery_app.task(ignore_result=True)
-def parse_engadget(
-    limit: int = 50,
-):
-    db = SessionLocalSync()
-    try:
-        parser = GenericRssParser(
+        schedule_next_poll(
             db=db,
-            source_name="Engadget",
-            feed_url="https://www.engadget.com/rss.xml",
-            default_language="en",
+            source=source,
+            new_items=stored or 0,
         )
-        parser.save_new_sync(
-            limit=limit,
+        db.commit()
+        logging.getLogger(__name__).info(
+            "ingest_source_finished",
+            extra={
+                "source_id": source_id,
+                "stored": stored,
+            },
         )
+        if stored:
+            enrich_pending_items.delay()
     finally:
         db.close()
+        try:
+            lock.release()
+        except LockError:
+            pass
 
 
 @celery_app.task(ignore_result=True)
-def parse_wired(
-    limit: int = 50,
-):
+def enrich_pending_items(
+    batch_size: Optional[int] = None,
+) -> None:
+    """Fetch full text for one batch of items inserted PENDING by the parsers.
+
+    Runs on the `extraction` queue; rows are claimed with SKIP LOCKED so
+    concurrent runs split the backlog.
+    """
+    settings = get_settings()
     db = SessionLocalSync()
     try:
-        parser = GenericRssParser(
+        items = news_enrichment_repo.claim_pending(
             db=db,
-            source_name="WIRED",
-            feed_url="https://www.wired.com/feed/rss",
-            default_language="en",
+            limit=batch_size or settings.enrichment_batch_size,
         )
-        parser.save_new_sync(
-            limit=limit,
+        if not items:
+            db.rollback()
+            return
+        counts = enrich_items(
+            db=db,
+            items=items,
+        )
+        db.commit()
+        logging.getLogger(__name__).info(
+            "enrich_batch_finished",
+            extra={
+                "claimed": len(items),
+                **counts,
+                **extraction_cache.stats(),
+            },
         )
+        extraction_cache.reset_stats()
     finally:
         db.close()
 
+
 @celery_app.task(ignore_result=True)
 def summarize_fresh_news(
     limit: int = 200,
 ):
+    """Summarize ready items concurrently, committing every few results.
+
+    Overlapping runs are skipped, and a run that dies midway keeps what it
+    already committed.
+    """
+    settings = get_settings()
+    lock = get_redis().lock(
+        "summarize:fresh",
+        timeout=settings.summarize_lock_seconds,
+    )
+    if not lock.acquire(blocking=False):
+        logging.getLogger(__name__).info(
+            "summarize_locked",
+        )
+        return
     db = SessionLocalSync()
     try:
-        agent = SummarizerAgent()
-        users_all: List[User] = (
-            db.query(User)
-            .filter(User.telegram_id.is_not(None))
-            .all()
+        summarizer = SummarizerRouter()
+        eligible_source_ids = eligible_sources_repo.list_eligible_source_ids(
+            db=db,
         )
-        eligible_source_ids: set = set()
-        for u in users_all:
-            subs_u: List[Subscription] = (
-                db.query(Subscription)
-                .filter(
-                    Subscription.user_id == u.id,
-                    Subscription.is_active.is_(True),
-                )
-                .all()
-            )
-            if not subs_u:
-                continue
-            is_eligible = users_repo.has_active_premium(
-                telegram_id=str(u.telegram_id),
-            ) or len(subs_u) <= 1
-            if not is_eligible:
-                continue
-            for s in subs_u:
-                eligible_source_ids.add(s.source_id)
+        if not eligible_source_ids:
+            return
         items = (
             db.query(NewsItem)
-            .filter(NewsItem.summary.is_(None))
+            .filter(
+                # Fallback summaries wait until the preferred backend is back.
+                summary_cache_repo.needs_summary(
+                    redo_provisional=not summarizer.degraded(),
+                    max_fallback_attempts=settings.summarize_max_fallback_attempts,
+                ),
+                NewsItem.source_id.in_(eligible_source_ids),
+                # Wait for full text unless enrichment is overdue.
+                news_enrichment_repo.ready_for_summary(
+                    now=datetime.utcnow(),
+                    deadline_seconds=settings.enrichment_deadline_seconds,
+                ),
+            )
             .order_by(NewsItem.created_at.desc())
             .limit(limit)
             .all()
         )
+        ready: List[NewsItem] = []
+        by_hash: Dict[str, List[NewsItem]] = {}
         for ni in items:
-            if ni.source_id not in eligible_source_ids:
-                continue
+            if ni.content_hash is None:
+                ni.content_hash = compute_content_hash(
+                    content=ni.content,
+                )
             if not ni.content or len(ni.content.strip()) < 40:
                 ni.summary = f"{ni.title}\n{ni.url}"
+                # None without text: redone once enrichment stores content.
+                ni.summary_content_hash = ni.content_hash
+                ready.append(ni)
                 continue
-            summary = agent.summarize(
-                payload=SummarizeInput(
-                    title=ni.title,
-                    content=ni.content,
-                    url=ni.url,
+            by_hash.setdefault(ni.content_hash, []).append(ni)
+
+        backends = _pick_backends(
+            db=db,
+            summarizer=summarizer,
+            items_by_hash=by_hash,
+        )
+        # Duplicates and re-ingested copies reuse an earlier summary.
+        cached: Dict[str, str] = {}
+        for backend in {id(b): b for b in backends.values()}.values():
+            cached.update(
+                summary_cache_repo.get_many(
+                    db=db,
+                    content_hashes=[
+                        content_hash
+                        for content_hash, picked in backends.items()
+                        if picked is backend
+                    ],
+                    model=backend.model,
+                    prompt_version=backend.prompt_version,
+                )
+            )
+        for content_hash, summary in cached.items():
+            for ni in by_hash.pop(content_hash):
+                ni.summary = summary
+                ni.summary_content_hash = content_hash
+                ni.summary_attempts = 0
+                ready.append(ni)
+        _commit_summaries(
+            db=db,
+            items=ready,
+        )
+        logging.getLogger(__name__).info(
+            "summarize_planned",
+            extra={
+                "items": len(items),
+                "cache_hits": len(cached),
+                "calls": len(by_hash),
+                "local_calls": sum(
+                    1
+                    for content_hash in by_hash
+                    if backends[content_hash] is summarizer.fallback
                 ),
-                max_output_tokens=384,
-                temperature=0.1,
-                seed=42,
+            },
+        )
+        if by_hash:
+            run_sync(
+                _summarize_concurrently(
+                    db=db,
+                    summarizer=summarizer,
+                    items_by_hash=by_hash,
+                    backends=backends,
+                )
             )
-            ni.summary = summary
-        db.commit()
     finally:
         db.close()
+        try:
+            lock.release()
+        except LockError:
+            pass
+
+
+def _pick_backends(
+    db,
+    summarizer: SummarizerRouter,
+    items_by_hash: Dict[str, List[NewsItem]],
+) -> Dict[str, SummarizerBackend]:
+    """Premium backend for content any premium subscriber receives, else free tier."""
+    premium = summarizer.backend_for(
+        premium=True,
+    )
+    free_tier = summarizer.backend_for(
+        premium=False,
+    )
+    if premium is free_tier:
+        return {content_hash: premium for content_hash in items_by_hash}
+    premium_sources = eligible_sources_repo.premium_source_ids(
+        db=db,
+        source_ids={
+            ni.source_id
+            for group in items_by_hash.values()
+            for ni in group
+        },
+    )
+    return {
+        content_hash: (
+            premium
+            if any(ni.source_id in premium_sources for ni in group)
+            else free_tier
+        )
+        for content_hash, group in items_by_hash.items()
+    }
+
+
+async def _summarize_concurrently(
+    db,
+    summarizer: SummarizerRouter,
+    items_by_hash: Dict[str, List[NewsItem]],
+    backends: Dict[str, SummarizerBackend],
+) -> None:
+    """One call per distinct content hash; results go to the summary cache."""
+    settings = get_settings()
+    done: List[NewsItem] = []
+    failed = 0
+    fallback = 0
+    async for content_hash, result in summarizer.summarize_many(
+        payloads={
+            content_hash: SummarizeInput(
+                title=group[0].title,
+                content=group[0].content,
+                url=group[0].url,
+            )
+            for content_hash, group in items_by_hash.items()
+        },
+        backends=backends,
+        concurrency=settings.summarize_concurrency,
+        max_output_tokens=384,
+        temperature=0.1,
+        seed=42,
+    ):
+        if result is None:
+            # Left unsummarized; the next run retries it.
+            failed += 1
+            continue
+        fallback += int(result.fallback)
+        # Keyed by the backend that produced it, which may be the fallback.
+        summary_cache_repo.put(
+            db=db,
+            content_hash=content_hash,
+            model=result.model,
+            prompt_version=result.prompt_version,
+            summary=result.text,
+        )
+        for ni in items_by_hash[content_hash]:
+            ni.summary = result.text
+            # A fallback summary stays provisional and is redone later, a
+            # bounded number of times.
+            ni.summary_content_hash = None if result.fallback else content_hash
+            ni.summary_attempts = (
+                (ni.summary_attempts or 0) + 1
+                if result.fallback
+                else 0
+            )
+            done.append(ni)
+        if len(done) >= settings.summarize_commit_every:
+            _commit_summaries(
+                db=db,
+                items=done,
+            )
+            done = []
+    _commit_summaries(
+        db=db,
+        items=done,
+    )
+    logging.getLogger(__name__).info(
+        "summarize_finished",
+        extra={
+            "requested": len(items_by_hash),
+            "failed": failed,
+            "fallback": fallback,
+        },
+    )
+
+
+def _commit_summaries(
+    db,
+    items: List[NewsItem],
+) -> None:
+    """Commit summaries written so far and wake dispatch for their sources.
+
+    `summarized_at` is stamped just before the commit: delivery cursors are
+    keyed on it, so it should not run ahead of when the summary is visible.
+    """
+    if not items:
+        return
+    now = datetime.utcnow()
+    for ni in items:
+        ni.summarized_at = now
+    db.commit()
+    request_source_dispatch(
+        source_ids=[ni.source_id for ni in items],
+    )
 
 
 @celery_app.task(ignore_result=True)
@@ -198,34 +435,18 @@ def translate_needed_summaries(
             timeout_seconds=10,
             provider_name="libretranslate",
         )
-        users_all: List[User] = (
-            db.query(User)
-            .filter(User.telegram_id.is_not(None))
-            .all()
+        by_source_lang = eligible_sources_repo.languages_by_source(
+            db=db,
         )
-        by_source_lang = {}
-        for u in users_all:
-            subs_u: List[Subscription] = (
-                db.query(Subscription)
-                .filter(
-                    Subscription.user_id == u.id,
-                    Subscription.is_active.is_(True),
-                )
-                .all()
-            )
-            if not subs_u:
-                continue
-            is_eligible = users_repo.has_active_premium(
-                telegram_id=str(u.telegram_id),
-            ) or len(subs_u) <= 1
-            if not is_eligible:
-                continue
-            for s in subs_u:
-                by_source_lang.setdefault(s.source_id, set()).add(s.language)
+        if not by_source_lang:
+            return
 
         items = (
             db.query(NewsItem)
-            .filter(NewsItem.summary.is_not(None))
+            .filter(
+                NewsItem.summary.is_not(None),
+                NewsItem.source_id.in_(list(by_source_lang.keys())),
+            )
             .order_by(NewsItem.created_at.desc())
             .limit(limit)
             .all()
@@ -243,11 +464,24 @@ def translate_needed_summaries(
         db.close()
 
 
+@celery_app.task(ignore_result=True)
+def refresh_eligible_sources() -> int:
+    """Full refresh of `eligible_source_languages` (safety net for expiries)."""
+    db = SessionLocalSync()
+    try:
+        pairs = eligible_sources_repo.refresh_all(
+            db=db,
+        )
+        db.commit()
+        return pairs
+    finally:
+        db.close()
+
+
 @celery_app.task(ignore_result=True)
 def notify_premium_expired(
     lookback_minutes: int = 1440,
 ) -> None:
-    settings = get_settings()
     db = SessionLocalSync()
     try:
         now = datetime.utcnow()
@@ -264,88 +498,88 @@ def notify_premium_expired(
         )
         if not users:
             return
-        bot = Bot(
-            token=settings.telegram_bot_token,
-            default=DefaultBotProperties(
-                parse_mode="HTML",
+        eligible_sources_repo.refresh_for_sources(
+            db=db,
+            source_ids=(
+                db.scalars(
+                    select(Subscription.source_id).where(
+                        Subscription.user_id.in_([u.id for u in users]),
+                    )
+                ).all()
             ),
         )
-        try:
-            for u in users:
-                active_subs = (
-                    db.query(Subscription)
-                    .filter(
-                        Subscription.user_id == u.id,
-                        Subscription.is_active.is_(True),
-                    )
-                    .all()
-                )
-                if len(active_subs) <= 1:
-                    continue
-                already = (
-                    db.query(Digest)
-                    .filter(
-                        Digest.user_id == u.id,
-                        Digest.url == PREMIUM_EXPIRED_NOTICE_URL,
-                        Digest.status == DigestStatus.SENT,
-                        Digest.sent_at >= window_start,
-                    )
-                    .first()
-                )
-                if already:
-                    continue
-                # Build keyboard options by names
-                source_ids = [sub.source_id for sub in active_subs]
-                srcs = (
-                    db.query(Source)
-                    .filter(Source.id.in_(source_ids))
-                    .all()
+        db.commit()
+        bot = telegram_runtime.get_bot()
+        for u in users:
+            active_subs = (
+                db.query(Subscription)
+                .filter(
+                    Subscription.user_id == u.id,
+                    Subscription.is_active.is_(True),
                 )
-                options = [
-                    (s.name, str(s.id))
-                    for s in srcs
-                ]
-                kb = build_paywall_keyboard_with_keep_options(
-                    options=options,
+                .all()
+            )
+            if len(active_subs) <= 1:
+                continue
+            already = (
+                db.query(Digest)
+                .filter(
+                    Digest.user_id == u.id,
+                    Digest.url == PREMIUM_EXPIRED_NOTICE_URL,
+                    Digest.status == DigestStatus.SENT,
+                    Digest.sent_at >= window_start,
                 )
-                async def _send_once():
-                    await bot.send_message(
+                .first()
+            )
+            if already:
+                continue
+            # Build keyboard options by names
+            source_ids = [sub.source_id for sub in active_subs]
+            srcs = (
+                db.query(Source)
+                .filter(Source.id.in_(source_ids))
+                .all()
+            )
+            options = [
+                (s.name, str(s.id))
+                for s in srcs
+            ]
+            kb = build_paywall_keyboard_with_keep_options(
+                options=options,
+            )
+            try:
+                sent = telegram_runtime.run(
+                    bot.send_message(
                         chat_id=int(u.telegram_id) if u.telegram_id.isdigit() else u.telegram_id,
                         text=PREMIUM_EXPIRED_MULTIPLE_SOURCES_TEXT,
                         disable_notification=False,
                         disable_web_page_preview=True,
                         reply_markup=kb.as_markup(),
+                    ),
+                )
+                db.add(
+                    Digest(
+                        user_id=u.id,
+                        subscription_id=active_subs[0].id,
+                        title="Premium expired",
+                        summary="",
+                        url=PREMIUM_EXPIRED_NOTICE_URL,
+                        scheduled_for=now,
+                        sent_at=now,
+                        status=DigestStatus.SENT,
+                        telegram_message_id=sent.message_id,
                     )
-                try:
-                    asyncio.run(_send_once())
-                    db.add(
-                        Digest(
-                            user_id=u.id,
-                            subscription_id=active_subs[0].id,
-                            title="Premium expired",
-                            summary="",
-                            url=PREMIUM_EXPIRED_NOTICE_URL,
-                            scheduled_for=now,
-                            sent_at=now,
-                            status=DigestStatus.SENT,
-                        )
-                    )
-                    db.commit()
-                except Exception as e:
-                    logging.getLogger(__name__).exception(
-                        "notify_premium_expired_send_failed",
-                        extra={"user": u.telegram_id, "error": str(e)},
-                    )
-        finally:
-            async def _close():
-                await bot.session.close()
-            try:
-                asyncio.run(_close())
-            except Exception:
-                pass
+                )
+                db.commit()
+            except Exception as e:
+                logging.getLogger(__name__).exception(
+                    "notify_premium_expired_send_failed",
+                    extra={"user": u.telegram_id, "error": str(e)},
+                )
     finally:
         db.close()
 
+
 @celery_app.task(ignore_result=True)
 def dispatch_news_updates(
     window_minutes: int = 5,
@@ -354,404 +588,815 @@ def dispatch_news_updates(
     max_backlog_hours: int = 48,
     max_messages_per_chat_per_run: int = 3,
     batch_threshold: int = 3,
+    use_planner: bool = True,
 ):
-    """Send fresh news per subscription with cursor-based delivery.
+    """Queue fresh news per subscription with cursor-based delivery.
+
+    With `use_planner` the send plan is computed by `DispatchPlanner` in a
+    few set-based queries; otherwise the per-subscription loop is used.
+    Messages are written to the digest outbox and delivered by
+    `send_pending_digests`.
+    """
+    _run_dispatch(
+        shard_index=None,
+        shard_count=None,
+        source_ids=None,
+        max_items_per_subscription=max_items_per_subscription,
+        fallback_to_en_if_missing=fallback_to_en_if_missing,
+        max_backlog_hours=max_backlog_hours,
+        max_messages_per_chat_per_run=max_messages_per_chat_per_run,
+        batch_threshold=batch_threshold,
+        use_planner=use_planner,
+    )
+
+
+@celery_app.task(ignore_result=True)
+def dispatch_news_updates_sharded(
+    shard_count: Optional[int] = None,
+    max_items_per_subscription: int = 5,
+    fallback_to_en_if_missing: bool = False,
+    max_backlog_hours: int = 48,
+    max_messages_per_chat_per_run: int = 3,
+    batch_threshold: int = 3,
+    use_planner: bool = True,
+) -> None:
+    """Coordinator: fan out one `dispatch_news_shard` task per user shard."""
+    count = shard_count or get_settings().dispatch_shard_count
+    for shard_index in range(count):
+        dispatch_news_shard.delay(
+            shard_index=shard_index,
+            shard_count=count,
+            max_items_per_subscription=max_items_per_subscription,
+            fallback_to_en_if_missing=fallback_to_en_if_missing,
+            max_backlog_hours=max_backlog_hours,
+            max_messages_per_chat_per_run=max_messages_per_chat_per_run,
+            batch_threshold=batch_threshold,
+            use_planner=use_planner,
+        )
+
+
+@celery_app.task(ignore_result=True)
+def dispatch_source_updates(
+    source_ids: List[str],
+    max_items_per_subscription: int = 5,
+    fallback_to_en_if_missing: bool = False,
+    max_backlog_hours: int = 48,
+    max_messages_per_chat_per_run: int = 3,
+) -> None:
+    """Targeted dispatch for subscriptions of `source_ids` only.
+
+    Enqueued by `request_source_dispatch` once items become deliverable. Runs
+    through the shard tasks so it never overlaps a sweeper run for the same
+    users.
+    """
+    count = get_settings().dispatch_shard_count
+    for shard_index in range(count):
+        dispatch_news_shard.delay(
+            shard_index=shard_index,
+            shard_count=count,
+            max_items_per_subscription=max_items_per_subscription,
+            fallback_to_en_if_missing=fallback_to_en_if_missing,
+            max_backlog_hours=max_backlog_hours,
+            max_messages_per_chat_per_run=max_messages_per_chat_per_run,
+            source_ids=source_ids,
+        )
+
+
+@celery_app.task(ignore_result=True)
+def dispatch_news_shard(
+    shard_index: int,
+    shard_count: int,
+    max_items_per_subscription: int = 5,
+    fallback_to_en_if_missing: bool = False,
+    max_backlog_hours: int = 48,
+    max_messages_per_chat_per_run: int = 3,
+    batch_threshold: int = 3,
+    use_planner: bool = True,
+    source_ids: Optional[List[str]] = None,
+) -> None:
+    """Dispatch one user shard; skipped if the shard is already being delivered.
+
+    With `source_ids` only subscriptions to those sources are planned.
     """
     settings = get_settings()
+    lock = get_redis().lock(
+        f"dispatch:shard:{shard_count}:{shard_index}",
+        timeout=settings.dispatch_shard_lock_seconds,
+    )
+    if not lock.acquire(blocking=False):
+        logging.getLogger(__name__).info(
+            "dispatch_shard_locked",
+            extra={"shard_index": shard_index, "shard_count": shard_count},
+        )
+        return
+    try:
+        _run_dispatch(
+            shard_index=shard_index,
+            shard_count=shard_count,
+            source_ids=source_ids,
+            max_items_per_subscription=max_items_per_subscription,
+            fallback_to_en_if_missing=fallback_to_en_if_missing,
+            max_backlog_hours=max_backlog_hours,
+            max_messages_per_chat_per_run=max_messages_per_chat_per_run,
+            batch_threshold=batch_threshold,
+            use_planner=use_planner,
+        )
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # Lock expired while delivering; another run may own it now.
+            pass
+
+
+def _run_dispatch(
+    shard_index: Optional[int],
+    shard_count: Optional[int],
+    source_ids: Optional[List[str]],
+    max_items_per_subscription: int,
+    fallback_to_en_if_missing: bool,
+    max_backlog_hours: int,
+    max_messages_per_chat_per_run: int,
+    batch_threshold: int,
+    use_planner: bool,
+) -> None:
+    source_uuids = (
+        [uuid.UUID(str(s)) for s in source_ids]
+        if source_ids is not None
+        else None
+    )
     db = SessionLocalSync()
     try:
         now_ts = datetime.utcnow()
         cutoff_min_ts = now_ts - timedelta(
             hours=max_backlog_hours,
         )
-
-        users: List[User] = (
-            db.query(User)
-            .filter(
-                User.telegram_id.is_not(None),
+        if use_planner:
+            sends_plan = _plan_sends(
+                db=db,
+                now_ts=now_ts,
+                cutoff_min_ts=cutoff_min_ts,
+                max_items_per_subscription=max_items_per_subscription,
+                fallback_to_en_if_missing=fallback_to_en_if_missing,
+                max_messages_per_chat_per_run=max_messages_per_chat_per_run,
+                batch_threshold=batch_threshold,
+                shard_index=shard_index,
+                shard_count=shard_count,
+                source_ids=source_uuids,
             )
-            .all()
-        )
-        # Load subscriptions for each user
-        for user in users:
-            user.subscriptions = (
-                db.query(Subscription)
-                .filter(
-                    Subscription.user_id == user.id,
-                )
-                .all()
+        else:
+            sends_plan = _plan_sends_per_subscription(
+                db=db,
+                cutoff_min_ts=cutoff_min_ts,
+                max_items_per_subscription=max_items_per_subscription,
+                fallback_to_en_if_missing=fallback_to_en_if_missing,
+                max_messages_per_chat_per_run=max_messages_per_chat_per_run,
+                batch_threshold=batch_threshold,
+                shard_index=shard_index,
+                shard_count=shard_count,
+                source_ids=source_uuids,
             )
 
-        user_id_to_active_subs: Dict[str, List[Subscription]] = {}
-        for u in users:
-            active_subs = [
-                sub
-                for sub in (u.subscriptions or [])
-                if sub.is_active
-            ]
-            if active_subs:
-                user_id_to_active_subs[str(u.telegram_id)] = active_subs
-
-        async def _send_batch(
-            sends: List[Tuple[str, str, bool]],
-            keyboard = None,
-        ) -> None:
-            bot = Bot(
-                token=settings.telegram_bot_token,
-                default=DefaultBotProperties(
-                    parse_mode="HTML",
-                ),
+        _write_outbox(
+            messages=sends_plan,
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    logging.getLogger(__name__).info(
+        "dispatch_outbox_written",
+        extra={
+            "shard_index": shard_index,
+            "shard_count": shard_count,
+            "source_ids": source_ids,
+            "messages": len(sends_plan),
+            **render_cache.stats(),
+        },
+    )
+    render_cache.reset_stats()
+    if sends_plan:
+        send_pending_digests.delay()
+
+
+@celery_app.task(ignore_result=True)
+def send_pending_digests(
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Outbox sender: claim PENDING digests, deliver them, mark SENT/FAILED.
+
+    Rows are claimed with `FOR UPDATE SKIP LOCKED`, so any number of sender
+    workers can drain the outbox side by side. Each batch is committed on
+    its own; a crash re-sends at most the batch in flight.
+    """
+    settings = get_settings()
+    batch_size = batch_size or settings.outbox_batch_size
+    max_batches = max_batches or settings.outbox_max_batches_per_run
+    delivered = 0
+    for _ in range(max_batches):
+        db = SessionLocalSync()
+        try:
+            leads = digests_repo.claim_pending(
+                db=db,
+                limit=batch_size,
             )
-            try:
-                for chat_id, text, silent in sends:
-                    chat_id_val = int(chat_id) if isinstance(chat_id, str) and chat_id.isdigit() else chat_id
-                    try:
-                        await bot.send_message(
-                            chat_id=chat_id_val,
-                            text=text,
-                            disable_notification=silent,
-                            disable_web_page_preview=True,
-                            reply_markup=keyboard.as_markup() if keyboard else None,
-                        )
-                    except Exception as e:
-                        logging.getLogger(__name__).exception(
-                            "send_message_failed",
-                            extra={
-                                "chat_id": chat_id,
-                                "error": str(e),
-                            },
+            if not leads:
+                db.commit()
+                break
+            results = telegram_runtime.run(
+                telegram_runtime.get_sender().send_many(
+                    messages=[
+                        OutgoingMessage(
+                            chat_id=lead.chat_id,
+                            text=lead.message_text,
+                            disable_notification=lead.disable_notification,
+                            reply_markup=_load_reply_markup(
+                                payload=lead.reply_markup,
+                            ),
+                            ref=lead.message_group_id,
                         )
-                    await asyncio.sleep(
-                        0.25,
-                    )
-            finally:
-                await bot.session.close()
+                        for lead in leads
+                    ],
+                ),
+            )
+            _apply_send_results(
+                db=db,
+                results=results,
+            )
+            db.commit()
+            delivered += len(results)
+        finally:
+            db.close()
+        if len(leads) < batch_size:
+            break
+    return delivered
 
-        sends_plan: List[Tuple[str, str, bool]] = []
-        per_chat_sent_in_batch: Dict[str, int] = {}
 
-        for telegram_id, subs in user_id_to_active_subs.items():
-            chat_budget = per_chat_sent_in_batch.get(
+@celery_app.task(ignore_result=True)
+def backfill_delivery_cursors() -> int:
+    """Rebuild delivery cursors from SENT digests (idempotent, run manually)."""
+    db = SessionLocalSync()
+    try:
+        moved = delivery_cursors_repo.backfill_from_digests(
+            db=db,
+        )
+        db.commit()
+        logging.getLogger(__name__).info(
+            "delivery_cursors_backfilled",
+            extra={"rows": moved},
+        )
+        return moved
+    finally:
+        db.close()
+
+
+def _plan_sends(
+    db,
+    now_ts: datetime,
+    cutoff_min_ts: datetime,
+    max_items_per_subscription: int,
+    fallback_to_en_if_missing: bool,
+    max_messages_per_chat_per_run: int,
+    batch_threshold: int,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    source_ids: Optional[List[uuid.UUID]] = None,
+) -> List[OutgoingMessage]:
+    """Build the send list from a set-based `DispatchPlan`.
+
+    Each message carries the PENDING `Digest` rows it delivers in `ref`.
+    """
+    plan = DispatchPlanner(
+        db=db,
+        shard_index=shard_index,
+        shard_count=shard_count,
+        source_ids=source_ids,
+    ).build_plan(
+        now=now_ts,
+        cutoff=cutoff_min_ts,
+        max_items_per_subscription=max_items_per_subscription,
+        fallback_to_en=fallback_to_en_if_missing,
+        notice_url=PREMIUM_EXPIRED_NOTICE_URL,
+        max_delivery_attempts=get_settings().dispatch_max_delivery_attempts,
+    )
+    logging.getLogger(__name__).info(
+        "dispatch_plan_built",
+        extra={
+            "shard_index": shard_index,
+            "shard_count": shard_count,
+            "query_count": plan.query_count,
+            "chats": len(plan.subscriptions_by_chat),
+            "subscriptions_with_items": len(plan.items_by_subscription),
+            "cursor_holds_changed": len(plan.cursor_holds),
+        },
+    )
+    # Written with the outbox rows, before any of them can be sent.
+    delivery_cursors_repo.set_holds(
+        db=db,
+        holds=plan.cursor_holds,
+    )
+
+    sends_plan: List[OutgoingMessage] = []
+    per_chat_sent_in_batch: Dict[str, int] = {}
+
+    for telegram_id, subs in plan.subscriptions_by_chat.items():
+        if not subs[0].is_eligible:
+            # Premium expired with several active sources: notify once per
+            # window and skip news until the user chooses an option.
+            if subs[0].user_id in plan.notified_user_ids:
+                continue
+            sends_plan.append(
+                _premium_notice_message(
+                    db=db,
+                    telegram_id=telegram_id,
+                    user_id=subs[0].user_id,
+                    subscription_id=subs[0].subscription_id,
+                    source_ids=[s.source_id for s in subs],
+                ),
+            )
+            continue
+
+        for sub in subs:
+            count = per_chat_sent_in_batch.get(
                 telegram_id,
                 0,
             )
-            
-            # Check premium status if user has multiple active sources
-            if len(subs) > 1 and not users_repo.has_active_premium(
-                telegram_id=telegram_id,
-            ):
-                # Premium expired - ensure we only notify ONCE per expiry window
-                already_notified = (
-                    db.query(Digest)
-                    .filter(
-                        Digest.user_id == (
-                            db.query(User.id).filter(User.telegram_id == telegram_id).scalar_subquery()
+            if count >= max_messages_per_chat_per_run:
+                break
+            new_items = plan.items_by_subscription.get(
+                sub.subscription_id,
+            ) or []
+            if not new_items:
+                continue
+
+            if len(new_items) < batch_threshold:
+                for ni in new_items:
+                    count = per_chat_sent_in_batch.get(
+                        telegram_id,
+                        0,
+                    )
+                    if count >= max_messages_per_chat_per_run:
+                        break
+                    digest = _record_digest(
+                        db=db,
+                        user_id=sub.user_id,
+                        subscription_id=sub.subscription_id,
+                        title=ni.title,
+                        url=ni.url,
+                        summary=ni.summary,
+                    )
+                    sends_plan.append(
+                        OutgoingMessage(
+                            chat_id=telegram_id,
+                            text=render_cache.render(
+                                news_item_id=ni.news_item_id,
+                                language=sub.language,
+                                title=ni.title,
+                                summary=ni.summary,
+                                url=ni.url,
+                            ),
+                            disable_notification=count >= 1,
+                            ref=[digest],
                         ),
-                        Digest.url == PREMIUM_EXPIRED_NOTICE_URL,
-                        Digest.status == DigestStatus.SENT,
-                        Digest.sent_at >= cutoff_min_ts,
                     )
-                    .first()
-                )
-                if not already_notified:
-                    # Build keyboard options from active subs
-                    active_sources = [
-                        (str(s.source_id), str(s.source_id))
-                        for s in subs
-                    ]
-                    kb = build_paywall_keyboard_with_keep_options(
-                        options=[
-                            (str(s.source_id), str(s.source_id))
-                            for s in subs
-                        ],
+                    per_chat_sent_in_batch[telegram_id] = count + 1
+            else:
+                blocks: List[str] = []
+                digests: List[Digest] = []
+                for ni in new_items:
+                    blocks.append(
+                        render_cache.render(
+                            news_item_id=ni.news_item_id,
+                            language=sub.language,
+                            title=ni.title,
+                            summary=ni.summary,
+                            url=ni.url,
+                        ),
                     )
-                    asyncio.run(
-                        _send_batch(
-                            sends=[(telegram_id, PREMIUM_EXPIRED_MULTIPLE_SOURCES_TEXT, False)],
-                            keyboard=kb,
+                    digests.append(
+                        _record_digest(
+                            db=db,
+                            user_id=sub.user_id,
+                            subscription_id=sub.subscription_id,
+                            title=ni.title,
+                            url=ni.url,
+                            summary=ni.summary,
                         ),
                     )
-                    # Record notification digest
-                    user_id_val = (
-                        db.query(User.id).filter(User.telegram_id == telegram_id).scalar()
+                sends_plan.append(
+                    OutgoingMessage(
+                        chat_id=telegram_id,
+                        text="\n\n".join(
+                            blocks,
+                        ),
+                        disable_notification=count >= 1,
+                        ref=digests,
+                    ),
+                )
+                per_chat_sent_in_batch[telegram_id] = count + 1
+    return sends_plan
+
+
+def _premium_notice_message(
+    db,
+    telegram_id: str,
+    user_id,
+    subscription_id,
+    source_ids: List,
+) -> OutgoingMessage:
+    """Record a PENDING premium-expired notice and return its message."""
+    kb = build_paywall_keyboard_with_keep_options(
+        options=[
+            (str(source_id), str(source_id))
+            for source_id in source_ids
+        ],
+    )
+    digest = Digest(
+        user_id=user_id,
+        subscription_id=subscription_id,
+        title="Premium expired",
+        summary="",
+        url=PREMIUM_EXPIRED_NOTICE_URL,
+        scheduled_for=datetime.utcnow(),
+        status=DigestStatus.PENDING,
+    )
+    db.add(
+        digest,
+    )
+    return OutgoingMessage(
+        chat_id=telegram_id,
+        text=PREMIUM_EXPIRED_MULTIPLE_SOURCES_TEXT,
+        disable_notification=False,
+        reply_markup=kb.as_markup(),
+        ref=[digest],
+    )
+
+
+def _plan_sends_per_subscription(
+    db,
+    cutoff_min_ts: datetime,
+    max_items_per_subscription: int,
+    fallback_to_en_if_missing: bool,
+    max_messages_per_chat_per_run: int,
+    batch_threshold: int,
+    shard_index: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    source_ids: Optional[List[uuid.UUID]] = None,
+) -> List[OutgoingMessage]:
+    """Fallback planner issuing several queries per subscription."""
+    users_query = db.query(User).filter(
+        User.telegram_id.is_not(None),
+    )
+    if shard_count:
+        users_query = users_query.filter(
+            shard_clause(
+                user_id_column=User.id,
+                shard_index=shard_index or 0,
+                shard_count=shard_count,
+            )
+        )
+    users: List[User] = users_query.all()
+    # Load subscriptions for each user
+    for user in users:
+        user.subscriptions = (
+            db.query(Subscription)
+            .filter(
+                Subscription.user_id == user.id,
+            )
+            .all()
+        )
+
+    premium_by_user = premium_status_by_user_ids(
+        db=db,
+        user_ids=[u.id for u in users],
+    )
+    user_id_by_telegram_id = {
+        str(u.telegram_id): u.id
+        for u in users
+    }
+
+    user_id_to_active_subs: Dict[str, List[Subscription]] = {}
+    for u in users:
+        active_subs = [
+            sub
+            for sub in (u.subscriptions or [])
+            if sub.is_active
+        ]
+        if active_subs:
+            user_id_to_active_subs[str(u.telegram_id)] = active_subs
+
+    sends_plan: List[OutgoingMessage] = []
+    per_chat_sent_in_batch: Dict[str, int] = {}
+
+    for telegram_id, subs in user_id_to_active_subs.items():
+        chat_budget = per_chat_sent_in_batch.get(
+            telegram_id,
+            0,
+        )
+        
+        # Check premium status if user has multiple active sources
+        if len(subs) > 1 and not premium_by_user.get(
+            user_id_by_telegram_id[telegram_id],
+            False,
+        ):
+            # Premium expired - ensure we only notify ONCE per expiry window
+            already_notified = (
+                db.query(Digest)
+                .filter(
+                    Digest.user_id == (
+                        db.query(User.id).filter(User.telegram_id == telegram_id).scalar_subquery()
+                    ),
+                    Digest.url == PREMIUM_EXPIRED_NOTICE_URL,
+                    or_(
+                        and_(
+                            Digest.status == DigestStatus.SENT,
+                            Digest.sent_at >= cutoff_min_ts,
+                        ),
+                        Digest.status == DigestStatus.PENDING,
+                    ),
+                )
+                .first()
+            )
+            if not already_notified:
+                user_id_val = (
+                    db.query(User.id).filter(User.telegram_id == telegram_id).scalar()
+                )
+                if user_id_val:
+                    sends_plan.append(
+                        _premium_notice_message(
+                            db=db,
+                            telegram_id=telegram_id,
+                            user_id=user_id_val,
+                            subscription_id=subs[0].id,
+                            source_ids=[s.source_id for s in subs],
+                        ),
                     )
-                    if user_id_val:
-                        db.add(
-                            Digest(
-                                user_id=user_id_val,
-                                subscription_id=subs[0].id,
-                                title="Premium expired",
-                                summary="",
-                                url=PREMIUM_EXPIRED_NOTICE_URL,
-                                scheduled_for=datetime.utcnow(),
-                                sent_at=datetime.utcnow(),
-                                status=DigestStatus.SENT,
-                            )
-                        )
-                        db.commit()
-                # Skip sending news until user chooses an option
+            # Skip sending news until user chooses an option
+            continue
+        
+        for sub in subs:
+            if chat_budget >= max_messages_per_chat_per_run:
+                break
+            if source_ids is not None and sub.source_id not in source_ids:
                 continue
-            
-            for sub in subs:
-                if chat_budget >= max_messages_per_chat_per_run:
-                    break
 
-                last_digest: Optional[Digest] = (
-                    db.query(Digest)
-                    .filter(
-                        Digest.subscription_id == sub.id,
-                        Digest.status == DigestStatus.SENT,
-                    )
-                    .order_by(
-                        Digest.sent_at.desc(),
-                    )
-                    .first()
+            last_digest: Optional[Digest] = (
+                db.query(Digest)
+                .filter(
+                    Digest.subscription_id == sub.id,
+                    Digest.status == DigestStatus.SENT,
+                )
+                .order_by(
+                    Digest.sent_at.desc(),
                 )
-                last_sent_at = last_digest.sent_at if last_digest and last_digest.sent_at else cutoff_min_ts
+                .first()
+            )
+            last_sent_at = last_digest.sent_at if last_digest and last_digest.sent_at else cutoff_min_ts
+
+            items: List[NewsItem] = (
+                db.query(NewsItem)
+                .filter(
+                    NewsItem.source_id == sub.source_id,
+                    NewsItem.is_active.is_(True),
+                    NewsItem.fetched_at > last_sent_at,
+                    NewsItem.fetched_at >= cutoff_min_ts,
+                    NewsItem.summary.is_not(None),
+                )
+                .order_by(
+                    NewsItem.fetched_at.asc(),
+                )
+                .limit(
+                    max_items_per_subscription,
+                )
+                .all()
+            )
+            if not items:
+                continue
 
-                items: List[NewsItem] = (
-                    db.query(NewsItem)
+            sent_urls = {
+                d.url
+                for d in (
+                    db.query(Digest)
                     .filter(
-                        NewsItem.source_id == sub.source_id,
-                        NewsItem.is_active.is_(True),
-                        NewsItem.fetched_at > last_sent_at,
-                        NewsItem.fetched_at >= cutoff_min_ts,
-                        NewsItem.summary.is_not(None),
-                    )
-                    .order_by(
-                        NewsItem.fetched_at.asc(),
-                    )
-                    .limit(
-                        max_items_per_subscription,
+                        Digest.subscription_id == sub.id,
+                        Digest.status.in_(
+                            [DigestStatus.SENT, DigestStatus.PENDING],
+                        ),
                     )
                     .all()
                 )
-                if not items:
-                    continue
+            }
+            new_items = [
+                ni
+                for ni in items
+                if ni.url not in sent_urls
+            ]
+            if not new_items:
+                continue
 
-                sent_urls = {
-                    d.url
-                    for d in (
-                        db.query(Digest)
-                        .filter(
-                            Digest.subscription_id == sub.id,
-                            Digest.status == DigestStatus.SENT,
-                        )
-                        .all()
+            if len(new_items) < batch_threshold:
+                for ni in new_items:
+                    summ = _pick_summary_for_lang(
+                        db=db,
+                        item=ni,
+                        lang=sub.language,
+                        fallback_to_en=fallback_to_en_if_missing,
                     )
-                }
-                new_items = [
-                    ni
-                    for ni in items
-                    if ni.url not in sent_urls
-                ]
-                if not new_items:
-                    continue
-
-                if len(new_items) < batch_threshold:
-                    for ni in new_items:
-                        summ = _pick_summary_for_lang(
-                            db=db,
-                            item=ni,
-                            lang=sub.language,
-                            fallback_to_en=fallback_to_en_if_missing,
-                        )
-                        if not summ:
-                            continue
-                        message_text = _render_single_message(
-                            title=ni.title,
-                            summary=summ,
-                            url=ni.url,
-                        )
-                        count = per_chat_sent_in_batch.get(
-                            telegram_id,
-                            0,
-                        )
-                        if count >= max_messages_per_chat_per_run:
-                            break
-                        sends_plan.append(
-                            (
-                                telegram_id,
-                                message_text,
-                                True if count >= 1 else False,
-                            ),
-                        )
-                        per_chat_sent_in_batch[telegram_id] = count + 1
-                        chat_budget = per_chat_sent_in_batch[telegram_id]
-                        _record_digest(
-                            db=db,
-                            sub=sub,
-                            item=ni,
-                            summary=summ,
-                        )
-                else:
-                    blocks: List[str] = []
-                    for ni in new_items:
-                        summ = _pick_summary_for_lang(
-                            db=db,
-                            item=ni,
-                            lang=sub.language,
-                            fallback_to_en=fallback_to_en_if_missing,
-                        )
-                        if not summ:
-                            continue
-                        blocks.append(
-                            _render_item_block(
-                                title=ni.title,
-                                summary=summ,
-                                url=ni.url,
-                            ),
-                        )
-                        _record_digest(
-                            db=db,
-                            sub=sub,
-                            item=ni,
-                            summary=summ,
-                        )
-                    if not blocks:
+                    if not summ:
                         continue
-                    message_text = "\n\n".join(
-                        blocks,
+                    message_text = render_cache.render(
+                        news_item_id=ni.id,
+                        language=sub.language,
+                        title=ni.title,
+                        summary=summ,
+                        url=ni.url,
                     )
                     count = per_chat_sent_in_batch.get(
                         telegram_id,
                         0,
                     )
                     if count >= max_messages_per_chat_per_run:
-                        continue
+                        break
+                    digest = _record_digest(
+                        db=db,
+                        user_id=sub.user_id,
+                        subscription_id=sub.id,
+                        title=ni.title,
+                        url=ni.url,
+                        summary=summ,
+                    )
                     sends_plan.append(
-                        (
-                            telegram_id,
-                            message_text,
-                            True if count >= 1 else False,
+                        OutgoingMessage(
+                            chat_id=telegram_id,
+                            text=message_text,
+                            disable_notification=count >= 1,
+                            ref=[digest],
                         ),
                     )
                     per_chat_sent_in_batch[telegram_id] = count + 1
                     chat_budget = per_chat_sent_in_batch[telegram_id]
+            else:
+                # Check the budget before recording: PENDING digests without
+                # a message would block these items as already queued.
+                count = per_chat_sent_in_batch.get(
+                    telegram_id,
+                    0,
+                )
+                if count >= max_messages_per_chat_per_run:
+                    break
+                blocks: List[str] = []
+                digests: List[Digest] = []
+                for ni in new_items:
+                    summ = _pick_summary_for_lang(
+                        db=db,
+                        item=ni,
+                        lang=sub.language,
+                        fallback_to_en=fallback_to_en_if_missing,
+                    )
+                    if not summ:
+                        continue
+                    blocks.append(
+                        render_cache.render(
+                            news_item_id=ni.id,
+                            language=sub.language,
+                            title=ni.title,
+                            summary=summ,
+                            url=ni.url,
+                        ),
+                    )
+                    digests.append(
+                        _record_digest(
+                            db=db,
+                            user_id=sub.user_id,
+                            subscription_id=sub.id,
+                            title=ni.title,
+                            url=ni.url,
+                            summary=summ,
+                        ),
+                    )
+                if not blocks:
+                    continue
+                message_text = "\n\n".join(
+                    blocks,
+                )
+                sends_plan.append(
+                    OutgoingMessage(
+                        chat_id=telegram_id,
+                        text=message_text,
+                        disable_notification=count >= 1,
+                        ref=digests,
+                    ),
+                )
+                per_chat_sent_in_batch[telegram_id] = count + 1
+                chat_budget = per_chat_sent_in_batch[telegram_id]
 
-        if sends_plan:
-            asyncio.run(
-                _send_batch(
-                    sends=sends_plan,
-                ),
-            )
-        db.commit()
-    finally:
-        db.close()
+    return sends_plan
 
 
-def _escape_html(
-    text: str,
-) -> str:
-    return (
-        text
-        .replace(
-            "&",
-            "&amp;",
-        )
-        .replace(
-            "<",
-            "&lt;",
-        )
-        .replace(
-            ">",
-            "&gt;",
-        )
-    )
+def _write_outbox(
+    messages: List[OutgoingMessage],
+) -> None:
+    """Store each planned message on its digests for the outbox sender.
 
+    The first digest of a message becomes the lead row carrying the rendered
+    payload; the rest share its `message_group_id`.
+    """
+    for message in messages:
+        digests: List[Digest] = message.ref or []
+        if not digests:
+            continue
+        lead = digests[0]
+        if lead.id is None:
+            lead.id = uuid.uuid4()
+        for digest in digests:
+            digest.message_group_id = lead.id
+            digest.chat_id = str(message.chat_id)
+        lead.message_text = message.text
+        lead.disable_notification = message.disable_notification
+        if message.reply_markup is not None:
+            lead.reply_markup = message.reply_markup.model_dump_json(
+                exclude_none=True,
+            )
 
-def _escape_html_attr(
-    text: str,
-) -> str:
-    return (
-        text
-        .replace(
-            "&",
-            "&amp;",
-        )
-        .replace(
-            '"',
-            "&quot;",
-        )
-        .replace(
-            "<",
-            "&lt;",
-        )
-        .replace(
-            ">",
-            "&gt;",
-        )
+
+def _load_reply_markup(
+    payload: Optional[str],
+) -> Optional[InlineKeyboardMarkup]:
+    if not payload:
+        return None
+    return InlineKeyboardMarkup.model_validate_json(
+        payload,
     )
 
 
-def _render_single_message(
-    title: str,
-    summary: str,
-    url: str,
-) -> str:
-    safe_title = _escape_html(
-        text=title,
-    )
-    concise = _shorten_summary(
-        text=summary or "",
-        max_sentences=2,
-        max_chars=300,
-    )
-    safe_summary = _escape_html(
-        text=concise,
-    )
-    normalized_url = _normalize_url(
-        url=url,
-    )
-    safe_url_attr = _escape_html_attr(
-        text=normalized_url,
-    )
-    domain = _extract_domain(
-        url=normalized_url,
+def _apply_send_results(
+    db,
+    results: List[SendResult],
+) -> None:
+    """Mark the digest groups behind each message SENT or FAILED.
+
+    Delivery cursors advance here, past what was actually sent.
+    """
+    sent_group_ids = [
+        result.message.ref
+        for result in results
+        if result.ok
+    ]
+    failed_group_ids = [
+        result.message.ref
+        for result in results
+        if not result.ok
+    ]
+    digests_repo.mark_sent(
+        db=db,
+        message_ids_by_group={
+            result.message.ref: result.message_id
+            for result in results
+            if result.ok
+        },
+        sent_at=datetime.utcnow(),
     )
-    safe_domain = _escape_html(
-        text=domain,
+    digests_repo.mark_failed(
+        db=db,
+        group_ids=failed_group_ids,
     )
-    return "\n".join(
-        [
-            f"📰 <b>{safe_title}</b>",
-            f"{safe_summary}",
-            f'↗️ <a href="{safe_url_attr}">{safe_domain}</a>',
-        ]
+    delivery_cursors_repo.advance_after_send(
+        db=db,
+        sent_group_ids=sent_group_ids,
+        failed_group_ids=failed_group_ids,
     )
-
-
-def _render_item_block(
-    title: str,
-    summary: str,
-    url: str,
-) -> str:
-    return _render_single_message(
-        title=title,
-        summary=summary,
-        url=url,
+    logging.getLogger(__name__).info(
+        "dispatch_send_finished",
+        extra={
+            "sent": sum(1 for r in results if r.ok),
+            "failed": sum(1 for r in results if not r.ok),
+        },
     )
 
 
 def _record_digest(
     db,
-    sub: Subscription,
-    item: NewsItem,
+    user_id,
+    subscription_id,
+    title: str,
+    url: str,
     summary: str,
-) -> None:
+) -> Digest:
+    """Queue a PENDING digest; the cursor moves once its message is sent."""
     digest = Digest(
-        user_id=sub.user_id,
-        subscription_id=sub.id,
-        title=item.title,
+        user_id=user_id,
+        subscription_id=subscription_id,
+        title=title,
         summary=summary or "",
-        url=item.url,
+        url=url,
         scheduled_for=datetime.utcnow(),
-        sent_at=datetime.utcnow(),
-        status=DigestStatus.SENT,
+        status=DigestStatus.PENDING,
     )
     db.add(
         digest,
     )
+    return digest
 
 
 def _pick_summary_for_lang(
@@ -775,106 +1420,3 @@ def _pick_summary_for_lang(
     if fallback_to_en:
         return (item.summary or "").strip() or None
     return None
-
-
-def _shorten_summary(
-    text: str,
-    max_sentences: int = 2,
-    max_chars: int = 300,
-) -> str:
-    content = (text or "").strip()
-    if not content:
-        return ""
-    # Split by sentence boundaries.
-    sentences = re.split(
-        pattern=r"(?<=[\.!?])\s+",
-        string=content,
-    )
-    picked = " ".join(
-        sentences[: max(1, max_sentences)],
-    ).strip()
-    if len(picked) > max_chars:
-        return picked[: max_chars - 1].rstrip() + "…"
-    return picked
-
-
-def _extract_domain(
-    url: str,
-) -> str:
-    try:
-        if not url:
-            return "link"
-        
-        normalized = _normalize_url(
-            url=url,
-        )
-        parsed = urlparse(normalized)
-        host = parsed.netloc
-        
-        if not host:
-            return "link"
-            
-        if host.startswith("www."):
-            host = host[4:]
-        
-        if not _is_valid_host(host):
-            return "link"
-
-        return host
-    except Exception:
-        return "link"
-
-
-def _normalize_url(
-    url: str,
-) -> str:
-    val = (url or "").strip()
-    if not val:
-        return ""
-    if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*://", val):
-        return val
-    return f"https://{val}"
-
-
-def _is_valid_host(
-    host: str,
-) -> bool:
-    try:
-        h = (host or "").strip()
-        if not h:
-            return False
-
-        if h == "localhost":
-            return True
-
-        # IPv6 in brackets
-        if h.startswith("[") and h.endswith("]"):
-            inner = h[1:-1]
-            return True if re.fullmatch(r"[0-9a-fA-F:]+", inner or "") else False
-
-        # IPv4 address
-        if re.fullmatch(r"\d{1,3}(?:\.\d{1,3}){3}", h or ""):
-            parts = [int(p) for p in h.split(".")]
-            return all(0 <= p <= 255 for p in parts)
-
-        # Domain name must contain a dot and valid labels
-        if "." not in h:
-            return False
-
-        labels = h.split(".")
-        # TLD should be last label and at least 2 letters
-        tld = labels[-1]
-        if not re.fullmatch(r"[a-zA-Z]{2,}", tld):
-            return False
-
-        label_re = re.compile(r"^[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?$")
-        for label in labels:
-            if not label or len(label) > 63:
-                return False
-            if not label_re.fullmatch(label):
-                return False
-
-        return True
-    except Exception:
-        return False
-
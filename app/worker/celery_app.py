@@ -13,19 +13,14 @@ celery_app = Celery(
 )
 
 celery_app.conf.beat_schedule = {
-    "techcrunch-every-5-minutes": {
-        "task": "app.tasks.news_tasks.parse_techcrunch",
-        "schedule": 200.0,
-        "args": (
-            50,
-        ),
+    # Feeds are registered as `sources` rows; this tick fans out the due ones.
+    "ingest-due-sources-every-30-seconds": {
+        "task": "app.tasks.news_tasks.ingest_due_sources",
+        "schedule": 30.0,
     },
-    "hn-every-5-minutes": {
-        "task": "app.tasks.news_tasks.parse_hackernews",
-        "schedule": 200.0,
-        "args": (
-            50,
-        ),
+    "enrich-pending-items-every-30-seconds": {
+        "task": "app.tasks.news_tasks.enrich_pending_items",
+        "schedule": 30.0,
     },
     "summarize-every-5-minutes": {
         "task": "app.tasks.news_tasks.summarize_fresh_news",
@@ -34,27 +29,6 @@ celery_app.conf.beat_schedule = {
             200,
         ),
     },
-    "theverge-every-5-minutes": {
-        "task": "app.tasks.news_tasks.parse_theverge",
-        "schedule": 300.0,
-        "args": (
-            50,
-        ),
-    },
-    "engadget-every-5-minutes": {
-        "task": "app.tasks.news_tasks.parse_engadget",
-        "schedule": 300.0,
-        "args": (
-            50,
-        ),
-    },
-    "wired-every-5-minutes": {
-        "task": "app.tasks.news_tasks.parse_wired",
-        "schedule": 300.0,
-        "args": (
-            50,
-        ),
-    },
     "translate-every-5-minutes": {
         "task": "app.tasks.news_tasks.translate_needed_summaries",
         "schedule": 200.0,
@@ -63,10 +37,10 @@ celery_app.conf.beat_schedule = {
         ),
     },
     "dispatch-every-5-minutes": {
-        "task": "app.tasks.news_tasks.dispatch_news_updates",
+        "task": "app.tasks.news_tasks.dispatch_news_updates_sharded",
         "schedule": 200.0,
         "kwargs": {
-            "window_minutes": 5,
+            "shard_count": settings.dispatch_shard_count,
             "max_items_per_subscription": 5,
             "fallback_to_en_if_missing": False,
             "max_backlog_hours": 48,
@@ -74,6 +48,10 @@ celery_app.conf.beat_schedule = {
             "batch_threshold": 3,
         },
     },
+    "refresh-eligible-sources-every-10-minutes": {
+        "task": "app.tasks.news_tasks.refresh_eligible_sources",
+        "schedule": 600.0,
+    },
     "notify-premium-expired-every-2-minutes": {
         "task": "app.tasks.news_tasks.notify_premium_expired",
         "schedule": 120.0,
@@ -81,4 +59,22 @@ celery_app.conf.beat_schedule = {
             10,
         ),
     },
+    "send-pending-digests-every-30-seconds": {
+        "task": "app.tasks.news_tasks.send_pending_digests",
+        "schedule": 30.0,
+    },
 }
+
+# Outbox senders and full-text extraction run on their own queues so they
+# scale apart from planning and feed polling.
+celery_app.conf.task_routes = {
+    "app.tasks.news_tasks.send_pending_digests": {
+        "queue": "delivery",
+    },
+    "app.tasks.news_tasks.enrich_pending_items": {
+        "queue": "extraction",
+    },
+}
+
+# Connect worker process signals for the shared Telegram runtime.
+from app.worker import telegram as _telegram_runtime  # noqa: E402,F401
@@ -0,0 +1,110 @@
+"""Process-scoped Telegram bot and event loop for Celery workers.
+
+Created on `worker_process_init` and closed on `worker_process_shutdown`, so
+every task in a worker process reuses one aiohttp session (keep-alive, no
+per-call TLS handshake) and one event loop instead of `asyncio.run(...)`.
+Outside a worker (scripts, shell) the runtime is created lazily on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Optional, TypeVar
+
+from aiogram import Bot
+from aiogram.client.bot import DefaultBotProperties
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.config import get_settings
+from app.services.telegram import SharedRateLimiter, TelegramSender
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_bot: Optional[Bot] = None
+_sender: Optional[TelegramSender] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def get_bot() -> Bot:
+    global _bot
+    if _bot is None:
+        settings = get_settings()
+        _bot = Bot(
+            token=settings.telegram_bot_token,
+            default=DefaultBotProperties(
+                parse_mode="HTML",
+            ),
+        )
+    return _bot
+
+
+def get_sender() -> TelegramSender:
+    """Shared sender so rate-limit buckets persist across tasks."""
+    global _sender
+    if _sender is None:
+        settings = get_settings()
+        _sender = TelegramSender(
+            bot=get_bot(),
+            max_concurrency=settings.telegram_send_concurrency,
+            global_rate_per_second=settings.telegram_global_rate_per_second,
+            per_chat_rate_per_second=settings.telegram_per_chat_rate_per_second,
+            max_attempts=settings.telegram_send_max_attempts,
+            max_chat_buckets=settings.telegram_max_chat_buckets,
+            # Every process sending for this bot draws from one Redis limit.
+            global_limiter=SharedRateLimiter(
+                name=settings.telegram_bot_token.split(":", 1)[0],
+                rate_per_second=settings.telegram_global_rate_per_second,
+            ),
+        )
+    return _sender
+
+
+def run(
+    coro: Awaitable[T],
+) -> T:
+    """Run a coroutine on the process event loop and return its result."""
+    return get_loop().run_until_complete(coro)
+
+
+def close() -> None:
+    global _loop, _bot, _sender
+    if _loop is None or _loop.is_closed():
+        _bot = None
+        _sender = None
+        return
+    try:
+        if _bot is not None:
+            _loop.run_until_complete(_bot.session.close())
+    except Exception:
+        logging.getLogger(__name__).exception(
+            "telegram_runtime_close_failed",
+        )
+    finally:
+        _loop.close()
+        _loop = None
+        _bot = None
+        _sender = None
+
+
+@worker_process_init.connect
+def _on_worker_process_init(
+    **kwargs,
+) -> None:
+    get_loop()
+    get_sender()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(
+    **kwargs,
+) -> None:
+    close()
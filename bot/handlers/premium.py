@@ -9,8 +9,9 @@ from aiogram.types import (
 from app.config import get_settings
 from app.db.session import get_sync_db
 from app.db.models import User, PaymentStatus
-from app.repositories import users as users_repo
+from app.services.premium import premium_cache, publish_premium_change
 from app.repositories import payments as payments_repo
+from app.repositories import eligible_sources as eligible_sources_repo
 from datetime import datetime, timedelta
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 import logging
@@ -33,7 +34,7 @@ async def premium_status(
     db = get_sync_db()
     try:
         user = db.query(User).filter_by(telegram_id=str(message.from_user.id)).one_or_none()
-        has_premium = users_repo.has_active_premium(
+        has_premium = premium_cache.has_active_premium(
             telegram_id=str(message.from_user.id),
         )
         if has_premium and user and user.premium_until:
@@ -79,7 +80,7 @@ async def open_premium(
     db = get_sync_db()
     try:
         user = db.query(User).filter_by(telegram_id=str(cb.from_user.id)).one_or_none()
-        has_premium = users_repo.has_active_premium(
+        has_premium = premium_cache.has_active_premium(
             telegram_id=str(cb.from_user.id),
         )
     finally:
@@ -121,7 +122,7 @@ async def pre_checkout_handler(
                 )
                 .one_or_none()
             )
-            has_premium = users_repo.has_active_premium(
+            has_premium = premium_cache.has_active_premium(
                 telegram_id=str(query.from_user.id),
             )
         finally:
@@ -198,9 +199,16 @@ async def successful_payment_handler(
         else:
             term_days = settings.premium_term_days
             user.premium_until = max(current_until, now) + timedelta(days=term_days)
+        eligible_sources_repo.refresh_for_user(
+            db=db,
+            user_id=user.id,
+        )
         db.commit()
     finally:
         db.close()
+    publish_premium_change(
+        telegram_id=str(user_id_telegram),
+    )
 
     logging.getLogger(__name__).info(
         "premium_activated",
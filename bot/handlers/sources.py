@@ -8,7 +8,7 @@ from app.db.models import User, Subscription
 from app.db.session import get_sync_db
 from app.repositories import sources as sources_repo
 from app.repositories import subscriptions as subscriptions_repo
-from app.repositories import users as users_repo
+from app.services.premium import premium_cache
 from bot.state import (
     get_selection,
     get_source_selection_context,
@@ -67,7 +67,7 @@ async def toggle_src(cb: CallbackQuery):
             source_id=src_id,
         )
     context = get_source_selection_context(chat)
-    if len(sel) > 1 and not users_repo.has_active_premium(
+    if len(sel) > 1 and not premium_cache.has_active_premium(
         telegram_id=str(chat),
     ):
         try:
@@ -122,7 +122,7 @@ async def sources_done(cb: CallbackQuery):
         )
         return
 
-    if len(sel) > 1 and not users_repo.has_active_premium(
+    if len(sel) > 1 and not premium_cache.has_active_premium(
         telegram_id=str(cb.from_user.id),
     ):
         all_sources = sources_repo.list_active_sources()
@@ -194,7 +194,7 @@ async def sources_apply(cb: CallbackQuery):
         )
         return
 
-    if len(sel) > 1 and not users_repo.has_active_premium(
+    if len(sel) > 1 and not premium_cache.has_active_premium(
         telegram_id=str(cb.from_user.id),
     ):
         all_sources = sources_repo.list_active_sources()
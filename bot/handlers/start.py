@@ -6,6 +6,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from app.db.models import User, Subscription
 from app.db.session import get_sync_db
 from app.repositories import users as users_repo
+from app.services.premium import premium_cache
 from app.repositories import subscriptions as subscriptions_repo
 from app.repositories import sources as sources_repo
 from bot.state import get_selection, set_source_selection_context, clear_source_selection_context
@@ -41,7 +42,7 @@ async def cmd_start(message: Message):
     )
 
     # If premium expired and user has >1 active source, show paywall popup once per interaction
-    has_premium = users_repo.has_active_premium(
+    has_premium = premium_cache.has_active_premium(
         telegram_id=str(message.from_user.id),
     )
     if not has_premium:
@@ -9,6 +9,7 @@ from app.repositories import languages as languages_repo
 from app.repositories import subscriptions as subscriptions_repo
 from app.repositories import sources as sources_repo
 from app.repositories import users as users_repo
+from app.services.premium import premium_cache
 from bot.utils.flags import get_flag_emoji
 from bot.state import get_selection, pop_selection
 from datetime import datetime
@@ -99,7 +100,7 @@ async def language_chosen(cb: CallbackQuery):
         selected_source_ids = set(sel)
 
         if selected_source_ids and len(selected_source_ids) > 1:
-            has_premium = users_repo.has_active_premium(
+            has_premium = premium_cache.has_active_premium(
                 telegram_id=str(cb.from_user.id),
             )
             if not has_premium:
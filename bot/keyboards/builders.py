@@ -7,7 +7,7 @@ from typing import Iterable
 from app.db.session import get_sync_db
 from app.db.models import User
 from datetime import datetime
-from app.repositories import users as users_repo
+from app.services.premium import premium_cache
 
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
@@ -28,7 +28,7 @@ def build_command_shortcuts_keyboard(user_id: int | None = None) -> InlineKeyboa
     )
     show_premium = True
     if user_id is not None:
-        has_premium = users_repo.has_active_premium(
+        has_premium = premium_cache.has_active_premium(
             telegram_id=str(user_id),
         )
         if has_premium:
@@ -54,7 +54,7 @@ def build_settings_keyboard(user_id: int | None = None) -> InlineKeyboardBuilder
     )
     show_premium = True
     if user_id is not None:
-        has_premium = users_repo.has_active_premium(
+        has_premium = premium_cache.has_active_premium(
             telegram_id=str(user_id),
         )
         if has_premium:
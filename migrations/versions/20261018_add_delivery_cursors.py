@@ -0,0 +1,48 @@
+"""add delivery_cursors table and backfill from digests
+
+Revision ID: 20261018_delivery_cursors
+Revises: 791469ad2d80
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_delivery_cursors'
+down_revision: Union[str, Sequence[str], None] = '791469ad2d80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'delivery_cursors',
+        sa.Column('subscription_id', sa.dialects.postgresql.UUID(as_uuid=True), sa.ForeignKey('subscriptions.id', ondelete='CASCADE'), primary_key=True, nullable=False),
+        sa.Column('last_fetched_at', sa.DateTime(), nullable=False),
+        sa.Column('last_news_item_id', sa.dialects.postgresql.UUID(as_uuid=True), sa.ForeignKey('news_items.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+    # One-off backfill: newest delivered item per subscription, matched by URL.
+    op.execute(
+        """
+        INSERT INTO delivery_cursors (subscription_id, last_fetched_at, last_news_item_id, created_at, updated_at)
+        SELECT DISTINCT ON (d.subscription_id)
+            d.subscription_id, ni.fetched_at, ni.id, now(), now()
+        FROM digests d
+        JOIN subscriptions s ON s.id = d.subscription_id
+        JOIN news_items ni ON ni.source_id = s.source_id AND ni.url = d.url
+        WHERE d.status = 'SENT'
+        ORDER BY d.subscription_id, ni.fetched_at DESC, ni.id DESC
+        ON CONFLICT (subscription_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('delivery_cursors')
@@ -0,0 +1,42 @@
+"""add outbox payload columns to digests
+
+Revision ID: 20261018_digest_outbox
+Revises: 20261018_eligible_sources
+Create Date: 2026-10-18 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_digest_outbox'
+down_revision: Union[str, Sequence[str], None] = '20261018_eligible_sources'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('digests', sa.Column('message_group_id', sa.dialects.postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('digests', sa.Column('chat_id', sa.String(length=64), nullable=True, comment='Telegram chat to deliver to'))
+    op.add_column('digests', sa.Column('message_text', sa.Text(), nullable=True, comment='Rendered message (lead row only)'))
+    op.add_column('digests', sa.Column('reply_markup', sa.Text(), nullable=True, comment='Serialized reply markup JSON (lead row only)'))
+    op.add_column('digests', sa.Column('disable_notification', sa.Boolean(), nullable=False, server_default=sa.text('false')))
+    op.create_index('ix_digests_message_group_id', 'digests', ['message_group_id'], unique=False)
+
+    # PENDING rows written by older workers have no payload and would never
+    # be claimed; they were either sent or lost, so close them out.
+    op.execute(
+        "UPDATE digests SET status = 'FAILED' WHERE status = 'PENDING' AND message_group_id IS NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_digests_message_group_id', table_name='digests')
+    op.drop_column('digests', 'disable_notification')
+    op.drop_column('digests', 'reply_markup')
+    op.drop_column('digests', 'message_text')
+    op.drop_column('digests', 'chat_id')
+    op.drop_column('digests', 'message_group_id')
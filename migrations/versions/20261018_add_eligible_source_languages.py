@@ -0,0 +1,49 @@
+"""add eligible_source_languages table
+
+Revision ID: 20261018_eligible_sources
+Revises: 20261018_delivery_cursors
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_eligible_sources'
+down_revision: Union[str, Sequence[str], None] = '20261018_delivery_cursors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'eligible_source_languages',
+        sa.Column('source_id', sa.dialects.postgresql.UUID(as_uuid=True), sa.ForeignKey('sources.id', ondelete='CASCADE'), primary_key=True, nullable=False),
+        sa.Column('language', sa.String(length=8), sa.ForeignKey('languages.code'), primary_key=True, nullable=False),
+        sa.Column('subscriber_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    )
+
+    # Initial fill; refresh_eligible_sources keeps it current afterwards.
+    op.execute(
+        """
+        INSERT INTO eligible_source_languages (source_id, language, subscriber_count, refreshed_at)
+        SELECT subs.source_id, subs.language, count(*), now()
+        FROM (
+            SELECT s.source_id, s.language, u.premium_until,
+                   count(*) OVER (PARTITION BY s.user_id) AS active_count
+            FROM subscriptions s
+            JOIN users u ON u.id = s.user_id
+            WHERE u.telegram_id IS NOT NULL AND s.is_active IS true
+        ) AS subs
+        WHERE subs.active_count <= 1 OR subs.premium_until > now() AT TIME ZONE 'utc'
+        GROUP BY subs.source_id, subs.language
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('eligible_source_languages')
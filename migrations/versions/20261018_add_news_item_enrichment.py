@@ -0,0 +1,37 @@
+"""add enrichment stage columns to news_items
+
+Revision ID: 20261018_news_item_enrichment
+Revises: 20261018_source_poll_streak
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_news_item_enrichment'
+down_revision: Union[str, Sequence[str], None] = '20261018_source_poll_streak'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+enrichment_status = sa.Enum('PENDING', 'DONE', 'FAILED', name='enrichmentstatus')
+
+
+def upgrade() -> None:
+    enrichment_status.create(op.get_bind(), checkfirst=True)
+    # Existing rows were extracted inline by the old parsers.
+    op.add_column('news_items', sa.Column('enrichment_status', enrichment_status, nullable=False, server_default='DONE', comment='Full-text extraction stage'))
+    op.add_column('news_items', sa.Column('enrichment_attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('news_items', sa.Column('enriched_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_news_items_enrichment', 'news_items', ['enrichment_status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_items_enrichment', table_name='news_items')
+    op.drop_column('news_items', 'enriched_at')
+    op.drop_column('news_items', 'enrichment_attempts')
+    op.drop_column('news_items', 'enrichment_status')
+    enrichment_status.drop(op.get_bind(), checkfirst=True)
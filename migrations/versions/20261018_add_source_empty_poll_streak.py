@@ -0,0 +1,26 @@
+"""add empty_poll_streak to sources for adaptive polling
+
+Revision ID: 20261018_source_poll_streak
+Revises: 20261018_source_registry
+Create Date: 2026-10-18 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_source_poll_streak'
+down_revision: Union[str, Sequence[str], None] = '20261018_source_registry'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('empty_poll_streak', sa.Integer(), nullable=False, server_default='0', comment='Consecutive polls that stored nothing new'))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'empty_poll_streak')
@@ -0,0 +1,36 @@
+"""add feed validators and short-circuit counters to sources
+
+Revision ID: 20261018_source_feed_validators
+Revises: 20261018_digest_outbox
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_source_feed_validators'
+down_revision: Union[str, Sequence[str], None] = '20261018_digest_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('feed_etag', sa.String(length=256), nullable=True, comment='ETag of the last processed feed response'))
+    op.add_column('sources', sa.Column('feed_last_modified', sa.String(length=64), nullable=True, comment='Last-Modified of the last processed feed response'))
+    op.add_column('sources', sa.Column('feed_body_hash', sa.String(length=64), nullable=True, comment='SHA-256 of the last processed feed body'))
+    op.add_column('sources', sa.Column('feed_fetch_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('sources', sa.Column('feed_not_modified_count', sa.Integer(), nullable=False, server_default='0', comment='Fetches answered with 304 Not Modified'))
+    op.add_column('sources', sa.Column('feed_unchanged_count', sa.Integer(), nullable=False, server_default='0', comment='Fetches whose body hash matched the last processed one'))
+
+
+def downgrade() -> None:
+    op.drop_column('sources', 'feed_unchanged_count')
+    op.drop_column('sources', 'feed_not_modified_count')
+    op.drop_column('sources', 'feed_fetch_count')
+    op.drop_column('sources', 'feed_body_hash')
+    op.drop_column('sources', 'feed_last_modified')
+    op.drop_column('sources', 'feed_etag')
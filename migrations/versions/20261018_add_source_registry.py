@@ -0,0 +1,79 @@
+"""add ingestion registry columns to sources
+
+Revision ID: 20261018_source_registry
+Revises: 20261018_source_feed_validators
+Create Date: 2026-10-18 15:00:00
+
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_source_registry'
+down_revision: Union[str, Sequence[str], None] = '20261018_source_feed_validators'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Feeds that used to be hard-coded in parse_* tasks and their beat entries.
+SEEDED_SOURCES = [
+    ("Hacker News", "https://news.ycombinator.com/", "hackernews", 200),
+    ("TechCrunch", "https://techcrunch.com/feed/", "techcrunch", 200),
+    ("The Verge", "https://www.theverge.com/rss/index.xml", "rss", 300),
+    ("Engadget", "https://www.engadget.com/rss.xml", "rss", 300),
+    ("WIRED", "https://www.wired.com/feed/rss", "rss", 300),
+]
+
+
+def upgrade() -> None:
+    op.add_column('sources', sa.Column('parser_kind', sa.String(length=32), nullable=False, server_default='rss', comment='Ingestion parser: rss, techcrunch or hackernews'))
+    op.add_column('sources', sa.Column('ingest_enabled', sa.Boolean(), nullable=False, server_default=sa.text('true'), comment='Poll this source for new items'))
+    op.add_column('sources', sa.Column('poll_interval_seconds', sa.Integer(), nullable=False, server_default='300'))
+    op.add_column('sources', sa.Column('last_polled_at', sa.DateTime(), nullable=True))
+    op.add_column('sources', sa.Column('next_poll_at', sa.DateTime(), nullable=True, comment='When the source is next due; NULL means due now'))
+    op.create_index('ix_sources_ingest_due', 'sources', ['ingest_enabled', 'next_poll_at'], unique=False)
+
+    bind = op.get_bind()
+    for name, url, parser_kind, interval in SEEDED_SOURCES:
+        updated = bind.execute(
+            sa.text(
+                "UPDATE sources SET parser_kind = :kind, poll_interval_seconds = :interval WHERE name = :name"
+            ),
+            {
+                "name": name,
+                "kind": parser_kind,
+                "interval": interval,
+            },
+        )
+        if updated.rowcount:
+            continue
+        bind.execute(
+            sa.text(
+                """
+                INSERT INTO sources (id, name, url, default_language, is_active, parser_kind, poll_interval_seconds, created_at, updated_at)
+                VALUES (:id, :name, :url, 'en', TRUE, :kind, :interval, NOW(), NOW())
+                """
+            ),
+            {
+                "id": str(uuid.uuid4()),
+                "name": name,
+                "url": url,
+                "kind": parser_kind,
+                "interval": interval,
+            },
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sources_ingest_due', table_name='sources')
+    op.drop_column('sources', 'next_poll_at')
+    op.drop_column('sources', 'last_polled_at')
+    op.drop_column('sources', 'poll_interval_seconds')
+    op.drop_column('sources', 'ingest_enabled')
+    op.drop_column('sources', 'parser_kind')
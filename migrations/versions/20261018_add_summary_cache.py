@@ -0,0 +1,44 @@
+"""add content hashes to news_items and the summary_cache table
+
+Revision ID: 20261018_summary_cache
+Revises: 20261018_news_item_enrichment
+Create Date: 2026-10-18 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_summary_cache'
+down_revision: Union[str, Sequence[str], None] = '20261018_news_item_enrichment'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news_items', sa.Column('content_hash', sa.String(length=64), nullable=True, comment='sha256 of normalized content'))
+    op.add_column('news_items', sa.Column('summary_content_hash', sa.String(length=64), nullable=True, comment='content_hash the current summary was made from'))
+    op.create_index(op.f('ix_news_items_content_hash'), 'news_items', ['content_hash'], unique=False)
+
+    op.create_table(
+        'summary_cache',
+        sa.Column('id', sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=64), nullable=False),
+        sa.Column('prompt_version', sa.String(length=32), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash', 'model', 'prompt_version', name='uq_summary_cache_key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('summary_cache')
+    op.drop_index(op.f('ix_news_items_content_hash'), table_name='news_items')
+    op.drop_column('news_items', 'summary_content_hash')
+    op.drop_column('news_items', 'content_hash')
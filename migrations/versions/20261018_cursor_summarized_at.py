@@ -0,0 +1,34 @@
+"""key delivery cursors on news_items.summarized_at
+
+Revision ID: 20261018_cursor_summarized_at
+Revises: 20261018_summary_cache
+Create Date: 2026-10-18 22:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_cursor_summarized_at'
+down_revision: Union[str, Sequence[str], None] = '20261018_summary_cache'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news_items', sa.Column('summarized_at', sa.DateTime(), nullable=True, comment='When the current summary was committed; delivery cursor key'))
+    # Existing cursors hold fetched_at values; keep their positions valid.
+    op.execute("UPDATE news_items SET summarized_at = fetched_at WHERE summary IS NOT NULL")
+    op.create_index('ix_news_items_source_summarized', 'news_items', ['source_id', 'summarized_at'], unique=False)
+    op.alter_column('delivery_cursors', 'last_fetched_at', new_column_name='last_summarized_at')
+    op.create_index('ix_digests_subscription_url', 'digests', ['subscription_id', 'url'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_digests_subscription_url', table_name='digests')
+    op.alter_column('delivery_cursors', 'last_summarized_at', new_column_name='last_fetched_at')
+    op.drop_index('ix_news_items_source_summarized', table_name='news_items')
+    op.drop_column('news_items', 'summarized_at')
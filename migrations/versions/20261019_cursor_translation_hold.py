@@ -0,0 +1,32 @@
+"""hold delivery cursors before items waiting for a translation
+
+Revision ID: 20261019_cursor_translation_hold
+Revises: 20261018_cursor_summarized_at
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_cursor_translation_hold'
+down_revision: Union[str, Sequence[str], None] = '20261018_cursor_summarized_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('delivery_cursors', sa.Column('held_summarized_at', sa.DateTime(), nullable=True, comment='summarized_at of the earliest item waiting for a translation; the cursor stays before it'))
+    op.add_column('delivery_cursors', sa.Column('held_news_item_id', sa.dialects.postgresql.UUID(as_uuid=True), sa.ForeignKey('news_items.id', ondelete='SET NULL'), nullable=True))
+    # A hold can be recorded before anything was delivered.
+    op.alter_column('delivery_cursors', 'last_summarized_at', existing_type=sa.DateTime(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM delivery_cursors WHERE last_summarized_at IS NULL")
+    op.alter_column('delivery_cursors', 'last_summarized_at', existing_type=sa.DateTime(), nullable=False)
+    op.drop_column('delivery_cursors', 'held_news_item_id')
+    op.drop_column('delivery_cursors', 'held_summarized_at')
@@ -0,0 +1,26 @@
+"""count fallback summaries per news item
+
+Revision ID: 20261019_summary_attempts
+Revises: 20261019_cursor_translation_hold
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261019_summary_attempts'
+down_revision: Union[str, Sequence[str], None] = '20261019_cursor_translation_hold'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news_items', sa.Column('summary_attempts', sa.Integer(), nullable=False, server_default='0', comment='Fallback summaries made in a row for the current content'))
+
+
+def downgrade() -> None:
+    op.drop_column('news_items', 'summary_attempts')
@@ -0,0 +1,111 @@
+"""Compare article extraction backends on throughput and latency.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_extraction.py urls.txt \
+        [--backends fulltextrss trafilatura] [--concurrency 8] [--limit 100]
+
+`urls.txt` holds one article URL per line. The cache is bypassed so every
+backend does the full fetch + extraction for every URL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+from app.services.extractors import EXTRACTOR_BACKENDS, build_extractor
+from app.services.ingestion import AsyncFetcher
+
+
+async def _timed(
+    extractor,
+    fetcher: AsyncFetcher,
+    url: str,
+) -> Tuple[float, Optional[str]]:
+    started = time.perf_counter()
+    text = await extractor.extract_async(
+        fetcher=fetcher,
+        url=url,
+        use_cache=False,
+    )
+    return time.perf_counter() - started, text
+
+
+async def bench_backend(
+    backend: str,
+    urls: List[str],
+    concurrency: int,
+) -> dict:
+    extractor = build_extractor(
+        backend=backend,
+    )
+    started = time.perf_counter()
+    async with AsyncFetcher(
+        max_concurrency=concurrency,
+    ) as fetcher:
+        results = await asyncio.gather(
+            *(
+                _timed(
+                    extractor=extractor,
+                    fetcher=fetcher,
+                    url=url,
+                )
+                for url in urls
+            )
+        )
+    wall = time.perf_counter() - started
+    latencies = sorted(elapsed for elapsed, _ in results)
+    texts = [text for _, text in results if text]
+    return {
+        "backend": backend,
+        "ok": len(texts),
+        "total": len(urls),
+        "wall_s": round(wall, 2),
+        "items_per_s": round(len(urls) / wall, 2) if wall else None,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+        "avg_chars": int(statistics.mean(len(t) for t in texts)) if texts else 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("urls_file")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(EXTRACTOR_BACKENDS),
+        choices=list(EXTRACTOR_BACKENDS),
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with open(args.urls_file, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip()][: args.limit]
+    if not urls:
+        raise SystemExit("no URLs to benchmark")
+
+    for backend in args.backends:
+        row = asyncio.run(
+            bench_backend(
+                backend=backend,
+                urls=urls,
+                concurrency=args.concurrency,
+            )
+        )
+        print(
+            "{backend:<12} ok={ok}/{total} wall={wall_s}s "
+            "rate={items_per_s}/s p50={p50_ms}ms p95={p95_ms}ms "
+            "avg_chars={avg_chars}".format(**row)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Benchmark the streaming feed parser against the previous lxml.html parser.
+
+Usage (from the repository root):
+    python -m scripts.bench_feed_parser [fixtures...] \
+        [--limit 50] [--rounds 200]
+    python -m scripts.bench_feed_parser --record URL NAME
+
+Fixtures default to `scripts/fixtures/feeds/*.xml`. The bundled ones are
+synthetic (generated WordPress-style RSS 2.0 and blog-style Atom, 40 entries
+each), not captures of live feeds; record real feeds with `--record` for
+numbers that reflect production markup. The baseline reproduces the old `_parse_rss_items`: an HTML
+parse of the whole document, seven XPath queries per `<item>`, and text
+conversion of both bodies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import time
+from typing import Callable, List, Optional
+
+from lxml import html as lh
+
+from app.services.ingestion import html_to_text, parse_feed
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "feeds")
+
+
+def legacy_parse(
+    content: bytes,
+    limit: int,
+) -> List[dict]:
+    def text_or_none(value: object) -> Optional[str]:
+        text = str(value).strip() if value is not None else ""
+        return text or None
+
+    root = lh.fromstring(content)
+    items = []
+    ns = {"content": "http://purl.org/rss/1.0/modules/content/"}
+    for item_el in root.xpath("//item")[:limit]:
+        item = {
+            "title": text_or_none(item_el.xpath("string(title)")),
+            "link": text_or_none(item_el.xpath("string(link)")),
+            "guid": text_or_none(item_el.xpath("string(guid)")),
+            "pubDate": text_or_none(item_el.xpath("string(pubDate)")),
+            "content_encoded": (
+                text_or_none(item_el.xpath("string(.//content:encoded)", namespaces=ns))
+                or text_or_none(
+                    item_el.xpath(
+                        "string(.//*[local-name() = 'encoded' and namespace-uri() = 'http://purl.org/rss/1.0/modules/content/'])",
+                    )
+                )
+            ),
+            "description": text_or_none(item_el.xpath("string(description)")),
+        }
+        item["content_text"] = html_to_text(item["content_encoded"])
+        item["description_text"] = html_to_text(item["description"])
+        items.append(item)
+    return items
+
+
+def streaming_parse(
+    content: bytes,
+    limit: int,
+) -> List[object]:
+    entries = parse_feed(
+        content=content,
+        limit=limit,
+    )
+    for entry in entries:
+        # What GenericRssParser converts: the body, description only as fallback.
+        entry.content_text() or entry.description_text()
+    return entries
+
+
+def measure(
+    fn: Callable[[bytes, int], list],
+    content: bytes,
+    limit: int,
+    rounds: int,
+) -> dict:
+    count = len(fn(content, limit))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn(content, limit)
+    per_call = (time.perf_counter() - started) / rounds
+    return {
+        "entries": count,
+        "ms": round(per_call * 1000, 3),
+    }
+
+
+def record(
+    url: str,
+    name: str,
+) -> None:
+    from app.services import http as http_client
+
+    resp = http_client.request("GET", url)
+    resp.raise_for_status()
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    path = os.path.join(FIXTURES_DIR, f"{name}.xml")
+    with open(path, "wb") as f:
+        f.write(resp.content)
+    print(f"saved {len(resp.content)} bytes to {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("fixtures", nargs="*")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--record", nargs=2, metavar=("URL", "NAME"))
+    args = parser.parse_args()
+
+    if args.record:
+        record(*args.record)
+        return
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.xml")))
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+        name = os.path.basename(path)
+        for label, fn in (("legacy", legacy_parse), ("streaming", streaming_parse)):
+            row = measure(
+                fn=fn,
+                content=content,
+                limit=args.limit,
+                rounds=args.rounds,
+            )
+            print(
+                f"{name:<24} {label:<10} entries={row['entries']:<4} "
+                f"{row['ms']:>8.3f} ms/feed"
+            )
+
+
+if __name__ == "__main__":
+    main()
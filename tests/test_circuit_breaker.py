@@ -0,0 +1,91 @@
+import time
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.llm import circuit_breaker
+from app.services.llm.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(circuit_breaker, "get_redis", lambda: client)
+    return client
+
+
+def _breaker(
+    open_seconds: float = 60,
+) -> CircuitBreaker:
+    return CircuitBreaker(
+        name="test",
+        error_rate=0.5,
+        slow_seconds=1.0,
+        slow_rate=0.5,
+        min_calls=4,
+        open_seconds=open_seconds,
+    )
+
+
+def test_breaker_waits_for_min_calls(redis_client):
+    breaker = _breaker()
+
+    opened = [breaker.record(ok=False, elapsed_seconds=0.1) for _ in range(3)]
+
+    assert opened == [False, False, False]
+    assert not breaker.is_open()
+
+
+def test_breaker_opens_on_error_rate_and_starts_a_fresh_window(redis_client):
+    breaker = _breaker()
+    for ok in (True, True, False):
+        assert not breaker.record(ok=ok, elapsed_seconds=0.1)
+
+    assert breaker.record(ok=False, elapsed_seconds=0.1)
+    assert breaker.is_open()
+    assert redis_client.keys("llm:breaker:test:*") == ["llm:breaker:test:open"]
+
+
+def test_breaker_opens_on_slow_calls(redis_client):
+    breaker = _breaker()
+    for elapsed in (0.1, 0.1, 2.0):
+        breaker.record(ok=True, elapsed_seconds=elapsed)
+
+    assert breaker.record(ok=True, elapsed_seconds=2.0)
+    assert breaker.is_open()
+
+
+def test_healthy_calls_keep_the_breaker_closed(redis_client):
+    breaker = _breaker()
+
+    assert not any(breaker.record(ok=True, elapsed_seconds=0.1) for _ in range(10))
+    assert not breaker.is_open()
+
+
+def test_breaker_closes_after_open_seconds(redis_client):
+    breaker = _breaker(open_seconds=0.05)
+    for _ in range(4):
+        breaker.record(ok=False, elapsed_seconds=0.1)
+    assert breaker.is_open()
+
+    time.sleep(0.1)
+
+    assert not breaker.is_open()
+    # The next window is judged afresh.
+    assert not breaker.record(ok=False, elapsed_seconds=0.1)
+
+
+def test_redis_errors_keep_the_breaker_closed(monkeypatch):
+    class DownRedis:
+        def exists(self, *keys):
+            raise RedisConnectionError("down")
+
+        def register_script(self, script):
+            raise RedisConnectionError("down")
+
+    monkeypatch.setattr(circuit_breaker, "get_redis", DownRedis)
+    breaker = _breaker()
+
+    assert not breaker.record(ok=False, elapsed_seconds=0.1)
+    assert not breaker.is_open()
@@ -0,0 +1,194 @@
+import uuid
+from datetime import datetime, timedelta
+
+from app.db.models import DigestStatus
+from app.repositories import delivery_cursors as delivery_cursors_repo
+from app.services.telegram import OutgoingMessage, SendResult
+from app.tasks import news_tasks
+from tests.conftest import compiled_params, row
+
+T0 = datetime(2026, 10, 18, 12, 0, 0)
+
+
+def _item_row(
+    subscription_id,
+    group_id,
+    minutes: int,
+    held=None,
+):
+    return row(
+        subscription_id=subscription_id,
+        message_group_id=group_id,
+        summarized_at=T0 + timedelta(minutes=minutes),
+        news_item_id=uuid.uuid4(),
+        held_summarized_at=held[0] if held else None,
+        held_news_item_id=held[1] if held else None,
+    )
+
+
+def _cursor_positions(stmt) -> dict:
+    params = compiled_params(stmt)
+    positions = {}
+    index = 0
+    while f"subscription_id_m{index}" in params:
+        positions[params[f"subscription_id_m{index}"]] = (
+            params[f"last_summarized_at_m{index}"],
+            params[f"last_news_item_id_m{index}"],
+        )
+        index += 1
+    return positions
+
+
+def test_advance_after_send_moves_to_last_sent_item(fake_db):
+    sub = uuid.uuid4()
+    g1, g2 = uuid.uuid4(), uuid.uuid4()
+    first = _item_row(sub, g1, 1)
+    second = _item_row(sub, g2, 2)
+    fake_db.queue([first, second])
+
+    written = delivery_cursors_repo.advance_after_send(
+        db=fake_db,
+        sent_group_ids=[g1, g2],
+    )
+
+    assert written == 1
+    insert = fake_db.statements[-1]
+    assert _cursor_positions(insert) == {
+        sub: (second.summarized_at, second.news_item_id),
+    }
+
+
+def test_advance_after_send_stops_before_failed_item(fake_db):
+    sub, other = uuid.uuid4(), uuid.uuid4()
+    sent_early, failed, sent_late, other_sent = (uuid.uuid4() for _ in range(4))
+    early = _item_row(sub, sent_early, 1)
+    fake_db.queue(
+        [
+            early,
+            _item_row(sub, failed, 2),
+            _item_row(sub, sent_late, 3),
+            _item_row(other, other_sent, 3),
+        ]
+    )
+
+    written = delivery_cursors_repo.advance_after_send(
+        db=fake_db,
+        sent_group_ids=[sent_early, sent_late, other_sent],
+        failed_group_ids=[failed],
+    )
+
+    assert written == 2
+    positions = _cursor_positions(fake_db.statements[-1])
+    # The failed item stays after the cursor so it is planned again.
+    assert positions[sub] == (early.summarized_at, early.news_item_id)
+    assert positions[other][0] == T0 + timedelta(minutes=3)
+
+
+def test_advance_after_send_stops_before_translation_hold(fake_db):
+    sub = uuid.uuid4()
+    g1, g2 = uuid.uuid4(), uuid.uuid4()
+    # An untranslated item summarized at minute 2 is waiting; minute 3 went out.
+    hold = (T0 + timedelta(minutes=2), uuid.uuid4())
+    early = _item_row(sub, g1, 1, held=hold)
+    fake_db.queue([early, _item_row(sub, g2, 3, held=hold)])
+
+    written = delivery_cursors_repo.advance_after_send(
+        db=fake_db,
+        sent_group_ids=[g1, g2],
+    )
+
+    assert written == 1
+    assert _cursor_positions(fake_db.statements[-1]) == {
+        sub: (early.summarized_at, early.news_item_id),
+    }
+    assert "LEFT OUTER JOIN delivery_cursors" in fake_db.sql()[0]
+
+
+def test_set_holds_sets_and_clears_without_moving_cursor(fake_db):
+    held_sub, cleared_sub = uuid.uuid4(), uuid.uuid4()
+    hold = (T0, uuid.uuid4())
+
+    delivery_cursors_repo.set_holds(
+        db=fake_db,
+        holds={held_sub: hold, cleared_sub: None},
+    )
+
+    stmt = fake_db.statements[-1]
+    params = compiled_params(stmt)
+    assert (params["held_summarized_at_m0"], params["held_news_item_id_m0"]) == hold
+    assert params["held_summarized_at_m1"] is None
+    sql = fake_db.sql()[-1]
+    update = sql.split("DO UPDATE SET", 1)[1]
+    assert "held_summarized_at = excluded.held_summarized_at" in update
+    assert "last_summarized_at" not in update
+
+
+def test_advance_after_send_only_failures_writes_nothing(fake_db):
+    sub, failed = uuid.uuid4(), uuid.uuid4()
+    fake_db.queue([_item_row(sub, failed, 1)])
+
+    assert delivery_cursors_repo.advance_after_send(
+        db=fake_db,
+        sent_group_ids=[],
+        failed_group_ids=[failed],
+    ) == 0
+    assert fake_db.statements == []
+
+
+def test_advance_after_send_upsert_never_moves_backwards(fake_db):
+    sub, group = uuid.uuid4(), uuid.uuid4()
+    fake_db.queue([_item_row(sub, group, 1)])
+
+    delivery_cursors_repo.advance_after_send(
+        db=fake_db,
+        sent_group_ids=[group],
+    )
+
+    sql = fake_db.sql()[-1]
+    assert "ON CONFLICT (subscription_id) DO UPDATE" in sql
+    assert "delivery_cursors.last_summarized_at < excluded.last_summarized_at" in sql
+
+
+def test_record_digest_queues_without_moving_cursor(fake_db):
+    digest = news_tasks._record_digest(
+        db=fake_db,
+        user_id=uuid.uuid4(),
+        subscription_id=uuid.uuid4(),
+        title="Title",
+        url="https://example.com/a",
+        summary="Summary",
+    )
+
+    assert fake_db.added == [digest]
+    assert digest.status == DigestStatus.PENDING
+    assert fake_db.statements == []
+
+
+def test_apply_send_results_advances_cursors_for_sent_groups(fake_db):
+    sub = uuid.uuid4()
+    sent_group, failed_group = uuid.uuid4(), uuid.uuid4()
+    results = [
+        SendResult(
+            message=OutgoingMessage(chat_id="1", text="a", ref=sent_group),
+            ok=True,
+            message_id=10,
+        ),
+        SendResult(
+            message=OutgoingMessage(chat_id="1", text="b", ref=failed_group),
+            ok=False,
+            error="Forbidden",
+        ),
+    ]
+    # mark_sent, mark_failed, then the cursor lookup.
+    fake_db.queue([], [], [_item_row(sub, sent_group, 1)])
+
+    news_tasks._apply_send_results(
+        db=fake_db,
+        results=results,
+    )
+
+    sql = fake_db.sql()
+    assert sql[0].startswith("UPDATE digests")
+    assert sql[1].startswith("UPDATE digests")
+    assert "FROM digests JOIN subscriptions" in sql[2]
+    assert sql[3].startswith("INSERT INTO delivery_cursors")
@@ -0,0 +1,113 @@
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.db.models import Digest, DigestStatus
+from app.repositories import digests as digests_repo
+from app.services.telegram import SendResult
+from app.tasks import news_tasks
+from tests.conftest import compile_sql
+
+
+def _lead(
+    chat_id: str,
+) -> Digest:
+    digest_id = uuid.uuid4()
+    return Digest(
+        id=digest_id,
+        message_group_id=digest_id,
+        subscription_id=uuid.uuid4(),
+        chat_id=chat_id,
+        title="Title",
+        summary="Summary",
+        url="https://example.com/a",
+        message_text=f"text for {chat_id}",
+        disable_notification=False,
+        scheduled_for=datetime(2026, 10, 18),
+        status=DigestStatus.PENDING,
+    )
+
+
+class FakeSender:
+    def __init__(
+        self,
+        failing_chats=(),
+    ) -> None:
+        self.failing_chats = set(failing_chats)
+        self.batches = []
+
+    async def send_many(
+        self,
+        messages,
+    ):
+        self.batches.append(messages)
+        return [
+            SendResult(
+                message=m,
+                ok=m.chat_id not in self.failing_chats,
+                message_id=1,
+            )
+            for m in messages
+        ]
+
+
+@pytest.fixture
+def outbox(monkeypatch, fake_db):
+    sender = FakeSender(failing_chats={"2"})
+    monkeypatch.setattr(news_tasks, "SessionLocalSync", lambda: fake_db)
+    monkeypatch.setattr(
+        news_tasks,
+        "telegram_runtime",
+        SimpleNamespace(
+            run=asyncio.run,
+            get_sender=lambda: sender,
+        ),
+    )
+    return sender
+
+
+def test_claim_pending_locks_due_lead_rows_skipping_locked(fake_db):
+    digests_repo.claim_pending(
+        db=fake_db,
+        limit=50,
+        now=datetime(2026, 10, 18),
+    )
+
+    sql = fake_db.sql()[0]
+    assert sql.endswith("FOR UPDATE SKIP LOCKED")
+    assert "digests.message_group_id = digests.id" in sql
+    assert "digests.scheduled_for <= %(scheduled_for_1)s" in sql
+    assert "ORDER BY digests.scheduled_for ASC, digests.id ASC LIMIT %(param_1)s" in sql
+
+
+def test_send_pending_digests_delivers_claimed_batch(outbox, fake_db):
+    leads = [_lead("1"), _lead("2")]
+    # claim, mark_sent, mark_failed, cursor lookup
+    fake_db.queue(leads, [], [], [])
+
+    delivered = news_tasks.send_pending_digests(
+        batch_size=10,
+        max_batches=5,
+    )
+
+    assert delivered == 2
+    assert [m.chat_id for m in outbox.batches[0]] == ["1", "2"]
+    assert [m.ref for m in outbox.batches[0]] == [lead.id for lead in leads]
+    assert fake_db.commits == 1
+    sent_update, failed_update = fake_db.statements[1:3]
+    assert "status=%(status)s" in compile_sql(sent_update).replace(" ", "")
+    assert "digests.message_group_id IN" in compile_sql(failed_update)
+
+
+def test_send_pending_digests_stops_on_empty_outbox(outbox, fake_db):
+    fake_db.queue([])
+
+    assert news_tasks.send_pending_digests(
+        batch_size=10,
+        max_batches=5,
+    ) == 0
+    assert outbox.batches == []
+    assert fake_db.commits == 1
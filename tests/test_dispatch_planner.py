@@ -0,0 +1,225 @@
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.utils import QueryCounter
+from app.services.dispatch import planner as planner_module
+from app.services.dispatch.planner import DispatchPlanner
+from app.tasks import news_tasks
+from tests.conftest import row
+
+NOW = datetime(2026, 10, 18, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def _no_query_counting(monkeypatch):
+    @contextmanager
+    def count_queries(db):
+        yield QueryCounter()
+
+    monkeypatch.setattr(planner_module, "count_queries", count_queries)
+
+
+def _subscription_row(
+    user_id,
+    telegram_id: str,
+    language: str = "en",
+    active_count: int = 1,
+    has_premium: bool = False,
+):
+    return row(
+        subscription_id=uuid.uuid4(),
+        user_id=user_id,
+        source_id=uuid.uuid4(),
+        language=language,
+        telegram_id=telegram_id,
+        active_count=active_count,
+        has_premium=has_premium,
+    )
+
+
+def _item_row(
+    subscription_id,
+    language: str,
+    summary: str,
+    summary_translated=None,
+    minutes: int = 0,
+    held=None,
+    waiting=None,
+):
+    return row(
+        subscription_id=subscription_id,
+        language=language,
+        news_item_id=uuid.uuid4(),
+        title="Title",
+        url=f"https://example.com/{uuid.uuid4()}",
+        summary=summary,
+        fetched_at=NOW,
+        summarized_at=NOW + timedelta(minutes=minutes),
+        summary_translated=summary_translated,
+        held_summarized_at=held[0] if held else None,
+        held_news_item_id=held[1] if held else None,
+        waiting_summarized_at=waiting[0] if waiting else None,
+        waiting_news_item_id=waiting[1] if waiting else None,
+    )
+
+
+def _build(fake_db, **kwargs):
+    return DispatchPlanner(
+        db=fake_db,
+    ).build_plan(
+        now=NOW,
+        cutoff=NOW - timedelta(hours=48),
+        max_items_per_subscription=5,
+        fallback_to_en=kwargs.pop("fallback_to_en", False),
+        notice_url="premium://expired-notice",
+        **kwargs,
+    )
+
+
+def test_items_follow_the_summary_cursor_and_skip_queued_digests(fake_db):
+    sub = _subscription_row(uuid.uuid4(), "100")
+    fake_db.queue([sub], [])
+
+    _build(fake_db, max_delivery_attempts=2)
+
+    items_sql = fake_db.sql()[1]
+    assert "news_items.summarized_at > delivery_cursors.last_summarized_at" in items_sql
+    assert "ORDER BY news_items.summarized_at ASC, news_items.id ASC" in items_sql
+    # Correlated to the outer subscription, not a cross join of its own.
+    assert (
+        "NOT (EXISTS (SELECT digests.id FROM digests "
+        "WHERE digests.subscription_id = eligible.subscription_id "
+        "AND digests.url = news_items.url"
+    ) in items_sql
+    assert "(SELECT count(digests.id) AS count_1 FROM digests WHERE" in items_sql
+
+
+def test_plan_groups_items_and_resolves_translations(fake_db):
+    user = uuid.uuid4()
+    en = _subscription_row(user, "100")
+    de = _subscription_row(user, "100", language="de")
+    fake_db.queue(
+        [en, de],
+        [
+            _item_row(en.subscription_id, "en", " English "),
+            _item_row(de.subscription_id, "de", "English", "Deutsch"),
+            _item_row(de.subscription_id, "de", "Untranslated"),
+        ],
+    )
+
+    plan = _build(fake_db)
+
+    assert [s.subscription_id for s in plan.subscriptions_by_chat["100"]] == [
+        en.subscription_id,
+        de.subscription_id,
+    ]
+    assert [i.summary for i in plan.items_by_subscription[en.subscription_id]] == [
+        "English",
+    ]
+    # Missing translation without fallback_to_en is dropped and holds the cursor.
+    assert [i.summary for i in plan.items_by_subscription[de.subscription_id]] == [
+        "Deutsch",
+    ]
+    assert list(plan.cursor_holds) == [de.subscription_id]
+
+
+def test_untranslated_items_are_left_out_and_hold_the_cursor(fake_db):
+    sub = _subscription_row(uuid.uuid4(), "100", language="de")
+    # Item A (minute 1) has no German summary yet; B (minute 2) does.
+    waiting_a = (NOW + timedelta(minutes=1), uuid.uuid4())
+    fake_db.queue(
+        [sub],
+        [
+            _item_row(sub.subscription_id, "de", "B", "B-de", minutes=2, waiting=waiting_a),
+        ],
+    )
+
+    plan = _build(fake_db)
+
+    items_sql = fake_db.sql()[1]
+    # The LIMIT only counts items that can be sent in the subscriber's language.
+    assert "eligible.language = %(language_1)s OR (EXISTS (SELECT news_item_translations.id" in items_sql
+    assert "LEFT OUTER JOIN LATERAL" in items_sql
+    assert [i.summary for i in plan.items_by_subscription[sub.subscription_id]] == [
+        "B-de",
+    ]
+    assert plan.cursor_holds == {sub.subscription_id: waiting_a}
+
+
+def test_cursor_holds_list_only_changes(fake_db):
+    user = uuid.uuid4()
+    kept = _subscription_row(user, "100", language="de", has_premium=True)
+    cleared = _subscription_row(user, "100", language="de", has_premium=True)
+    hold = (NOW, uuid.uuid4())
+    fake_db.queue(
+        [kept, cleared],
+        [
+            _item_row(kept.subscription_id, "de", "x", "x-de", minutes=1, held=hold, waiting=hold),
+            _item_row(cleared.subscription_id, "de", "y", "y-de", minutes=1, held=hold),
+        ],
+    )
+
+    plan = _build(fake_db)
+
+    assert plan.cursor_holds == {cleared.subscription_id: None}
+
+
+def test_fallback_to_en_needs_no_holds(fake_db):
+    sub = _subscription_row(uuid.uuid4(), "100", language="de")
+    fake_db.queue(
+        [sub],
+        [_item_row(sub.subscription_id, "de", "English", minutes=1)],
+    )
+
+    plan = _build(fake_db, fallback_to_en=True)
+
+    # Only the items LATERAL; nothing waits for a translation.
+    assert fake_db.sql()[1].count("LATERAL") == 1
+    assert [i.summary for i in plan.items_by_subscription[sub.subscription_id]] == [
+        "English",
+    ]
+    assert plan.cursor_holds == {}
+
+
+def test_paywalled_users_get_no_items_query(fake_db):
+    sub = _subscription_row(uuid.uuid4(), "100", active_count=2)
+    fake_db.queue([sub], [])
+
+    plan = _build(fake_db)
+
+    assert plan.items_by_subscription == {}
+    assert len(fake_db.statements) == 2
+    assert "premium://expired-notice" not in fake_db.sql()[1]
+    assert "digests.url = %(url_1)s" in fake_db.sql()[1]
+
+
+def test_plan_sends_records_no_digests_past_the_chat_budget(fake_db):
+    user = uuid.uuid4()
+    first = _subscription_row(user, "100", has_premium=True)
+    second = _subscription_row(user, "100", has_premium=True)
+    fake_db.queue(
+        [first, second],
+        [
+            _item_row(sub.subscription_id, "en", f"Story {n}", minutes=n)
+            for sub in (first, second)
+            for n in range(3)
+        ],
+    )
+
+    messages = news_tasks._plan_sends(
+        db=fake_db,
+        now_ts=NOW,
+        cutoff_min_ts=NOW - timedelta(hours=48),
+        max_items_per_subscription=5,
+        fallback_to_en_if_missing=False,
+        max_messages_per_chat_per_run=1,
+        batch_threshold=3,
+    )
+
+    assert len(messages) == 1
+    # Only the batch that was sent has PENDING digests.
+    assert fake_db.added == messages[0].ref
+    assert {d.subscription_id for d in fake_db.added} == {first.subscription_id}
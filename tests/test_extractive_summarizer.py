@@ -0,0 +1,82 @@
+import numpy as np
+
+from app.services.agents.summarizer.backend import SummarizeInput
+from app.services.agents.summarizer.extractive import (
+    ExtractiveSummarizer,
+    textrank_scores,
+)
+
+SENTENCES = [
+    "Regulators approved the merger of the two largest chip makers on Friday.",
+    "The chip makers said the merger will close by the end of the year.",
+    "Shares of both chip makers rose after regulators approved the merger.",
+    "The weather in the capital was unusually warm for the season.",
+    "Critics warned the merger leaves few rival chip makers in the market.",
+]
+
+
+def _summarize(
+    content: str,
+    **kwargs,
+) -> str:
+    return ExtractiveSummarizer(**kwargs).summarize(
+        payload=SummarizeInput(
+            title="Chip merger approved",
+            content=content,
+            url="https://example.com/merger",
+        )
+    )
+
+
+def test_scores_are_a_distribution_favouring_central_sentences():
+    scores = textrank_scores(SENTENCES)
+
+    assert scores.shape == (len(SENTENCES),)
+    assert np.isclose(scores.sum(), 1.0)
+    # The off-topic sentence shares no words with the rest.
+    assert scores[3] == scores.min()
+
+
+def test_single_sentence_gets_all_the_weight():
+    assert textrank_scores(SENTENCES[:1]).tolist() == [1.0]
+
+
+def test_summary_keeps_the_lead_and_article_order():
+    summary = _summarize(" ".join(SENTENCES))
+
+    lines = summary.split("\n")
+    assert len(lines) == 3
+    assert lines[0] == SENTENCES[0]
+    assert SENTENCES[3] not in lines
+    assert lines == sorted(lines, key=SENTENCES.index)
+
+
+def test_summary_respects_the_character_limit():
+    summary = _summarize(
+        " ".join(SENTENCES),
+        max_chars=150,
+    )
+
+    assert len(summary) <= 150
+    assert summary.split("\n")[0] == SENTENCES[0]
+
+
+def test_oversized_sentence_is_cut_at_a_word():
+    summary = _summarize(
+        SENTENCES[0],
+        max_chars=40,
+    )
+
+    assert summary == "Regulators approved the merger of the…"
+
+
+def test_boilerplate_never_reaches_the_summary():
+    content = "\n".join(
+        [SENTENCES[0], "Subscribe to our newsletter for more chip news"] + SENTENCES[1:]
+    )
+
+    assert "Subscribe" not in _summarize(content)
+
+
+def test_empty_content_falls_back_to_the_title():
+    assert _summarize("") == "Chip merger approved"
@@ -0,0 +1,117 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.services.ingestion.feed_parser import parse_feed, parse_feed_date
+
+FIXTURES = Path(__file__).resolve().parents[1] / "scripts" / "fixtures" / "feeds"
+
+RSS2 = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+  <title>Feed</title>
+  <link>https://example.com/</link>
+  <item>
+    <title>First story</title>
+    <link>https://example.com/1</link>
+    <guid isPermaLink="false">https://example.com/?p=1</guid>
+    <pubDate>Sun, 18 Oct 2026 09:30:00 +0000</pubDate>
+    <description><![CDATA[<p>Short <b>teaser</b>.</p>]]></description>
+    <content:encoded><![CDATA[<p>Full   body <i>text</i></p>]]></content:encoded>
+  </item>
+  <item>
+    <title>Second story</title>
+    <link>https://example.com/2</link>
+  </item>
+</channel>
+</rss>
+"""
+
+RSS1 = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.org/">
+    <title>Feed</title>
+    <link>https://example.org/</link>
+  </channel>
+  <item rdf:about="https://example.org/a">
+    <title>RDF story</title>
+    <link>https://example.org/a</link>
+    <description>Plain description</description>
+    <dc:date>2026-10-18T09:30:00Z</dc:date>
+  </item>
+</rdf:RDF>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Feed</title>
+  <entry>
+    <title>Atom story</title>
+    <link rel="self" href="https://blog.example.com/self/1"/>
+    <link href="https://blog.example.com/posts/1"/>
+    <id>tag:blog.example.com,2026:post-1</id>
+    <updated>2026-10-18T10:00:00Z</updated>
+    <summary type="html">&lt;p&gt;Summary&lt;/p&gt;</summary>
+    <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Rich body</p></div></content>
+  </entry>
+</feed>
+"""
+
+OCT_18_0930 = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+
+def test_rss2_entry_fields():
+    first, second = parse_feed(RSS2)
+
+    assert first.title == "First story"
+    assert first.link == "https://example.com/1"
+    assert first.external_id == "https://example.com/?p=1"
+    assert first.published_at == OCT_18_0930
+    assert first.description_text() == "Short teaser."
+    assert first.content_text() == "Full body text"
+    assert second.external_id == "https://example.com/2"
+    assert second.published_at is None
+    assert second.content_text() is None
+
+
+def test_rss1_entry_fields():
+    (entry,) = parse_feed(RSS1)
+
+    assert entry.title == "RDF story"
+    assert entry.external_id == "https://example.org/a"
+    assert entry.description_text() == "Plain description"
+    assert entry.published_at == OCT_18_0930
+
+
+def test_atom_entry_prefers_alternate_link_and_reads_xhtml():
+    (entry,) = parse_feed(ATOM)
+
+    assert entry.title == "Atom story"
+    assert entry.link == "https://blog.example.com/posts/1"
+    assert entry.external_id == "tag:blog.example.com,2026:post-1"
+    assert entry.published_at == datetime(2026, 10, 18, 10, 0, tzinfo=timezone.utc)
+    assert entry.description_text() == "Summary"
+    assert entry.content_text() == "Rich body"
+
+
+def test_limit_stops_after_that_many_entries():
+    assert [e.title for e in parse_feed(RSS2, limit=1)] == ["First story"]
+    assert parse_feed(RSS2, limit=0) == []
+
+
+def test_broken_document_yields_what_was_read():
+    truncated = RSS2[: RSS2.index(b"<item>", RSS2.index(b"</item>"))] + b"<item><title>cut"
+
+    assert [e.title for e in parse_feed(truncated)][:1] == ["First story"]
+
+
+def test_fixture_feeds_parse_completely():
+    for name in ("wordpress_rss.xml", "blog_atom.xml"):
+        entries = parse_feed((FIXTURES / name).read_bytes())
+        assert len(entries) == 40
+        assert all(e.title and e.link and e.published_at for e in entries)
+
+
+def test_unparseable_date_is_none():
+    assert parse_feed_date("yesterday") is None
@@ -0,0 +1,133 @@
+import uuid
+from datetime import datetime
+
+from app.db.models import EnrichmentStatus
+from app.repositories import summary_cache as summary_cache_repo
+from app.services.ingestion.hashing import compute_content_hash
+from app.services.ingestion.writer import (
+    ParsedItem,
+    StoredContent,
+    existing_content,
+    upsert_items,
+)
+from tests.conftest import compile_sql, compiled_params, row
+
+SOURCE_ID = uuid.uuid4()
+
+
+def _item(
+    external_id: str,
+    content: str = "Body text",
+    needs_enrichment: bool = False,
+) -> ParsedItem:
+    return ParsedItem(
+        external_id=external_id,
+        title=f"Title {external_id}",
+        url=f"https://example.com/{external_id}",
+        content=content,
+        fetched_at=datetime(2026, 10, 18),
+        needs_enrichment=needs_enrichment,
+    )
+
+
+def _on_conflict(sql: str) -> str:
+    return sql[sql.index("ON CONFLICT"):]
+
+
+def test_upsert_inserts_each_external_id_once(fake_db):
+    fake_db.queue([None, None])
+
+    affected = upsert_items(
+        db=fake_db,
+        source_id=SOURCE_ID,
+        items=[
+            _item("a"),
+            _item("a", content="Later duplicate"),
+            _item("b", content="", needs_enrichment=True),
+        ],
+    )
+
+    assert affected == 2
+    params = compiled_params(fake_db.statements[0])
+    assert params["external_id_m0"] == "a"
+    assert params["content_m0"] == "Body text"
+    assert params["content_hash_m0"] == compute_content_hash(content="Body text")
+    assert params["external_id_m1"] == "b"
+    assert params["content_m1"] is None
+    assert params["content_hash_m1"] is None
+    assert params["enrichment_status_m1"] is EnrichmentStatus.PENDING
+    assert "external_id_m2" not in params
+
+
+def test_upsert_only_backfills_missing_content_and_title(fake_db):
+    upsert_items(
+        db=fake_db,
+        source_id=SOURCE_ID,
+        items=[_item("a")],
+    )
+
+    conflict = _on_conflict(fake_db.sql()[0])
+    assert conflict.startswith("ON CONFLICT ON CONSTRAINT uq_news_item_source_external DO UPDATE")
+    assert "content = coalesce(nullif(trim(news_items.content)" in conflict
+    assert "content_hash = CASE WHEN" in conflict
+    assert "WHERE coalesce(length(trim(news_items.content)), %(coalesce_" in conflict
+    assert " OR coalesce(length(trim(news_items.title))" in conflict
+    assert "IS DISTINCT FROM" not in conflict
+
+
+def test_replace_changed_overwrites_only_a_different_hash(fake_db):
+    upsert_items(
+        db=fake_db,
+        source_id=SOURCE_ID,
+        items=[_item("a")],
+        replace_changed=True,
+    )
+
+    conflict = _on_conflict(fake_db.sql()[0])
+    assert "content = excluded.content" in conflict
+    assert "content_hash = excluded.content_hash" in conflict
+    assert conflict.endswith(
+        "WHERE excluded.content_hash IS NOT NULL"
+        " AND news_items.content_hash IS DISTINCT FROM excluded.content_hash"
+    )
+
+
+def test_empty_batch_runs_no_statement(fake_db):
+    assert upsert_items(
+        db=fake_db,
+        source_id=SOURCE_ID,
+        items=[],
+    ) == 0
+    assert fake_db.statements == []
+
+
+def test_existing_content_reads_flags_and_hashes_in_one_query(fake_db):
+    fake_db.queue(
+        [
+            row(external_id="a", has_content=True, content_hash="hash-a"),
+            row(external_id="b", has_content=False, content_hash=None),
+        ]
+    )
+
+    stored = existing_content(
+        db=fake_db,
+        source_id=SOURCE_ID,
+        external_ids=["a", "b", "c", ""],
+    )
+
+    assert stored == {
+        "a": StoredContent(has_content=True, content_hash="hash-a"),
+        "b": StoredContent(has_content=False, content_hash=None),
+    }
+    assert len(fake_db.statements) == 1
+    assert "news_items.content_hash" in fake_db.sql()[0]
+
+
+def test_needs_summary_redoes_provisional_summaries_once_content_exists():
+    sql = compile_sql(summary_cache_repo.needs_summary())
+
+    assert sql == (
+        "news_items.summary IS NULL"
+        " OR news_items.content_hash IS NOT NULL"
+        " AND news_items.content_hash IS DISTINCT FROM news_items.summary_content_hash"
+    )
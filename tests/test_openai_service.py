@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import openai
+import pytest
+from openai import error as openai_error
+
+from app.services.llm.open_ai import service as service_module
+from app.services.llm.open_ai.service import OpenAIChatService, build_messages
+
+
+class SlowBudget:
+    """Rate budget that makes every request queue for a while."""
+
+    def __init__(self, **kwargs) -> None:
+        self.paused = []
+
+    async def acquire(self, tokens):
+        await asyncio.sleep(0.05)
+
+    def pause(self, seconds):
+        self.paused.append(seconds)
+
+    def adjust(self, tokens):
+        pass
+
+
+@pytest.fixture
+def chat_service(monkeypatch):
+    monkeypatch.setattr(
+        service_module,
+        "get_settings",
+        lambda: SimpleNamespace(
+            openai_api_key="sk-test",
+            openai_max_backoff_seconds=0,
+            openai_requests_per_minute=60,
+            openai_tokens_per_minute=10_000,
+        ),
+    )
+    monkeypatch.setattr(service_module, "RateBudget", SlowBudget)
+    return OpenAIChatService(
+        model="gpt-4o-mini",
+        max_retries=2,
+    )
+
+
+def _responses(monkeypatch, *outcomes):
+    pending = list(outcomes)
+
+    async def acreate(**request):
+        outcome = pending.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {"choices": [{"message": {"content": outcome}}], "usage": {}}
+
+    monkeypatch.setattr(openai.ChatCompletion, "acreate", acreate)
+
+
+def _chat(
+    service: OpenAIChatService,
+    requests: list,
+) -> str:
+    return asyncio.run(
+        service.achat(
+            messages=build_messages(
+                system_prompt="system",
+                user_prompt="user",
+            ),
+            on_request=lambda ok, elapsed: requests.append((ok, elapsed)),
+        )
+    )
+
+
+def test_on_request_sees_each_request_without_budget_wait(monkeypatch, chat_service):
+    _responses(monkeypatch, openai_error.APIError("boom"), "summary")
+    requests = []
+
+    assert _chat(chat_service, requests) == "summary"
+    assert [ok for ok, _ in requests] == [False, True]
+    assert all(elapsed < 0.05 for _, elapsed in requests)
+
+
+def test_rate_limit_pauses_without_counting_as_a_failure(monkeypatch, chat_service):
+    _responses(monkeypatch, openai_error.RateLimitError("slow down"), "summary")
+    requests = []
+
+    assert _chat(chat_service, requests) == "summary"
+    assert [ok for ok, _ in requests] == [True]
+    assert len(chat_service.budget.paused) == 1
@@ -0,0 +1,107 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.repositories import source_schedule as source_schedule_repo
+from app.services.ingestion.scheduler import (
+    PollStats,
+    compute_poll_interval,
+    schedule_next_poll,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def _stats(
+    items: int = 24,
+    streak: int = 0,
+    subscribers: int = 9,
+) -> PollStats:
+    return PollStats(
+        items_in_window=items,
+        window_hours=24,
+        empty_poll_streak=streak,
+        subscribers=subscribers,
+    )
+
+
+def _interval(
+    stats: PollStats,
+) -> int:
+    return compute_poll_interval(
+        stats=stats,
+        min_seconds=60,
+        max_seconds=86_400,
+    )
+
+
+def test_interval_is_half_the_gap_scaled_down_by_subscribers():
+    # One item an hour: half the gap is 1800s; 9 subscribers divide by 2.
+    assert _interval(_stats()) == 900
+
+
+def test_source_without_subscribers_waits_the_maximum():
+    assert _interval(_stats(subscribers=0)) == 86_400
+
+
+def test_empty_polls_back_off_up_to_the_step_cap():
+    assert _interval(_stats(streak=2)) == int(900 * 1.5**2)
+    assert _interval(_stats(streak=20)) == _interval(_stats(streak=6))
+
+
+def test_quiet_window_counts_as_one_item():
+    assert _interval(_stats(items=0)) == _interval(_stats(items=1))
+
+
+@pytest.mark.parametrize(
+    "stats, expected",
+    [
+        (_stats(items=10_000), 60),
+        (_stats(items=1, streak=6, subscribers=1), 86_400),
+    ],
+)
+def test_interval_is_clamped(stats, expected):
+    assert _interval(stats) == expected
+
+
+def test_schedule_next_poll_counts_subscribers_of_this_source_only(fake_db):
+    source = SimpleNamespace(
+        id=uuid.uuid4(),
+        name="Example",
+        empty_poll_streak=3,
+    )
+    # items in window, subscribers
+    fake_db.queue([24], [9])
+
+    next_poll = schedule_next_poll(
+        db=fake_db,
+        source=source,
+        new_items=2,
+        now=NOW,
+    )
+
+    assert source.empty_poll_streak == 0
+    assert next_poll == NOW + timedelta(seconds=900)
+    subscribers_sql = fake_db.sql()[1]
+    assert "sum(eligible_source_languages.subscriber_count)" in subscribers_sql
+    assert "WHERE eligible_source_languages.source_id = " in subscribers_sql
+    assert "GROUP BY" not in subscribers_sql
+
+
+def test_poll_now_only_pulls_sources_forward(fake_db):
+    source_schedule_repo.poll_now(
+        db=fake_db,
+        source_ids=[uuid.uuid4()],
+        now=NOW,
+    )
+    source_schedule_repo.poll_now(
+        db=fake_db,
+        source_ids=[],
+        now=NOW,
+    )
+
+    (sql,) = fake_db.sql()
+    assert sql.startswith("UPDATE sources SET next_poll_at=")
+    assert "sources.next_poll_at IS NULL OR sources.next_poll_at >" in sql
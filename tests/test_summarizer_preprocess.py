@@ -0,0 +1,91 @@
+import pytest
+
+from app.services.agents.summarizer import preprocess
+from app.services.agents.summarizer.preprocess import prepare_article, split_sentences
+
+ADTECH = [
+    "Browser makers have spent years phasing out third-party cookies.",
+    "The change has forced the advertising industry to rethink how it targets readers.",
+    "Netflix said its ad-supported tier now reaches 70 million subscribers a month.",
+    "Advertisers pay more for the tier because viewers are logged in and easy to measure.",
+    "Subscribers on the cheaper plan watch about as much as those who pay for no ads.",
+    "Analysts expect the company to squeeze more revenue from the tier next year.",
+]
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    """One token per word, so budgets do not depend on tiktoken."""
+    monkeypatch.setattr(
+        preprocess,
+        "count_tokens",
+        lambda text, model=None: len(text.split()),
+    )
+
+
+def test_prose_about_cookies_and_advertising_survives():
+    assert split_sentences(" ".join(ADTECH)) == ADTECH
+
+
+def test_nav_cookie_and_footer_lines_are_dropped():
+    content = "\n".join(
+        [
+            "Home | Tech | Science | Subscribe",
+            "Sign up for our daily newsletter",
+            "We use cookies to improve your experience. Accept all cookies",
+            ADTECH[0],
+            "Advertisement",
+            ADTECH[1],
+            "Share this article on Facebook",
+            "Read more: The end of third-party tracking",
+            ADTECH[2],
+            "Privacy Policy | Terms of Use | Cookie Settings",
+            "© 2026 Example Media. All rights reserved.",
+        ]
+    )
+
+    assert split_sentences(content) == ADTECH[:3]
+
+
+def test_comment_tail_is_cut_only_at_a_line_start():
+    body = "\n".join(ADTECH)
+    with_comments = body + "\n12 comments\nGreat piece, thanks for writing it up."
+    inline_marker = body + " Readers left 12 comments asking for more from the team."
+
+    assert split_sentences(with_comments) == ADTECH
+    assert split_sentences(inline_marker)[-1] == (
+        "Readers left 12 comments asking for more from the team."
+    )
+
+
+def test_repeated_sentences_are_kept_once():
+    assert split_sentences(f"{ADTECH[0]} {ADTECH[1]} {ADTECH[0]}") == ADTECH[:2]
+
+
+def test_article_within_budget_is_unchanged(word_tokens):
+    content = " ".join(ADTECH)
+
+    prepared = prepare_article(
+        content=content,
+        token_budget=1000,
+    )
+
+    assert prepared.text == content
+    assert not prepared.trimmed
+
+
+def test_long_article_keeps_the_lead_within_budget(word_tokens):
+    filler = [
+        f"Filler sentence number {i} repeats the usual background details."
+        for i in range(40)
+    ]
+    content = " ".join(ADTECH + filler)
+
+    prepared = prepare_article(
+        content=content,
+        token_budget=80,
+    )
+
+    assert prepared.trimmed
+    assert prepared.tokens <= 80
+    assert prepared.text.startswith(" ".join(ADTECH[:3]))
@@ -0,0 +1,208 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.repositories import summary_cache as summary_cache_repo
+from app.services.agents.summarizer import router as router_module
+from app.services.agents.summarizer.backend import SummarizeInput
+from app.services.agents.summarizer.router import SummarizerRouter, SummaryResult
+from app.services.llm import circuit_breaker
+from app.services.llm.circuit_breaker import CircuitBreaker
+from app.tasks import news_tasks
+from tests.conftest import compile_sql, compiled_params
+
+ARTICLE = SummarizeInput(
+    title="Chip export rules",
+    content=(
+        "The government tightened export rules for advanced chips on Monday. "
+        "Chip makers said the rules would cut sales to several markets. "
+        "Analysts expect chip prices to rise as supply tightens."
+    ),
+    url="https://example.com/chips",
+)
+
+
+class FakeLLM:
+    """Backend that reports one provider request per call."""
+
+    name = "fake"
+    model = "fake-model"
+    prompt_version = "v1"
+
+    def __init__(self) -> None:
+        self.queued_seconds = 0.0
+        self.request_seconds = 0.01
+        self.error = None
+        self.calls = 0
+
+    async def asummarize(
+        self,
+        payload,
+        max_output_tokens=512,
+        temperature=0.1,
+        seed=42,
+        on_request=None,
+    ):
+        self.calls += 1
+        # Time spent in the rate budget or backing off, before the request.
+        await asyncio.sleep(self.queued_seconds)
+        if on_request is not None:
+            on_request(self.error is None, self.request_seconds)
+        if self.error is not None:
+            raise self.error
+        return "LLM summary"
+
+    @asynccontextmanager
+    async def session(self):
+        yield
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(circuit_breaker, "get_redis", lambda: client)
+    backend = FakeLLM()
+    monkeypatch.setitem(router_module.SUMMARIZER_BACKENDS, "fake", lambda: backend)
+    return backend
+
+
+@pytest.fixture
+def router(llm) -> SummarizerRouter:
+    summarizer = SummarizerRouter(
+        backend="fake",
+        free_tier_backend="fake",
+    )
+    summarizer._breakers["fake"] = CircuitBreaker(
+        name=f"test:{uuid.uuid4()}",
+        error_rate=0.5,
+        slow_seconds=0.05,
+        slow_rate=0.5,
+        min_calls=1,
+        open_seconds=60,
+    )
+    return summarizer
+
+
+def _summarize(
+    summarizer: SummarizerRouter,
+) -> SummaryResult:
+    async def run():
+        backend = summarizer.backend_for(
+            premium=True,
+        )
+        async for _, result in summarizer.summarize_many(
+            payloads={"a": ARTICLE},
+            backends={"a": backend},
+            concurrency=1,
+        ):
+            return result
+
+    return asyncio.run(run())
+
+
+def test_breaker_ignores_time_spent_before_the_request(router, llm):
+    llm.queued_seconds = 0.1
+
+    result = _summarize(router)
+
+    assert result == SummaryResult(text="LLM summary", model="fake-model", prompt_version="v1")
+    assert not router.degraded()
+
+
+def test_slow_provider_request_opens_the_breaker(router, llm):
+    llm.request_seconds = 0.1
+
+    assert not _summarize(router).fallback
+    assert router.degraded()
+
+
+def test_failed_call_falls_back_and_is_flagged(router, llm):
+    llm.error = RuntimeError("boom")
+
+    result = _summarize(router)
+
+    assert result.fallback
+    assert result.model == "textrank"
+    assert router.degraded()
+
+
+def test_open_breaker_skips_the_backend(router, llm):
+    llm.error = RuntimeError("boom")
+    _summarize(router)
+    llm.error = None
+
+    result = _summarize(router)
+
+    assert result.fallback
+    assert llm.calls == 1
+
+
+def test_configured_extractive_backend_is_not_a_fallback(llm):
+    summarizer = SummarizerRouter(
+        backend="extractive",
+        free_tier_backend="extractive",
+    )
+
+    result = _summarize(summarizer)
+
+    assert result.model == "textrank"
+    assert not result.fallback
+    assert not summarizer.degraded()
+
+
+def test_fallback_summaries_are_stored_as_provisional(monkeypatch, fake_db):
+    committed = []
+    monkeypatch.setattr(
+        news_tasks,
+        "_commit_summaries",
+        lambda db, items: committed.extend(items),
+    )
+    items_by_hash = {
+        "hash-llm": [SimpleNamespace(title="A", content="a", url="u1", summary_attempts=2)],
+        "hash-fallback": [SimpleNamespace(title="B", content="b", url="u2", summary_attempts=1)],
+    }
+
+    class StubRouter:
+        async def summarize_many(self, payloads, backends, concurrency, **kwargs):
+            yield "hash-llm", SummaryResult("s1", "fake-model", "v1")
+            yield "hash-fallback", SummaryResult("s2", "textrank", "t", fallback=True)
+
+    asyncio.run(
+        news_tasks._summarize_concurrently(
+            db=fake_db,
+            summarizer=StubRouter(),
+            items_by_hash=items_by_hash,
+            backends={},
+        )
+    )
+
+    assert [(ni.summary, ni.summary_content_hash, ni.summary_attempts) for ni in committed] == [
+        ("s1", "hash-llm", 0),
+        ("s2", None, 2),
+    ]
+
+
+def test_provisional_summaries_wait_while_degraded():
+    sql = compile_sql(
+        summary_cache_repo.needs_summary(
+            redo_provisional=False,
+        )
+    )
+
+    assert sql.endswith("AND news_items.summary_content_hash IS NOT NULL")
+
+
+def test_fallback_summaries_are_redone_a_bounded_number_of_times():
+    stmt = summary_cache_repo.needs_summary(
+        max_fallback_attempts=3,
+    )
+
+    assert compile_sql(stmt).endswith(
+        "AND (news_items.summary_content_hash IS NOT NULL"
+        " OR news_items.summary_attempts < %(summary_attempts_1)s)"
+    )
+    assert compiled_params(stmt)["summary_attempts_1"] == 3
@@ -0,0 +1,201 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import fakeredis
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.telegram import (
+    OutgoingMessage,
+    SharedRateLimiter,
+    TelegramSender,
+    TokenBucket,
+)
+from app.services.telegram import rate_limit
+
+
+class FakeBot:
+    """Records (chat_id, monotonic time) per call; raises queued errors first."""
+
+    def __init__(
+        self,
+        errors=None,
+    ) -> None:
+        self.errors = dict(errors or {})
+        self.calls = []
+
+    async def send_message(
+        self,
+        chat_id,
+        text,
+        **kwargs,
+    ):
+        self.calls.append((chat_id, time.monotonic()))
+        error = self.errors.pop(chat_id, None)
+        if error is not None:
+            raise error
+        return SimpleNamespace(message_id=len(self.calls))
+
+
+def _retry_after(
+    seconds: float,
+) -> TelegramRetryAfter:
+    error = TelegramRetryAfter(
+        method=SendMessage(chat_id=1, text="x"),
+        message="Too Many Requests",
+        retry_after=1,
+    )
+    error.retry_after = seconds
+    return error
+
+
+def test_bucket_pause_holds_acquire():
+    bucket = TokenBucket(rate=100.0)
+
+    async def run() -> float:
+        bucket.pause(0.2)
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.19
+
+
+def test_retry_after_pauses_every_chat():
+    bot = FakeBot(errors={1: _retry_after(0.3)})
+    sender = TelegramSender(
+        bot=bot,
+        global_rate_per_second=100.0,
+        per_chat_rate_per_second=100.0,
+    )
+
+    async def run():
+        first = asyncio.ensure_future(
+            sender.send_many([OutgoingMessage(chat_id="1", text="a")]),
+        )
+        await asyncio.sleep(0.05)
+        # A different chat queued during the flood wait must wait too.
+        second = await sender.send_many([OutgoingMessage(chat_id="2", text="b")])
+        return await first, second
+
+    started = time.monotonic()
+    first, second = asyncio.run(run())
+
+    assert first[0].ok and first[0].attempts == 2
+    assert second[0].ok
+    chat_two_at = next(at for chat, at in bot.calls if chat == 2)
+    assert chat_two_at - started >= 0.29
+
+
+def test_retry_after_gives_up_after_max_attempts():
+    bot = FakeBot(errors={1: _retry_after(0.01)})
+    sender = TelegramSender(
+        bot=bot,
+        max_attempts=1,
+    )
+
+    results = asyncio.run(
+        sender.send_many([OutgoingMessage(chat_id="1", text="a")]),
+    )
+
+    assert not results[0].ok
+    assert results[0].attempts == 1
+
+
+def test_chat_buckets_are_capped_lru():
+    sender = TelegramSender(
+        bot=FakeBot(),
+        per_chat_rate_per_second=0.001,
+        max_chat_buckets=2,
+    )
+
+    async def run():
+        for chat_id in ("a", "b"):
+            await sender._chat_bucket(chat_id=chat_id).acquire()
+        sender._chat_bucket(chat_id="a")
+        sender._chat_bucket(chat_id="c")
+
+    asyncio.run(run())
+
+    # "b" was least recently used; drained buckets are only evicted past the cap.
+    assert list(sender._chat_buckets) == ["a", "c"]
+
+
+def test_idle_chat_buckets_are_dropped():
+    sender = TelegramSender(
+        bot=FakeBot(),
+        per_chat_rate_per_second=1000.0,
+    )
+
+    async def run():
+        for chat_id in ("a", "b"):
+            await sender._chat_bucket(chat_id=chat_id).acquire()
+        await asyncio.sleep(0.01)
+        sender._chat_bucket(chat_id="c")
+
+    asyncio.run(run())
+
+    assert list(sender._chat_buckets) == ["c"]
+
+
+def _shared_limiters(
+    monkeypatch,
+    rate_per_second: float,
+):
+    """Two limiters on one Redis, as in two delivery worker processes."""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: client)
+    return [
+        SharedRateLimiter(
+            name="bot",
+            rate_per_second=rate_per_second,
+        )
+        for _ in range(2)
+    ]
+
+
+def test_shared_limit_spaces_sends_across_processes(monkeypatch):
+    first, second = _shared_limiters(monkeypatch, rate_per_second=50.0)
+
+    async def run() -> float:
+        started = time.monotonic()
+        await asyncio.gather(
+            *(limiter.acquire() for limiter in (first, second) * 5),
+        )
+        return time.monotonic() - started
+
+    # Ten sends at 50/s take at least nine 20 ms gaps in total.
+    assert asyncio.run(run()) >= 0.17
+
+
+def test_shared_pause_holds_other_processes(monkeypatch):
+    first, second = _shared_limiters(monkeypatch, rate_per_second=100.0)
+
+    async def run() -> float:
+        first.pause(0.2)
+        started = time.monotonic()
+        await second.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.19
+
+
+def test_shared_limit_falls_back_to_a_local_bucket(monkeypatch):
+    def down():
+        raise RedisConnectionError("down")
+
+    monkeypatch.setattr(rate_limit, "get_redis", down)
+    limiter = SharedRateLimiter(
+        name="bot",
+        rate_per_second=100.0,
+    )
+
+    async def run() -> float:
+        limiter.pause(0.1)
+        started = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.09
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.extractors import trafilatura_client
+
+
+@pytest.fixture
+def stuck_pool(monkeypatch):
+    """A pool whose extractions block until the test ends."""
+    release = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=1)
+
+    def extract_html(html, url=None):
+        release.wait()
+        return "late text"
+
+    monkeypatch.setattr(trafilatura_client, "extract_html", extract_html)
+    monkeypatch.setattr(trafilatura_client, "get_process_pool", lambda: pool)
+    yield pool
+    release.set()
+    pool.shutdown(wait=True)
+
+
+def test_stuck_extraction_times_out_as_a_failure(stuck_pool):
+    extractor = trafilatura_client.TrafilaturaExtractor(
+        timeout_seconds=0,
+    )
+
+    assert extractor._run(
+        html="<p>text</p>",
+        url="https://example.com/a",
+    ) == (False, None)
+
+
+def test_stuck_async_extraction_times_out_as_a_failure(stuck_pool):
+    extractor = trafilatura_client.TrafilaturaExtractor(
+        timeout_seconds=0,
+    )
+
+    assert asyncio.run(
+        extractor._run_async(
+            html="<p>text</p>",
+            url="https://example.com/a",
+        )
+    ) == (False, None)
+
+
+@pytest.fixture
+def cache_writes(monkeypatch):
+    writes = []
+    monkeypatch.setattr(
+        trafilatura_client.http_client,
+        "request",
+        lambda *args, **kwargs: SimpleNamespace(ok=True, status_code=200, text="<p>text</p>"),
+    )
+    monkeypatch.setattr(
+        trafilatura_client.CachedExtractor,
+        "_cached",
+        lambda self, url, use_cache: (False, None),
+    )
+    monkeypatch.setattr(
+        "app.services.extractors.base.extraction_cache.set",
+        lambda url, text: writes.append((url, text)),
+    )
+    return writes
+
+
+def test_failed_extraction_is_not_cached(stuck_pool, cache_writes):
+    extractor = trafilatura_client.TrafilaturaExtractor(
+        timeout_seconds=0,
+    )
+
+    assert extractor.extract("https://example.com/a") is None
+    assert cache_writes == []
+
+
+def test_page_without_text_is_cached(monkeypatch, cache_writes):
+    monkeypatch.setattr(trafilatura_client, "get_process_pool", lambda: None)
+    monkeypatch.setattr(trafilatura_client, "extract_html", lambda html, url=None: None)
+    extractor = trafilatura_client.TrafilaturaExtractor()
+
+    assert extractor.extract("https://example.com/a") is None
+    assert cache_writes == [("https://example.com/a", None)]
+
+
+def test_broken_pool_falls_back_inline_and_reports_failure(monkeypatch):
+    class BrokenPool:
+        def submit(self, *args):
+            raise BrokenProcessPool("worker died")
+
+    def extract_html(html, url=None):
+        raise ValueError("bad markup")
+
+    monkeypatch.setattr(trafilatura_client, "get_process_pool", lambda: BrokenPool())
+    monkeypatch.setattr(trafilatura_client, "_discard_pool", lambda: None)
+    monkeypatch.setattr(trafilatura_client, "extract_html", extract_html)
+    extractor = trafilatura_client.TrafilaturaExtractor()
+
+    assert extractor._run(
+        html="<p>text</p>",
+        url="https://example.com/a",
+    ) == (False, None)